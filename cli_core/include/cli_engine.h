@@ -2,6 +2,7 @@
 
 #include "cli_types.h"
 #include "cli_io_interface.h"
+#include "cli_trace.h"
 #include <cstring>
 
 namespace cli_core {
@@ -22,17 +23,51 @@ namespace cli_core {
             CliEngine(CliIoInterface& io, ContextType& context, const char* prompt = DEFAULT_PROMPT);
 
             /**
-             * Register command with the CLI engine
+             * Register a command table with the CLI engine. Several tables (e.g. one
+             * per subsystem) can be registered, up to MAX_COMMAND_TABLES. Tables sorted
+             * by name are searched by binary search, unsorted ones linearly.
              * @param commands Array of command definitions
              * @param count Number of commands in the array
+             * @return true if the table was registered, false if the table list is full
              */
-            void register_commands(const CommandDefinition<ContextType>* commands, size_t count);
+            bool register_commands(const CommandDefinition<ContextType>* commands, size_t count);
+
+            /**
+             * Register a compile-time sorted command table (see make_command_table)
+             * @param table Command table
+             * @return true if the table was registered, false if the table list is full
+             */
+            template<size_t N>
+            bool register_commands(const CommandTable<ContextType, N>& table) {
+                return register_commands(table.entries, N);
+            }
+
+            /**
+             * Look up a command by exact name, or by unique prefix if enabled
+             * @param name Command name typed by the user
+             * @param matches Set to the number of candidate commands found
+             * @return The command if exactly one matched, nullptr otherwise
+             */
+            const CommandDefinition<ContextType>* find_command(const char* name, size_t& matches) const;
 
             /**
              * Main CLI loop -- runs indefinitely processing commands
              */
             void run();
 
+            /**
+             * Non-blocking service call -- consumes whatever input is available
+             * and returns immediately. Executes at most one command per call.
+             * @return true if a command line was completed and executed
+             */
+            bool poll();
+
+            /**
+             * Scheduler adapter so the shell can run as a cooperative task
+             * @param engine Pointer to a CliEngine instance
+             */
+            static void poll_task(void* engine);
+
             /**
              * Process a single command line (useful for testing or non-interactive use)
              * @param command_line String containing the command and arguments
@@ -44,6 +79,26 @@ namespace cli_core {
              * Print available commands
              */
             void print_help();
+
+#if CLI_ENABLE_PROFILING
+            /**
+             * Set the performance counter source for the 'time', 'repeat' and
+             * 'stats' built-ins
+             * @param counter Function returning the current cycle/instret counts
+             * @param clock_hz Frequency of the cycle counter, for wall-time reporting
+             */
+            void set_perf_counter(PerfCounterFunction counter, uint32_t clock_hz);
+
+            /**
+             * Print accumulated call count and cycles for every registered command
+             */
+            void print_command_stats();
+
+            /**
+             * Clear the per-command statistics
+             */
+            void reset_command_stats();
+#endif
         
         private:
             // Parse command line into argc/argv format
@@ -52,43 +107,233 @@ namespace cli_core {
             // Get command input from user with echo and backspace support
             CommandArgs get_command_input();
 
+            // Reset the line editor for a new command line
+            void begin_line();
+
+            // Feed one input byte to the line editor; returns true once a line is complete
+            bool handle_input_byte(uint8_t in_char);
+
+            // Dispatch a parsed line and report unknown commands
+            void process_command(const CommandArgs& args);
+
             // Find and execute a command
             bool dispatch_command(const CommandArgs& args);
 
+            // Report an unknown or ambiguous command
+            void report_unknown_command(const char* name);
+
+            // Run a user command handler (with accounting when profiling is enabled)
+            void execute_handler(const CommandDefinition<ContextType>* cmd, const CommandArgs& args);
+
+            // A registered command table
+            struct CommandTableRef {
+                const CommandDefinition<ContextType>* commands;
+                size_t count;
+                bool sorted;
+#if CLI_ENABLE_PROFILING
+                size_t first_index;     // Slot of commands[0] in command_stats_
+#endif
+            };
+
+#if CLI_ENABLE_PROFILING
+            // Profiling built-ins
+            void builtin_time(const CommandArgs& args);
+            void builtin_repeat(const CommandArgs& args);
+            void builtin_stats(const CommandArgs& args);
+
+            // Dispatch args with the first 'skip' words removed, returning the cost
+            bool dispatch_measured(const CommandArgs& args, int skip, PerfSample& delta);
+
+            PerfSample read_counters() const;
+            void print_duration(const char* label, uint64_t cycles);
+            CommandStats* stats_for(const CommandDefinition<ContextType>* cmd);
+#endif
+
+            // Exact lookup within one table
+            static const CommandDefinition<ContextType>* find_exact(const CommandTableRef& table, const char* name);
+
+            // Count prefix matches within one table, remembering the first
+            static size_t find_prefix(const CommandTableRef& table, const char* prefix, size_t len,
+                                      const CommandDefinition<ContextType>*& first);
+
             // Member variables
             CliIoInterface& io_;
             ContextType& context_;
             const char* prompt_;
-            const CommandDefinition<ContextType>* commands_;
-            size_t command_count_;
+            CommandTableRef tables_[MAX_COMMAND_TABLES];
+            size_t table_count_;
 
             // Input buffer for command parsing
             char input_buffer_[CMD_BUFFER_SIZE];
+            size_t line_length_;
+            bool prompt_pending_;
+
+#if CLI_ENABLE_PROFILING
+            PerfCounterFunction perf_counter_;
+            uint32_t clock_hz_;
+            size_t profiled_count_;
+            CommandStats command_stats_[MAX_PROFILED_COMMANDS];
+#endif
     };
 
     // Template imlpementation (must be in header for template instantiation)
     template<typename ContextType>
     CliEngine<ContextType>::CliEngine(CliIoInterface& io, ContextType& context, const char* prompt)
-        : io_(io), context_(context), prompt_(prompt), commands_(nullptr), command_count_(0) {}
+        : io_(io), context_(context), prompt_(prompt), tables_(), table_count_(0),
+          line_length_(0), prompt_pending_(true)
+#if CLI_ENABLE_PROFILING
+          , perf_counter_(nullptr), clock_hz_(0), profiled_count_(0), command_stats_()
+#endif
+    {
+        input_buffer_[0] = '\0';
+    }
 
     template<typename ContextType>
-    void CliEngine<ContextType>::register_commands(const CommandDefinition<ContextType>* commands, size_t count) {
-        commands_ = commands;
-        command_count_ = count;
+    bool CliEngine<ContextType>::register_commands(const CommandDefinition<ContextType>* commands, size_t count) {
+        if (!commands || count == 0) {
+            return true;
+        }
+        if (table_count_ >= MAX_COMMAND_TABLES) {
+            return false;
+        }
+
+        // One-time check so lookups can use binary search on sorted tables
+        bool sorted = true;
+        for (size_t i = 1; i < count && sorted; i++) {
+            sorted = strcmp(commands[i - 1].name, commands[i].name) < 0;
+        }
+
+        CommandTableRef& table = tables_[table_count_++];
+        table.commands = commands;
+        table.count = count;
+        table.sorted = sorted;
+#if CLI_ENABLE_PROFILING
+        table.first_index = profiled_count_;
+        profiled_count_ += count;
+#endif
+        return true;
+    }
+
+    template<typename ContextType>
+    const CommandDefinition<ContextType>* CliEngine<ContextType>::find_exact(const CommandTableRef& table, const char* name) {
+        if (!table.sorted) {
+            for (size_t i = 0; i < table.count; i++) {
+                if (strcmp(name, table.commands[i].name) == 0) {
+                    return &table.commands[i];
+                }
+            }
+            return nullptr;
+        }
+
+        size_t lo = 0;
+        size_t hi = table.count;
+        while (lo < hi) {
+            size_t mid = lo + (hi - lo) / 2;
+            int cmp = strcmp(name, table.commands[mid].name);
+            if (cmp == 0) {
+                return &table.commands[mid];
+            }
+            if (cmp < 0) {
+                hi = mid;
+            } else {
+                lo = mid + 1;
+            }
+        }
+        return nullptr;
+    }
+
+    template<typename ContextType>
+    size_t CliEngine<ContextType>::find_prefix(const CommandTableRef& table, const char* prefix, size_t len,
+                                               const CommandDefinition<ContextType>*& first) {
+        size_t matches = 0;
+        size_t i = 0;
+
+        if (table.sorted) {
+            // Lower bound: first entry not less than the prefix; matches are contiguous from there
+            size_t hi = table.count;
+            while (i < hi) {
+                size_t mid = i + (hi - i) / 2;
+                if (strncmp(table.commands[mid].name, prefix, len) < 0) {
+                    i = mid + 1;
+                } else {
+                    hi = mid;
+                }
+            }
+        }
+
+        for (; i < table.count; i++) {
+            if (strncmp(table.commands[i].name, prefix, len) == 0) {
+                if (matches++ == 0) {
+                    first = &table.commands[i];
+                }
+            } else if (table.sorted) {
+                break;
+            }
+        }
+        return matches;
+    }
+
+    template<typename ContextType>
+    const CommandDefinition<ContextType>* CliEngine<ContextType>::find_command(const char* name, size_t& matches) const {
+        matches = 0;
+
+        for (size_t t = 0; t < table_count_; t++) {
+            const CommandDefinition<ContextType>* cmd = find_exact(tables_[t], name);
+            if (cmd) {
+                matches = 1;
+                return cmd;
+            }
+        }
+
+#if CLI_ENABLE_PREFIX_MATCH
+        const CommandDefinition<ContextType>* candidate = nullptr;
+        size_t len = strlen(name);
+        for (size_t t = 0; t < table_count_; t++) {
+            const CommandDefinition<ContextType>* first = nullptr;
+            size_t found = find_prefix(tables_[t], name, len, first);
+            if (found > 0 && matches == 0) {
+                candidate = first;
+            }
+            matches += found;
+        }
+        if (matches == 1) {
+            return candidate;
+        }
+#endif
+        return nullptr;
     }
 
     template<typename ContextType>
     void CliEngine<ContextType>::run() {
         while (true) {
             CommandArgs args = get_command_input();
-            if (args.argc > 0) {
-                if (!dispatch_command(args)) {
-                    io_.send_raw("Command \"");
-                    io_.send_raw(args.argv[0]);
-                    io_.send_line("\" not found. Type 'help' for available commands.");
-                }
+            process_command(args);
+        }
+    }
+
+    template<typename ContextType>
+    bool CliEngine<ContextType>::poll() {
+        if (prompt_pending_) {
+            begin_line();
+            io_.send_prompt(prompt_);
+            prompt_pending_ = false;
+        }
+
+        uint8_t in_char = 0;
+        while (io_.try_get_byte(in_char)) {
+            if (handle_input_byte(in_char)) {
+                CommandArgs args = parse_command_line(input_buffer_);
+                process_command(args);
+                prompt_pending_ = true;
+                return true;
             }
         }
+        return false;
+    }
+
+    template<typename ContextType>
+    void CliEngine<ContextType>::poll_task(void* engine) {
+        static_cast<CliEngine<ContextType>*>(engine)->poll();
     }
 
     template<typename ContextType>
@@ -103,11 +348,18 @@ namespace cli_core {
     
         // Show built-in commands
         io_.send_fmt("  %-15s -- %s\r\n", "help", "Show available commands");
+#if CLI_ENABLE_PROFILING
+        io_.send_fmt("  %-15s -- %s\r\n", "time", "time <cmd ...>: report cycles, instructions and wall time");
+        io_.send_fmt("  %-15s -- %s\r\n", "repeat", "repeat <N> <cmd ...>: run N times, report min/mean/max");
+        io_.send_fmt("  %-15s -- %s\r\n", "stats", "Per-command call counts and cycles ('stats reset' clears)");
+#endif
         
         // Show user commands
-        if (commands_ && command_count_ > 0) {
-            for (size_t i = 0; i < command_count_; i++) {
-                io_.send_fmt("  %-15s -- %s\r\n", commands_[i].name, commands_[i].help);
+        if (table_count_ > 0) {
+            for (size_t t = 0; t < table_count_; t++) {
+                for (size_t i = 0; i < tables_[t].count; i++) {
+                    io_.send_fmt("  %-15s -- %s\r\n", tables_[t].commands[i].name, tables_[t].commands[i].help);
+                }
             }
         } else {
             io_.send_line("  (No additional commands registered)");
@@ -117,52 +369,89 @@ namespace cli_core {
 
     template<typename ContextType>
     CommandArgs CliEngine<ContextType>::get_command_input() {
-        memset(input_buffer_, 0, sizeof(input_buffer_));
-        char* buffer_ptr = input_buffer_;
-        size_t char_count = 0;
-        uint8_t in_char = 0;
-
+        begin_line();
         io_.send_prompt(prompt_);
 
-        while (true) {
-            in_char = io_.get_byte();
-
-            // Handle backspace
-            if (in_char == 8 || in_char == 127) {
-                if (char_count > 0) {
-                    buffer_ptr--;
-                    char_count--;
-                    io_.handle_backspace();
-                }
-                continue;
+        while (!handle_input_byte(io_.get_byte())) {
+            // Keep reading until a full line is entered
+        }
+
+        return parse_command_line(input_buffer_);
+    }
+
+    template<typename ContextType>
+    void CliEngine<ContextType>::begin_line() {
+        line_length_ = 0;
+        input_buffer_[0] = '\0';
+    }
+
+    template<typename ContextType>
+    bool CliEngine<ContextType>::handle_input_byte(uint8_t in_char) {
+        // Handle backspace
+        if (in_char == 8 || in_char == 127) {
+            if (line_length_ > 0) {
+                line_length_--;
+                io_.handle_backspace();
             }
+            return false;
+        }
 
-            // Handle CRLF
-            if (in_char == '\r' || in_char == '\n') {
-                io_.send_newline();
-                // Only break if we've typed something
-                if (char_count > 0) {
-                    break;
-                } else {
-                    io_.send_prompt(prompt_);
-                    continue;
-                }
+        // Handle CRLF
+        if (in_char == '\r' || in_char == '\n') {
+            io_.send_newline();
+            // Only complete the line if we've typed something
+            if (line_length_ > 0) {
+                input_buffer_[line_length_] = '\0';
+                return true;
             }
+            io_.send_prompt(prompt_);
+            return false;
+        }
 
-            // Handle regular characters
-            io_.send_byte(in_char);
-            *buffer_ptr = in_char;
-            buffer_ptr++;
-            char_count++;
+        // Handle regular characters
+        io_.send_byte(in_char);
+        input_buffer_[line_length_++] = static_cast<char>(in_char);
 
-            // Prevent buffer overflow
-            if (char_count >= CMD_BUFFER_SIZE - 1) {
-                break;
+        // Prevent buffer overflow
+        if (line_length_ >= CMD_BUFFER_SIZE - 1) {
+            input_buffer_[line_length_] = '\0';
+            return true;
+        }
+        return false;
+    }
+
+    template<typename ContextType>
+    void CliEngine<ContextType>::process_command(const CommandArgs& args) {
+        if (args.argc > 0) {
+            if (!dispatch_command(args)) {
+                report_unknown_command(args.argv[0]);
             }
         }
+    }
 
-        *buffer_ptr = '\0';
-        return parse_command_line(input_buffer_);
+    template<typename ContextType>
+    void CliEngine<ContextType>::report_unknown_command(const char* name) {
+        size_t matches = 0;
+        find_command(name, matches);
+
+        if (matches > 1) {
+            io_.send_raw("Command \"");
+            io_.send_raw(name);
+            io_.send_line("\" is ambiguous. Matches:");
+            size_t len = strlen(name);
+            for (size_t t = 0; t < table_count_; t++) {
+                for (size_t i = 0; i < tables_[t].count; i++) {
+                    if (strncmp(tables_[t].commands[i].name, name, len) == 0) {
+                        io_.send_fmt("  %s\r\n", tables_[t].commands[i].name);
+                    }
+                }
+            }
+            return;
+        }
+
+        io_.send_raw("Command \"");
+        io_.send_raw(name);
+        io_.send_line("\" not found. Type 'help' for available commands.");
     }
 
     template<typename ContextType>
@@ -206,20 +495,219 @@ namespace cli_core {
             print_help();
             return true;
         }
+#if CLI_ENABLE_PROFILING
+        if (strcmp(args.argv[0], "time") == 0) {
+            builtin_time(args);
+            return true;
+        }
+        if (strcmp(args.argv[0], "repeat") == 0) {
+            builtin_repeat(args);
+            return true;
+        }
+        if (strcmp(args.argv[0], "stats") == 0) {
+            builtin_stats(args);
+            return true;
+        }
+#endif
 
         // Handle user-registered commands
-        if (!commands_) {
-            return false;
+        CLI_TRACE_BEGIN(TRACE_DISPATCH, args.argc);
+        size_t matches = 0;
+        const CommandDefinition<ContextType>* cmd = find_command(args.argv[0], matches);
+        if (cmd) {
+            execute_handler(cmd, args);
         }
+        CLI_TRACE_END(TRACE_DISPATCH, args.argc);
 
-        for (size_t i = 0; i < command_count_; i++) {
-            if (strcmp(args.argv[0], commands_[i].name) == 0) {
-                commands_[i].execute(args.argc, args.argv, &context_);
-                return true;
+        return cmd != nullptr;
+    }
+
+    template<typename ContextType>
+    void CliEngine<ContextType>::execute_handler(const CommandDefinition<ContextType>* cmd, const CommandArgs& args) {
+        CLI_TRACE_RECORD(TRACE_HANDLER, PHASE_BEGIN, cmd->name, cmd->execute);
+#if CLI_ENABLE_PROFILING
+        PerfSample start = read_counters();
+        cmd->execute(args.argc, args.argv, &context_);
+        uint64_t cycles = read_counters().cycles - start.cycles;
+
+        CommandStats* stats = stats_for(cmd);
+        if (stats) {
+            uint32_t cycles32 = cycles > UINT32_MAX ? UINT32_MAX : static_cast<uint32_t>(cycles);
+            stats->calls++;
+            stats->total_cycles += cycles;
+            if (cycles32 > stats->max_cycles) {
+                stats->max_cycles = cycles32;
             }
         }
+#else
+        cmd->execute(args.argc, args.argv, &context_);
+#endif
+        CLI_TRACE_END(TRACE_HANDLER, cmd->name);
+    }
 
-        return false;
+#if CLI_ENABLE_PROFILING
+    template<typename ContextType>
+    void CliEngine<ContextType>::set_perf_counter(PerfCounterFunction counter, uint32_t clock_hz) {
+        perf_counter_ = counter;
+        clock_hz_ = clock_hz;
+    }
+
+    template<typename ContextType>
+    PerfSample CliEngine<ContextType>::read_counters() const {
+        if (perf_counter_) {
+            return perf_counter_();
+        }
+        return PerfSample{0, 0};
+    }
+
+    template<typename ContextType>
+    CommandStats* CliEngine<ContextType>::stats_for(const CommandDefinition<ContextType>* cmd) {
+        for (size_t t = 0; t < table_count_; t++) {
+            const CommandTableRef& table = tables_[t];
+            if (cmd >= table.commands && cmd < table.commands + table.count) {
+                size_t slot = table.first_index + static_cast<size_t>(cmd - table.commands);
+                return slot < MAX_PROFILED_COMMANDS ? &command_stats_[slot] : nullptr;
+            }
+        }
+        return nullptr;
+    }
+
+    template<typename ContextType>
+    void CliEngine<ContextType>::print_duration(const char* label, uint64_t cycles) {
+        uint32_t cycles32 = cycles > UINT32_MAX ? UINT32_MAX : static_cast<uint32_t>(cycles);
+        if (clock_hz_ >= 1000000) {
+            uint32_t us = static_cast<uint32_t>(cycles / (clock_hz_ / 1000000));
+            io_.send_fmt("  %s%u cycles (%u us)\r\n", label, cycles32, us);
+        } else {
+            io_.send_fmt("  %s%u cycles\r\n", label, cycles32);
+        }
+    }
+
+    template<typename ContextType>
+    bool CliEngine<ContextType>::dispatch_measured(const CommandArgs& args, int skip, PerfSample& delta) {
+        CommandArgs sub;
+        for (int i = skip; i < args.argc; i++) {
+            sub.argv[sub.argc++] = args.argv[i];
+        }
+
+        PerfSample start = read_counters();
+        bool found = dispatch_command(sub);
+        PerfSample end = read_counters();
+
+        delta.cycles = end.cycles - start.cycles;
+        delta.instret = end.instret - start.instret;
+
+        if (!found) {
+            report_unknown_command(sub.argv[0]);
+        }
+        return found;
+    }
+
+    template<typename ContextType>
+    void CliEngine<ContextType>::builtin_time(const CommandArgs& args) {
+        if (args.argc < 2) {
+            io_.send_line("Usage: time <cmd ...>");
+            return;
+        }
+        if (!perf_counter_) {
+            io_.send_line("time: no performance counter source set");
+            return;
+        }
+
+        PerfSample delta;
+        if (!dispatch_measured(args, 1, delta)) {
+            return;
+        }
+
+        io_.send_line("");
+        print_duration("time:    ", delta.cycles);
+        uint32_t instret32 = delta.instret > UINT32_MAX ? UINT32_MAX : static_cast<uint32_t>(delta.instret);
+        io_.send_fmt("  instret: %u\r\n", instret32);
+        if (delta.instret > 0) {
+            // Cycles per instruction with two decimals
+            uint32_t cpi_x100 = static_cast<uint32_t>((delta.cycles * 100) / delta.instret);
+            io_.send_fmt("  CPI:     %u.%02u\r\n", cpi_x100 / 100, cpi_x100 % 100);
+        }
+    }
+
+    template<typename ContextType>
+    void CliEngine<ContextType>::builtin_repeat(const CommandArgs& args) {
+        uint32_t count = 0;
+        const char* p = args.argc >= 3 ? args.argv[1] : "";
+        while (*p >= '0' && *p <= '9') {
+            uint32_t digit = static_cast<uint32_t>(*p++ - '0');
+            if (count > (MAX_REPEAT_COUNT - digit) / 10) {
+                io_.send_fmt("repeat: N must be at most %u\r\n", static_cast<unsigned int>(MAX_REPEAT_COUNT));
+                return;
+            }
+            count = count * 10 + digit;
+        }
+        if (args.argc < 3 || *p != '\0' || count == 0) {
+            io_.send_line("Usage: repeat <N> <cmd ...>");
+            return;
+        }
+        if (!perf_counter_) {
+            io_.send_line("repeat: no performance counter source set");
+            return;
+        }
+
+        uint64_t min_cycles = UINT64_MAX;
+        uint64_t max_cycles = 0;
+        uint64_t total_cycles = 0;
+        for (uint32_t i = 0; i < count; i++) {
+            PerfSample delta;
+            if (!dispatch_measured(args, 2, delta)) {
+                return;
+            }
+            total_cycles += delta.cycles;
+            if (delta.cycles < min_cycles) min_cycles = delta.cycles;
+            if (delta.cycles > max_cycles) max_cycles = delta.cycles;
+        }
+
+        io_.send_fmt("\r\n  runs:    %u\r\n", count);
+        print_duration("min:     ", min_cycles);
+        print_duration("mean:    ", total_cycles / count);
+        print_duration("max:     ", max_cycles);
+    }
+
+    template<typename ContextType>
+    void CliEngine<ContextType>::builtin_stats(const CommandArgs& args) {
+        if (args.argc > 1 && strcmp(args.argv[1], "reset") == 0) {
+            reset_command_stats();
+            io_.send_line("Command statistics cleared");
+            return;
+        }
+        print_command_stats();
+    }
+
+    template<typename ContextType>
+    void CliEngine<ContextType>::print_command_stats() {
+        io_.send_line("\r\nCommand statistics (cycles):");
+        for (size_t t = 0; t < table_count_; t++) {
+            const CommandTableRef& table = tables_[t];
+            for (size_t i = 0; i < table.count; i++) {
+                size_t slot = table.first_index + i;
+                if (slot >= MAX_PROFILED_COMMANDS) {
+                    break;
+                }
+                const CommandStats& stats = command_stats_[slot];
+                if (stats.calls == 0) {
+                    continue;
+                }
+                uint32_t mean = static_cast<uint32_t>(stats.total_cycles / stats.calls);
+                io_.send_fmt("  %s: calls %u  mean %u  max %u\r\n",
+                             table.commands[i].name, stats.calls, mean, stats.max_cycles);
+            }
+        }
+        io_.send_line("");
+    }
+
+    template<typename ContextType>
+    void CliEngine<ContextType>::reset_command_stats() {
+        for (size_t i = 0; i < MAX_PROFILED_COMMANDS; i++) {
+            command_stats_[i] = CommandStats();
+        }
     }
+#endif
 
 }
\ No newline at end of file
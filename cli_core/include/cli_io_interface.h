@@ -22,6 +22,17 @@ namespace cli_core {
         // Input methods
         virtual uint8_t get_byte() = 0;
 
+        // Non-blocking input: returns false immediately if no byte is waiting.
+        // Transports that cannot poll fall back to a blocking read.
+        virtual bool try_get_byte(uint8_t& byte) {
+            byte = get_byte();
+            return true;
+        }
+
+        // Block until all queued output has left the transport.
+        // Unbuffered transports have nothing to wait for.
+        virtual void flush() {}
+
         // Optional terminal control methods
         // (Can be overridden for enhanced/alternate functionality)
         virtual void clear_screen() {
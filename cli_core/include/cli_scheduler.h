@@ -0,0 +1,186 @@
+#pragma once
+
+#include "cli_types.h"
+#include "cli_trace.h"
+#include <cstddef>
+#include <cstdint>
+
+namespace cli_core {
+
+    // Task entry point; arg is the pointer given at registration
+    using TaskFunction = void(*)(void* arg);
+
+    // Per-task runtime accounting, in ticks of the scheduler's tick source
+    struct TaskStats {
+        uint32_t run_count;
+        uint64_t total_ticks;
+        uint32_t max_ticks;
+        uint32_t last_ticks;
+    };
+
+    struct Task {
+        const char* name;
+        TaskFunction run;
+        void* arg;
+        uint32_t period;     // 0 = background task, runs on every pass
+        uint32_t next_run;
+        bool enabled;
+        TaskStats stats;
+    };
+
+    /**
+     * Static cooperative scheduler. Tasks run to completion in registration
+     * order; periodic tasks run when their deadline has passed, background
+     * tasks run on every pass. No dynamic allocation: capacity is fixed by
+     * the template parameter.
+     */
+    template<size_t MaxTasks>
+    class TaskScheduler {
+        public:
+            /**
+             * Constructor
+             * @param now Tick source used for periods and runtime accounting
+             */
+            explicit TaskScheduler(TickFunction now);
+
+            /**
+             * Register a task
+             * @param name Task name (shown in statistics)
+             * @param run Task function
+             * @param arg Argument passed to the task function
+             * @param period Period in ticks, 0 for a background task
+             * @return Task ID, or -1 if the task table is full
+             */
+            int add_task(const char* name, TaskFunction run, void* arg, uint32_t period = 0);
+
+            /**
+             * Enable or disable a registered task
+             */
+            void set_enabled(int id, bool enabled);
+
+            /**
+             * Run one pass over all tasks
+             * @return true if any task ran
+             */
+            bool run_once();
+
+            /**
+             * Scheduler loop -- runs indefinitely
+             */
+            void run();
+
+            /**
+             * Clear the runtime statistics of all tasks
+             */
+            void reset_stats();
+
+            size_t task_count() const { return task_count_; }
+            const Task& task(size_t index) const { return tasks_[index]; }
+
+            // Ticks spent in the scheduler itself since the last reset_stats()
+            uint64_t overhead_ticks() const { return overhead_ticks_; }
+
+        private:
+            TickFunction now_;
+            Task tasks_[MaxTasks];
+            size_t task_count_;
+            uint64_t overhead_ticks_;
+    };
+
+    // Template implementation (must be in header for template instantiation)
+    template<size_t MaxTasks>
+    TaskScheduler<MaxTasks>::TaskScheduler(TickFunction now)
+        : now_(now), tasks_(), task_count_(0), overhead_ticks_(0) {}
+
+    template<size_t MaxTasks>
+    int TaskScheduler<MaxTasks>::add_task(const char* name, TaskFunction run, void* arg, uint32_t period) {
+        if (task_count_ >= MaxTasks || run == nullptr) {
+            return -1;
+        }
+
+        Task& task = tasks_[task_count_];
+        task.name = name;
+        task.run = run;
+        task.arg = arg;
+        task.period = period;
+        task.next_run = now_() + period;
+        task.enabled = true;
+        task.stats = TaskStats();
+
+        return static_cast<int>(task_count_++);
+    }
+
+    template<size_t MaxTasks>
+    void TaskScheduler<MaxTasks>::set_enabled(int id, bool enabled) {
+        if (id < 0 || static_cast<size_t>(id) >= task_count_) {
+            return;
+        }
+        tasks_[id].enabled = enabled;
+        if (enabled) {
+            tasks_[id].next_run = now_() + tasks_[id].period;
+        }
+    }
+
+    template<size_t MaxTasks>
+    bool TaskScheduler<MaxTasks>::run_once() {
+        bool ran = false;
+        uint32_t pass_start = now_();
+        uint32_t busy = 0;
+
+        for (size_t i = 0; i < task_count_; i++) {
+            Task& task = tasks_[i];
+            if (!task.enabled) {
+                continue;
+            }
+
+            uint32_t start = now_();
+            if (task.period != 0) {
+                // Wrap-safe deadline check
+                if (static_cast<int32_t>(start - task.next_run) < 0) {
+                    continue;
+                }
+                task.next_run += task.period;
+                // Drop missed periods instead of bursting to catch up
+                if (static_cast<int32_t>(start - task.next_run) >= 0) {
+                    task.next_run = start + task.period;
+                }
+            }
+
+            CLI_TRACE_RECORD(TRACE_TASK, PHASE_BEGIN, task.name, task.run);
+            task.run(task.arg);
+            CLI_TRACE_END(TRACE_TASK, task.name);
+
+            uint32_t elapsed = now_() - start;
+            task.stats.run_count++;
+            task.stats.total_ticks += elapsed;
+            task.stats.last_ticks = elapsed;
+            if (elapsed > task.stats.max_ticks) {
+                task.stats.max_ticks = elapsed;
+            }
+            busy += elapsed;
+            ran = true;
+        }
+
+        uint32_t pass_ticks = now_() - pass_start;
+        if (pass_ticks > busy) {
+            overhead_ticks_ += pass_ticks - busy;
+        }
+        return ran;
+    }
+
+    template<size_t MaxTasks>
+    void TaskScheduler<MaxTasks>::run() {
+        while (true) {
+            run_once();
+        }
+    }
+
+    template<size_t MaxTasks>
+    void TaskScheduler<MaxTasks>::reset_stats() {
+        for (size_t i = 0; i < task_count_; i++) {
+            tasks_[i].stats = TaskStats();
+        }
+        overhead_ticks_ = 0;
+    }
+
+}
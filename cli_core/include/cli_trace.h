@@ -0,0 +1,154 @@
+#pragma once
+
+#include "cli_types.h"
+#include <cstdint>
+
+/**
+ * Lightweight event tracing into a static ring buffer.
+ *
+ * Events are 16 bytes (timestamp, event ID, phase, two arguments) written
+ * into cli_trace_buffer, a C-linkage symbol the host-side reader locates
+ * through the ELF symbol table and pulls over JTAG in one bulk read.
+ *
+ * Tracing is compiled out entirely unless CLI_ENABLE_TRACE is 1. When enabled:
+ *   - Define the buffer in exactly one source file with CLI_TRACE_DEFINE_BUFFER()
+ *   - Call cli_core::trace::init() with a timestamp source before tracing
+ *
+ * The buffer lives in ordinary .bss unless CLI_TRACE_BUFFER_ATTR says otherwise.
+ * For reads while the CPU is running, place it in memory the D-cache does not
+ * cover (e.g. __attribute__((section(".lmb_bss"))) with a linker script that maps
+ * that section to LMB), otherwise recent events may still sit in the cache.
+ */
+
+#ifndef CLI_ENABLE_TRACE
+#define CLI_ENABLE_TRACE 0
+#endif
+
+#ifndef CLI_TRACE_BUFFER_ATTR
+#define CLI_TRACE_BUFFER_ATTR
+#endif
+
+namespace cli_core {
+namespace trace {
+
+    constexpr uint32_t TRACE_MAGIC = 0x54524345;    // "TRCE"
+    constexpr uint32_t TRACE_VERSION = 1;
+    constexpr uint32_t TRACE_BUFFER_EVENTS = 256;   // Must be a power of two
+
+    static_assert((TRACE_BUFFER_EVENTS & (TRACE_BUFFER_EVENTS - 1)) == 0,
+                  "TRACE_BUFFER_EVENTS must be a power of two");
+
+    // Built-in event IDs (mirrored in example_application/scripts/trace_reader.py)
+    enum TraceEventId : uint16_t {
+        TRACE_DISPATCH      = 1,    // arg0: argc
+        TRACE_HANDLER       = 2,    // arg0: address of the command name, arg1: handler (BEGIN only)
+        TRACE_UART_RX_WAIT  = 3,
+        TRACE_UART_TX_WAIT  = 4,
+        TRACE_TASK          = 5,    // arg0: address of the task name, arg1: task function (BEGIN only)
+        TRACE_USER          = 0x100 // First ID available to applications
+    };
+
+    enum TracePhase : uint8_t {
+        PHASE_INSTANT = 0,
+        PHASE_BEGIN   = 1,
+        PHASE_END     = 2
+    };
+
+    struct TraceEvent {
+        uint32_t timestamp;
+        uint16_t id;
+        uint8_t phase;
+        uint8_t reserved;
+        uint32_t arg0;
+        uint32_t arg1;
+    };
+
+    // Layout is read by the host; only append fields and bump TRACE_VERSION
+    struct TraceBuffer {
+        uint32_t magic;
+        uint32_t version;
+        uint32_t capacity;          // Number of event slots
+        uint32_t event_size;
+        uint32_t timestamp_hz;
+        volatile uint32_t head;     // Total events written; slot = head % capacity
+        uint32_t reserved[2];
+        TraceEvent events[TRACE_BUFFER_EVENTS];
+    };
+
+}
+}
+
+#if CLI_ENABLE_TRACE
+
+extern "C" {
+    extern cli_core::trace::TraceBuffer cli_trace_buffer;
+    extern cli_core::TickFunction cli_trace_clock;
+}
+
+#define CLI_TRACE_DEFINE_BUFFER() \
+    CLI_TRACE_BUFFER_ATTR cli_core::trace::TraceBuffer cli_trace_buffer; \
+    cli_core::TickFunction cli_trace_clock = nullptr
+
+namespace cli_core {
+namespace trace {
+
+    /**
+     * Reset the buffer and start tracing
+     * @param clock Timestamp source
+     * @param clock_hz Frequency of the timestamp source
+     */
+    inline void init(TickFunction clock, uint32_t clock_hz) {
+        cli_trace_clock = nullptr;
+        cli_trace_buffer.head = 0;
+        cli_trace_buffer.capacity = TRACE_BUFFER_EVENTS;
+        cli_trace_buffer.event_size = sizeof(TraceEvent);
+        cli_trace_buffer.timestamp_hz = clock_hz;
+        cli_trace_buffer.version = TRACE_VERSION;
+        cli_trace_buffer.magic = TRACE_MAGIC;
+        cli_trace_clock = clock;
+    }
+
+    // Not reentrant: do not trace from interrupt handlers
+    inline void record(uint16_t id, uint8_t phase, uint32_t arg0, uint32_t arg1) {
+        TickFunction clock = cli_trace_clock;
+        if (!clock) {
+            return;
+        }
+        uint32_t index = cli_trace_buffer.head;
+        TraceEvent& event = cli_trace_buffer.events[index & (TRACE_BUFFER_EVENTS - 1)];
+        event.timestamp = clock();
+        event.id = id;
+        event.phase = phase;
+        event.arg0 = arg0;
+        event.arg1 = arg1;
+        cli_trace_buffer.head = index + 1;
+    }
+
+    template<typename T>
+    inline uint32_t to_arg(T value) {
+        return (uint32_t)(uintptr_t)value;
+    }
+
+}
+}
+
+// Event IDs may be given unqualified (TRACE_TASK) or as plain numbers
+#define CLI_TRACE_RECORD(id, phase, arg0, arg1) \
+    do { \
+        using namespace ::cli_core::trace; \
+        record((id), (phase), to_arg(arg0), to_arg(arg1)); \
+    } while (0)
+
+#define CLI_TRACE(id, arg0, arg1) CLI_TRACE_RECORD(id, PHASE_INSTANT, arg0, arg1)
+#define CLI_TRACE_BEGIN(id, arg0) CLI_TRACE_RECORD(id, PHASE_BEGIN, arg0, 0)
+#define CLI_TRACE_END(id, arg0) CLI_TRACE_RECORD(id, PHASE_END, arg0, 0)
+
+#else
+
+#define CLI_TRACE_DEFINE_BUFFER() static_assert(true, "")
+#define CLI_TRACE_RECORD(id, phase, arg0, arg1) ((void)0)
+#define CLI_TRACE(id, arg0, arg1) ((void)0)
+#define CLI_TRACE_BEGIN(id, arg0) ((void)0)
+#define CLI_TRACE_END(id, arg0) ((void)0)
+
+#endif
@@ -1,6 +1,7 @@
 #pragma once
 
 #include <cstddef>
+#include <cstdint>
 
 namespace cli_core {
 
@@ -8,6 +9,23 @@ namespace cli_core {
     constexpr int MAX_ARGS = 10;
     constexpr size_t CMD_BUFFER_SIZE = 256;
     constexpr const char* DEFAULT_PROMPT = "mbv> ";
+    constexpr size_t MAX_COMMAND_TABLES = 8;   // Command tables per engine (e.g. one per subsystem)
+
+    // Built-in 'time', 'repeat' and 'stats' commands plus per-command cycle accounting.
+    // Disabled by default so it costs nothing unless requested.
+    #ifndef CLI_ENABLE_PROFILING
+    #define CLI_ENABLE_PROFILING 0
+    #endif
+    constexpr size_t MAX_PROFILED_COMMANDS = 64;  // Per-command statistics slots
+    constexpr uint32_t MAX_REPEAT_COUNT = 1000000;  // Largest N for 'repeat'
+
+    // Resolve registered commands by unique prefix ("tog" -> "toggle_led") when no
+    // exact match exists. Off by default: built-ins only match exactly, and a
+    // mistyped short word could start a command that takes over the console
+    // (e.g. 'load').
+    #ifndef CLI_ENABLE_PREFIX_MATCH
+    #define CLI_ENABLE_PREFIX_MATCH 0
+    #endif
 
     // Command argument structure
     struct CommandArgs {
@@ -33,8 +51,95 @@ namespace cli_core {
         const char* help;
     };
 
+    // Free-running tick source (e.g. a cycle counter). Must wrap modulo 2^32.
+    using TickFunction = uint32_t(*)();
+
+    // Snapshot of the hardware performance counters
+    struct PerfSample {
+        uint64_t cycles;
+        uint64_t instret;
+    };
+
+    // Performance counter source used by the profiling built-ins
+    using PerfCounterFunction = PerfSample(*)();
+
+    // Accumulated cost of one registered command
+    struct CommandStats {
+        uint32_t calls;
+        uint64_t total_cycles;
+        uint32_t max_cycles;
+    };
+
     // Command registration macro
     #define CLI_REGISTER_COMMAND(name, func, help) \
         {#name, func, help}
 
+    namespace detail {
+        constexpr int const_strcmp(const char* a, const char* b) {
+            while (*a && *a == *b) {
+                a++;
+                b++;
+            }
+            return static_cast<unsigned char>(*a) - static_cast<unsigned char>(*b);
+        }
+
+        constexpr size_t const_strlen(const char* s) {
+            size_t len = 0;
+            while (s[len]) len++;
+            return len;
+        }
+    }
+
+    /**
+     * Command table sorted by name at compile time, so the engine can find
+     * commands by binary search. Build with make_command_table().
+     */
+    template<typename ContextType, size_t N>
+    struct CommandTable {
+        CommandDefinition<ContextType> entries[N];
+
+        static constexpr size_t size() { return N; }
+
+        // True if no two commands share a name
+        constexpr bool has_unique_names() const {
+            for (size_t i = 1; i < N; i++) {
+                if (detail::const_strcmp(entries[i - 1].name, entries[i].name) == 0) {
+                    return false;
+                }
+            }
+            return true;
+        }
+
+        // Read-only footprint: the table itself plus its name and help strings
+        constexpr size_t rom_bytes() const {
+            size_t bytes = sizeof(entries);
+            for (size_t i = 0; i < N; i++) {
+                bytes += detail::const_strlen(entries[i].name) + 1;
+                bytes += detail::const_strlen(entries[i].help) + 1;
+            }
+            return bytes;
+        }
+    };
+
+    /**
+     * Build a name-sorted command table at compile time:
+     *   constexpr auto table = make_command_table<MyContext>({
+     *       CLI_REGISTER_COMMAND(hello, hello_cmd, "Says hello"),
+     *   });
+     */
+    template<typename ContextType, size_t N>
+    constexpr CommandTable<ContextType, N> make_command_table(const CommandDefinition<ContextType> (&commands)[N]) {
+        CommandTable<ContextType, N> table{};
+        for (size_t i = 0; i < N; i++) {
+            // Insertion sort -- runs in the compiler, not on target
+            size_t j = i;
+            while (j > 0 && detail::const_strcmp(commands[i].name, table.entries[j - 1].name) < 0) {
+                table.entries[j] = table.entries[j - 1];
+                j--;
+            }
+            table.entries[j] = commands[i];
+        }
+        return table;
+    }
+
 }
\ No newline at end of file
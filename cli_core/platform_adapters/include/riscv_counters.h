@@ -0,0 +1,52 @@
+#pragma once
+
+#include "cli_types.h"
+#include <cstdint>
+
+namespace cli_core {
+namespace riscv {
+
+    /**
+     * RISC-V performance counter access (Zicntr).
+     * On MicroBlaze V these require C_USE_COUNTERS = 1 in the core configuration.
+     */
+
+    // Low 32 bits of the cycle counter -- cheap tick source for TaskScheduler
+    inline uint32_t read_cycle32() {
+        uint32_t value;
+        asm volatile("csrr %0, mcycle" : "=r"(value));
+        return value;
+    }
+
+    // Full 64-bit cycle counter, read consistently on RV32
+    inline uint64_t read_cycle() {
+        uint32_t hi, lo, hi2;
+        do {
+            asm volatile("csrr %0, mcycleh" : "=r"(hi));
+            asm volatile("csrr %0, mcycle" : "=r"(lo));
+            asm volatile("csrr %0, mcycleh" : "=r"(hi2));
+        } while (hi != hi2);
+        return (static_cast<uint64_t>(hi) << 32) | lo;
+    }
+
+    // Full 64-bit retired instruction counter, read consistently on RV32
+    inline uint64_t read_instret() {
+        uint32_t hi, lo, hi2;
+        do {
+            asm volatile("csrr %0, minstreth" : "=r"(hi));
+            asm volatile("csrr %0, minstret" : "=r"(lo));
+            asm volatile("csrr %0, minstreth" : "=r"(hi2));
+        } while (hi != hi2);
+        return (static_cast<uint64_t>(hi) << 32) | lo;
+    }
+
+    // Counter source for CliEngine::set_perf_counter()
+    inline PerfSample read_perf_sample() {
+        PerfSample sample;
+        sample.cycles = read_cycle();
+        sample.instret = read_instret();
+        return sample;
+    }
+
+}
+}
@@ -26,6 +26,8 @@ namespace cli_core {
             void send_fmt(const char* fmt, ...) override;
             void send_byte(uint8_t byte) override;
             uint8_t get_byte() override;
+            bool try_get_byte(uint8_t& byte) override;
+            void flush() override;
         
         private:
             void send_str(const char* s);
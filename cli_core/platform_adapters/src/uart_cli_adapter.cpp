@@ -151,4 +151,12 @@ namespace cli_core {
      uint8_t UartCliAdapter::get_byte() {
          return uart_.get_byte();
      }
+
+     bool UartCliAdapter::try_get_byte(uint8_t& byte) {
+         return uart_.try_get_byte(byte);
+     }
+
+     void UartCliAdapter::flush() {
+         uart_.flush();
+     }
 }
\ No newline at end of file
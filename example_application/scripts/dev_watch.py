@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+Watch-mode edit/build/run loop for the example application.
+
+Replaces 'make bar' plus reattaching a terminal for every edit. Watches the
+sources that vitis_application_script.py imports (cli_core/include,
+cli_core/platform_adapters/include and src, the application src/) and, once
+edits have settled (--debounce):
+  - re-imports the changed files into the existing application component
+    (source_import.py, following its import manifest) and runs an
+    incremental CMake build of it (only the touched objects recompile); the
+    first build, or a workspace without a build tree, goes through Vitis
+  - downloads only the ELF: over JTAG without reprogramming the FPGA or
+    resetting the system, or with --deploy uart through the 'load' command
+  - keeps a UART console attached, reconnecting when the port goes away, and
+    forwards typed lines to the shell
+  - reports each cycle's latency from the edit to the new image's prompt
+
+Change detection uses inotify on Linux and falls back to polling
+(--backend poll, e.g. for network filesystems).
+
+Usage:
+  python dev_watch.py --workspace_dir build --app_name arty_s7_riscv_app \\
+      --cli_core_dir ../cli_core --app_src_dir src --platform_dir ... --serial_port /dev/ttyUSB1
+  python dev_watch.py ... --program           # configure the FPGA from the XSA first
+  python dev_watch.py ... --deploy uart       # reload over the console instead of JTAG
+
+The compile defines written by the Vitis build (version, git hash, build
+profile, UART baud) are not regenerated by incremental builds; 'make app'
+refreshes them.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import shlex
+import shutil
+import statistics
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from repo_paths import APP_SCRIPT_DIR
+import source_import
+import uart_baud
+
+APP_BUILD_SCRIPT = os.path.join(APP_SCRIPT_DIR, "vitis_application_script.py")
+
+# Files whose change triggers a rebuild; editor swap/backup files are ignored
+SOURCE_SUFFIXES = (".c", ".cc", ".cpp", ".h", ".hpp", ".S", ".s", ".ld")
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")   # wd, mask, cookie, len
+
+
+def is_source(path):
+    name = os.path.basename(path)
+    return not name.startswith(".") and name.endswith(SOURCE_SUFFIXES)
+
+
+def source_files(roots):
+    files = set()
+    for root in roots:
+        for directory, _, names in os.walk(root):
+            files.update(os.path.join(directory, name) for name in names if is_source(name))
+    return files
+
+
+class PollingWatcher:
+    """Detects changes by comparing (mtime, size) snapshots of the source files."""
+
+    name = "poll"
+
+    def __init__(self, roots, interval=0.25):
+        self.roots = roots
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for path in source_files(self.roots):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout):
+        """Changed paths, or an empty set if nothing changed within timeout."""
+        deadline = time.time() + timeout
+        while True:
+            current = self.scan()
+            changed = {path for path in set(current) | set(self.snapshot)
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed or time.time() >= deadline:
+                return changed
+            time.sleep(min(self.interval, max(0.0, deadline - time.time())))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify through libc, one watch per directory under the roots."""
+
+    name = "inotify"
+
+    def __init__(self, roots):
+        self.roots = roots
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        for root in roots:
+            self.add_tree(root)
+
+    def add_tree(self, top):
+        for directory, _, _ in os.walk(top):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.directories[wd] = directory
+
+    def wait(self, timeout):
+        """Changed paths, or an empty set if nothing changed within timeout."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; let the content comparison in sync() sort it out
+                    changed.update(source_files(self.roots))
+                    continue
+                directory = self.directories.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and os.path.isdir(path):
+                        self.add_tree(path)
+                        changed.update(source_files([path]))
+                elif is_source(name):
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(roots, backend="auto", interval=0.25):
+    if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError) as e:
+            if backend == "inotify":
+                raise
+            print(f"⚠️  inotify unavailable ({e}); polling every {interval} s")
+    elif backend == "inotify":
+        raise OSError("inotify needs Linux")
+    return PollingWatcher(roots, interval)
+
+
+class IncrementalBuild:
+    """Rebuilds the existing application component in place with its own CMake."""
+
+    def __init__(self, workspace_dir, app_name, tasks, jobs=None, verbose=False):
+        self.component_dir = os.path.join(workspace_dir, app_name)
+        self.src_dir = os.path.join(self.component_dir, "src")
+        self.build_dir = os.path.join(self.component_dir, "build")
+        self.elf = os.path.join(self.build_dir, f"{app_name}.elf")
+        self.tasks = tasks
+        self.jobs = jobs or os.cpu_count() or 1
+        self.verbose = verbose
+
+    def cache_entry(self, key):
+        """Value of a CMakeCache.txt entry, or None."""
+        cache = os.path.join(self.build_dir, "CMakeCache.txt")
+        if not os.path.exists(cache):
+            return None
+        with open(cache, errors="replace") as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return line.split("=", 1)[1].strip()
+        return None
+
+    def ready(self):
+        """True if the workspace holds a configured build tree to rebuild."""
+        return os.path.isdir(self.src_dir) and self.cmake() is not None
+
+    def cmake(self):
+        """The cmake that configured the build tree (Vitis ships its own)."""
+        command = self.cache_entry("CMAKE_COMMAND")
+        if command and os.path.exists(command):
+            return command
+        if command is None:
+            return None
+        return shutil.which("cmake")
+
+    def importer(self):
+        """Source importer of the component, from its import manifest."""
+        manifest = source_import.read_manifest(self.component_dir)
+        if manifest:
+            return source_import.SourceImporter(
+                self.component_dir, manifest['tasks'], source_import.SourcePool(manifest['pool']),
+                shared_includes=manifest['shared_includes'])
+        # Imported before manifests existed: record what is there first
+        importer = source_import.SourceImporter(self.component_dir, self.tasks)
+        importer.record_existing()
+        return importer
+
+    def sync(self, paths):
+        """
+        Bring the component's src/ in line with the changed sources.
+
+        Returns:
+            (updated, removed, layout_changed): see SourceImporter.update();
+            files appearing or disappearing needs a CMake configure
+        """
+        return self.importer().update(paths)
+
+    def run(self, command):
+        result = subprocess.run(command, capture_output=True, text=True)
+        output = (result.stdout + result.stderr).splitlines()
+        for line in output:
+            if self.verbose or result.returncode != 0 or "warning:" in line or "error" in line.lower():
+                print(f"  {line}")
+        return result.returncode == 0
+
+    def build(self, configure=False):
+        cmake = self.cmake()
+        if configure and not self.run([cmake, self.build_dir]):
+            return False
+        return self.run([cmake, "--build", self.build_dir, "--parallel", str(self.jobs)])
+
+
+class Console:
+    """
+    UART console of the application that survives reloads and unplugging.
+
+    A reader thread echoes target output and watches for the shell prompt;
+    a second thread forwards lines typed on stdin.
+    """
+
+    def __init__(self, serial_port, baud, forward_input=True):
+        self.serial_port = serial_port
+        self.baud = baud
+        self.forward_input = forward_input
+        self.port = None
+        self.running = False
+        self.paused = False
+        self.io_lock = threading.Lock()
+        self.state_lock = threading.Lock()
+        self.armed = False
+        self.seen = ""
+        self.prompt_time = None
+        self.prompt_event = threading.Event()
+        self.connected_once = False
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self.read_loop, daemon=True).start()
+        if self.forward_input:
+            threading.Thread(target=self.input_loop, daemon=True).start()
+
+    def stop(self):
+        self.running = False
+        with self.io_lock:
+            if self.port:
+                self.port.close()
+                self.port = None
+
+    def connect(self):
+        try:
+            self.port = uart_baud.open_port(self.serial_port, self.baud)
+        except Exception:
+            time.sleep(0.5)
+            return
+        note = "reconnected" if self.connected_once else "attached"
+        print(f"✓ Console {note}: {self.serial_port} at {self.baud} baud", flush=True)
+        self.connected_once = True
+
+    def read_loop(self):
+        while self.running:
+            with self.io_lock:
+                if self.paused:
+                    data = b""
+                elif self.port is None:
+                    self.connect()
+                    continue
+                else:
+                    try:
+                        data = self.port.read(max(1, self.port.in_waiting))
+                    except Exception:
+                        print(f"\n⚠️  Console lost ({self.serial_port}); reconnecting", flush=True)
+                        self.port.close()
+                        self.port = None
+                        continue
+            if data:
+                self.feed(data.decode("ascii", "replace"))
+            elif self.paused:
+                time.sleep(0.05)
+
+    def input_loop(self):
+        for line in sys.stdin:
+            with self.io_lock:
+                if self.port and not self.paused:
+                    try:
+                        self.port.write(line.rstrip("\r\n").encode() + b"\r")
+                    except Exception:
+                        pass
+
+    def feed(self, text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        with self.state_lock:
+            if not self.armed:
+                return
+            self.seen = (self.seen + text)[-256:]
+            if uart_baud.PROMPT in self.seen:
+                self.prompt_time = time.time()
+                self.armed = False
+                self.prompt_event.set()
+
+    def arm(self):
+        """Start looking for the next prompt (the new image's)."""
+        with self.state_lock:
+            self.seen = ""
+            self.prompt_time = None
+            self.prompt_event.clear()
+            self.armed = True
+
+    def wait_prompt(self, timeout):
+        """Time the armed prompt arrived, or None."""
+        if self.prompt_event.wait(timeout):
+            return self.prompt_time
+        with self.state_lock:
+            self.armed = False
+        return None
+
+    def pause(self):
+        """Stop reading and hand out the open port (None if not connected)."""
+        with self.io_lock:
+            self.paused = True
+            return self.port
+
+    def resume(self):
+        with self.io_lock:
+            self.paused = False
+
+
+class DevWatch:
+    """The watch loop: detect, debounce, rebuild, deploy, time to prompt."""
+
+    def __init__(self, args):
+        self.args = args
+        tasks = source_import.import_tasks(args.cli_core_dir, args.app_src_dir)
+        self.roots = [task['src'] for task in tasks]
+        self.builder = IncrementalBuild(args.workspace_dir, args.app_name, tasks,
+                                        jobs=args.jobs, verbose=args.verbose)
+        self.console = None
+        self.watcher = None
+        self.cycles = []
+        self.last_cycle_end = time.time()
+
+    def full_build(self):
+        """The 'make app' build through Vitis; recreates the component."""
+        command = [self.args.vitis, "-s", APP_BUILD_SCRIPT,
+                   "--workspace_dir", self.args.workspace_dir,
+                   "--platform_dir", self.args.platform_dir,
+                   "--cli_core_dir", self.args.cli_core_dir,
+                   "--app_src_dir", self.args.app_src_dir,
+                   "--app_name", self.args.app_name] + shlex.split(self.args.build_args)
+        print("Running full Vitis build...")
+        result = subprocess.run(command, capture_output=not self.args.verbose, text=True)
+        if result.returncode != 0 or not os.path.exists(self.builder.elf):
+            if not self.args.verbose:
+                print("\n".join((result.stdout + result.stderr).splitlines()[-30:]))
+            return False
+        return True
+
+    def deploy(self):
+        """Load the new ELF onto the running board; True on success."""
+        if self.args.deploy == "none":
+            return True
+        if self.args.deploy == "jtag":
+            import xsdb_platform_script
+            if self.console:
+                self.console.arm()
+            return xsdb_platform_script.download_elf_only(
+                self.builder.elf, xsa_file_path=self.args.xsa, cable_serial=self.args.cable_serial,
+                xsdb_path=self.args.xsdb_path)
+
+        import uart_loader
+        port = self.console.pause()
+        try:
+            if port is None:
+                print("❌ Console is not connected; cannot reload over the UART")
+                return False
+            options = argparse.Namespace(timeout=2.0, retries=5, verbose=self.args.verbose,
+                                         block=1024, window=4, chunk=256, full=False,
+                                         dry_run=False, boot_timeout=0)
+            loader = uart_loader.UartLoader(port, options)
+            try:
+                loader.run(self.builder.elf)
+            except (uart_loader.LoaderError, ValueError, OSError) as e:
+                print(f"❌ {e}")
+                return False
+            # The new image may already have started talking in the loader's last read
+            self.console.arm()
+            self.console.feed(bytes(loader.link.rx).decode("ascii", "replace"))
+            return True
+        finally:
+            self.console.resume()
+
+    def program(self):
+        import xsdb_platform_script
+        if not self.args.xsa:
+            print("❌ --program needs --xsa")
+            return False
+        return xsdb_platform_script.program_arty_s7_fpga(
+            None, self.builder.elf, xsa_file_path=self.args.xsa, cable_serial=self.args.cable_serial,
+            xsdb_path=self.args.xsdb_path)
+
+    def collect(self):
+        """
+        Wait for an edit, then for edits to stop for --debounce seconds.
+
+        Returns:
+            (changed paths, time of the first event)
+        """
+        changed = set()
+        while not changed:
+            changed = self.watcher.wait(1.0)
+        first_event = time.time()
+        while True:
+            more = self.watcher.wait(self.args.debounce)
+            if not more:
+                return changed, first_event
+            changed |= more
+
+    def edit_time(self, paths, first_event):
+        """Best estimate of when the edit was saved: the newest relevant mtime."""
+        times = []
+        for path in paths:
+            try:
+                times.append(os.stat(path).st_mtime)
+            except OSError:
+                pass
+        edit = max(times) if times else first_event
+        return max(min(edit, first_event), self.last_cycle_end)
+
+    def cycle(self, paths, first_event):
+        detected = time.time()
+        edit = self.edit_time(paths, first_event)
+        names = sorted({os.path.basename(p) for p in paths})
+        print(f"\n{'='*60}")
+        print(f"Change: {', '.join(names[:6])}{' ...' if len(names) > 6 else ''}")
+
+        timings = {"detect": first_event - edit, "debounce": detected - first_event}
+        start = time.time()
+        if self.builder.ready():
+            updated, removed, layout_changed = self.builder.sync(paths)
+            if not updated and not removed:
+                print("✓ Sources match the component; nothing to rebuild")
+                return
+            print(f"Rebuilding: {len(updated)} updated, {len(removed)} removed"
+                  f"{', reconfiguring' if layout_changed else ''}")
+            built = self.builder.build(configure=layout_changed)
+        else:
+            print("⚠️  No build tree in the workspace; falling back to a full build")
+            built = self.full_build()
+        timings["build"] = time.time() - start
+        if not built:
+            print(f"❌ Build failed after {timings['build']:.1f} s; waiting for the next edit")
+            return
+        print(f"✓ Built {os.path.basename(self.builder.elf)} in {timings['build']:.1f} s")
+
+        start = time.time()
+        if not self.deploy():
+            print("❌ Deploy failed; waiting for the next edit")
+            return
+        timings["deploy"] = time.time() - start
+        end = time.time()
+        if self.console and self.args.deploy != "none":
+            prompt = self.console.wait_prompt(self.args.boot_timeout)
+            if prompt is None:
+                print(f"\n⚠️  No prompt from the new image within {self.args.boot_timeout} s")
+            else:
+                timings["boot"] = prompt - end
+                end = prompt
+        total = end - edit
+        self.cycles.append(total)
+        self.last_cycle_end = time.time()
+        target = "prompt" if "boot" in timings else ("deployed" if self.args.deploy != "none" else "built")
+        detail = ", ".join(f"{name} {seconds:.2f}" for name, seconds in timings.items())
+        print(f"\n⏱  Cycle {len(self.cycles)}: edit→{target} {total:.2f} s ({detail})", flush=True)
+
+    def summary(self):
+        if not self.cycles:
+            return
+        print(f"\n{'='*60}")
+        print(f"Cycles: {len(self.cycles)}, edit→prompt median {statistics.median(self.cycles):.2f} s, "
+              f"best {min(self.cycles):.2f} s, worst {max(self.cycles):.2f} s")
+        print(f"{'='*60}")
+
+    def run(self):
+        args = self.args
+        if not self.builder.ready():
+            print("No application build yet; building it first")
+            if not self.full_build():
+                print("❌ Initial build failed")
+                return False
+        if args.program and not self.program():
+            return False
+
+        if args.serial_port:
+            try:
+                import serial
+            except ImportError:
+                raise RuntimeError("The console needs pyserial (pip install pyserial); --serial_port '' runs without it")
+            baud = uart_baud.resolve_baud(args.baud, args.serial_port, args.xsa, args.platform_dir)
+            self.console = Console(args.serial_port, baud, forward_input=not args.no_input)
+            self.console.start()
+
+        self.watcher = make_watcher(self.roots, args.backend, args.poll_interval)
+        print(f"Watching {len(self.roots)} directories ({self.watcher.name}, debounce {args.debounce} s), "
+              f"deploy: {args.deploy}. Ctrl-C to stop.")
+        try:
+            while True:
+                paths, first_event = self.collect()
+                self.cycle(paths, first_event)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.watcher.close()
+            if self.console:
+                self.console.stop()
+            self.summary()
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild and redeploy the application on every source edit.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:", 1)[1]
+    )
+    parser.add_argument("--workspace_dir", type=str, default="build", help="Vitis workspace of the application")
+    parser.add_argument("--app_name", type=str, default="arty_s7_riscv_app", help="Application component name")
+    parser.add_argument("--cli_core_dir", type=str, required=True, help="Path to CLI core directory")
+    parser.add_argument("--app_src_dir", type=str, required=True, help="Path to application source directory")
+    parser.add_argument("--platform_dir", type=str, required=True, help="Path to platform component directory")
+    parser.add_argument("--vitis", type=str, default="vitis", help="Path to the vitis executable (full builds)")
+    parser.add_argument("--build_args", type=str, default="",
+                        help="Extra vitis_application_script.py options for full builds")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel compile jobs (default: CPUs)")
+
+    parser.add_argument("--backend", choices=["auto", "inotify", "poll"], default="auto", help="Change detection")
+    parser.add_argument("--poll_interval", type=float, default=0.25, help="Seconds between scans for --backend poll")
+    parser.add_argument("--debounce", type=float, default=0.3, help="Quiet time after an edit before building")
+
+    parser.add_argument("--deploy", choices=["jtag", "uart", "none"], default="jtag",
+                        help="How to load the new ELF: JTAG download, the UART 'load' command, or build only")
+    parser.add_argument("--program", action="store_true", help="Configure the FPGA from --xsa before watching")
+    parser.add_argument("--xsa", type=str, default=None, help="Platform XSA (memory map, bitstream, baud rate)")
+    parser.add_argument("--cable_serial", type=str, default=None, help="JTAG cable serial number (optional)")
+    parser.add_argument("--xsdb_path", type=str, default="xsdb", help="Path to the xsdb executable")
+    parser.add_argument("--serial_port", type=str, default="/dev/ttyUSB1",
+                        help="UART console port ('' for no console)")
+    uart_baud.add_baud_argument(parser)
+    parser.add_argument("--boot_timeout", type=float, default=10.0, help="Seconds to wait for the new prompt")
+    parser.add_argument("--no_input", action="store_true", help="Do not forward stdin to the console")
+    parser.add_argument("--verbose", action="store_true", help="Show full build output")
+    args = parser.parse_args()
+
+    if args.deploy == "uart" and not args.serial_port:
+        parser.error("--deploy uart needs --serial_port")
+    for name in ("workspace_dir", "cli_core_dir", "app_src_dir", "platform_dir"):
+        setattr(args, name, os.path.abspath(getattr(args, name)))
+    if args.xsa:
+        args.xsa = os.path.abspath(args.xsa)
+
+    try:
+        return 0 if DevWatch(args).run() else 1
+    except (RuntimeError, ValueError, OSError) as e:
+        print(f"❌ {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
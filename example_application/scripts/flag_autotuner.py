@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Compiler/linker flag autotuner for the example application.
+
+Builds a set of candidate flag combinations (optimization level, LTO, inlining
+limit, -msave-restore, section GC) through vitis_application_script.py in
+parallel Vitis workers, measures ELF size and the cycle count of a benchmark,
+and prints the size/speed Pareto front. The selected candidate is written as a
+build profile that 'vitis_application_script.py --build_profile' (or
+'make app BUILD_PROFILE=...') reuses.
+
+Benchmarks:
+  - board:   load each ELF over JTAG and run 'bench_cpu' on the UART shell (needs pyserial)
+  - command: run a stand-in (simulator, emulator, ...) given as --bench_command;
+             '{elf}' is replaced by the ELF path and the output must contain 'cycles=<N>'
+  - none:    size only
+
+Usage:
+  python flag_autotuner.py --platform_dir ... --cli_core_dir ... --app_src_dir ... --bench none
+  python flag_autotuner.py ... --bench command --bench_command "my_sim --elf {elf}"
+  python flag_autotuner.py ... --bench board --bitfile hw.bit --xsa hw.xsa --serial_port /dev/ttyUSB1
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import hashlib
+import itertools
+import json
+import os
+import random
+import re
+import shlex
+import struct
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+VITIS_BUILD_SCRIPT = os.path.join(SCRIPT_DIR, "vitis_application_script.py")
+
+# Flags every candidate needs for the application to behave the same
+BASE_COMPILE_FLAGS = ["-fno-rtti", "-fno-exceptions", "-fno-threadsafe-statics", "-s"]
+
+# Search space; the first value of each dimension reproduces the default build
+SEARCH_SPACE = {
+    "opt": ["-Os", "-O2", "-O3", "-Oz", "-O1"],
+    "lto": [False, True],
+    "inline_limit": [None, 20, 200],
+    "save_restore": [False, True],
+    "gc_sections": [True, False],
+}
+
+BENCH_CYCLES_PATTERN = re.compile(r"\bcycles=(\d+)")
+
+
+def candidate_flags(options):
+    """Translate one point of the search space into compile and link flags."""
+    compile_flags = list(BASE_COMPILE_FLAGS)
+    link_flags = []
+
+    if options["gc_sections"]:
+        compile_flags += ["-ffunction-sections", "-fdata-sections"]
+        link_flags.append("-Wl,--gc-sections")
+    compile_flags.append(options["opt"])
+    if options["lto"]:
+        compile_flags.append("-flto")
+        link_flags += ["-flto", options["opt"]]
+    if options["inline_limit"] is not None:
+        compile_flags.append(f"-finline-limit={options['inline_limit']}")
+    if options["save_restore"]:
+        compile_flags.append("-msave-restore")
+
+    return compile_flags, link_flags
+
+
+def candidate_name(options):
+    parts = [options["opt"].lstrip("-")]
+    if options["lto"]:
+        parts.append("lto")
+    if options["inline_limit"] is not None:
+        parts.append(f"inl{options['inline_limit']}")
+    if options["save_restore"]:
+        parts.append("sr")
+    if not options["gc_sections"]:
+        parts.append("nogc")
+    return "-".join(parts)
+
+
+def generate_candidates(strategy, max_candidates, seed):
+    """Baseline first, then the grid or a random sample of it."""
+    keys = list(SEARCH_SPACE)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*(SEARCH_SPACE[key] for key in keys))]
+    baseline, rest = grid[0], grid[1:]
+
+    if strategy == "random":
+        random.Random(seed).shuffle(rest)
+    selected = [baseline] + rest[:max(0, max_candidates - 1)]
+
+    candidates = []
+    for options in selected:
+        compile_flags, link_flags = candidate_flags(options)
+        key = hashlib.sha1(" ".join(compile_flags + ["|"] + link_flags).encode()).hexdigest()[:10]
+        candidates.append({
+            "name": candidate_name(options),
+            "key": key,
+            "options": options,
+            "compile_flags": compile_flags,
+            "link_flags": link_flags,
+        })
+    return candidates
+
+
+def elf_sizes(elf_path):
+    """Berkeley-style text/data/bss sizes from the ELF32 section headers."""
+    with open(elf_path, "rb") as f:
+        data = f.read()
+    if data[:4] != b"\x7fELF" or data[4] != 1:
+        raise ValueError(f"Not an ELF32 file: {elf_path}")
+
+    e_shoff = struct.unpack_from("<I", data, 0x20)[0]
+    e_shentsize, e_shnum = struct.unpack_from("<HH", data, 0x2E)
+
+    sizes = {"text": 0, "data": 0, "bss": 0}
+    for i in range(e_shnum):
+        (_, sh_type, sh_flags, _, _, sh_size) = struct.unpack_from("<6I", data, e_shoff + i * e_shentsize)
+        if not sh_flags & 0x2:          # SHF_ALLOC
+            continue
+        if sh_type == 8:                # SHT_NOBITS
+            sizes["bss"] += sh_size
+        elif sh_flags & 0x1:            # SHF_WRITE
+            sizes["data"] += sh_size
+        else:
+            sizes["text"] += sh_size
+    sizes["image"] = sizes["text"] + sizes["data"]
+    return sizes
+
+
+class CandidateBuilder:
+    """Builds one candidate per Vitis worker process, each in its own workspace."""
+
+    def __init__(self, args):
+        self.args = args
+
+    def workspace(self, candidate):
+        return os.path.join(self.args.work_dir, f"{candidate['name']}_{candidate['key']}")
+
+    def elf_path(self, candidate):
+        return os.path.join(self.workspace(candidate), self.args.app_name, "build", f"{self.args.app_name}.elf")
+
+    def build(self, candidate):
+        workspace = self.workspace(candidate)
+        elf = self.elf_path(candidate)
+        result = {"elf": elf, "log": os.path.join(workspace, "build.log")}
+
+        if self.args.reuse and os.path.exists(elf):
+            result.update(success=True, build_seconds=0.0, reused=True)
+            return result
+
+        os.makedirs(workspace, exist_ok=True)
+        profile_path = os.path.join(workspace, "build_profile.json")
+        with open(profile_path, "w") as f:
+            json.dump({"name": candidate["name"],
+                       "compile_flags": candidate["compile_flags"],
+                       "link_flags": candidate["link_flags"]}, f, indent=2)
+
+        command = [
+            self.args.vitis, "-s", VITIS_BUILD_SCRIPT,
+            "--workspace_dir", workspace,
+            "--platform_dir", self.args.platform_dir,
+            "--cli_core_dir", self.args.cli_core_dir,
+            "--app_src_dir", self.args.app_src_dir,
+            "--app_name", self.args.app_name,
+            "--build_profile", profile_path,
+        ]
+        start = time.time()
+        try:
+            with open(result["log"], "w") as log:
+                completed = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT,
+                                           cwd=workspace, timeout=self.args.build_timeout)
+            success = completed.returncode == 0 and os.path.exists(elf)
+        except (subprocess.TimeoutExpired, OSError) as e:
+            print(f"  {candidate['name']}: build error: {e}")
+            success = False
+
+        result.update(success=success, build_seconds=time.time() - start, reused=False)
+        return result
+
+
+class Benchmark:
+    """Cycle-count benchmark on the board or through a stand-in command."""
+
+    def __init__(self, args):
+        self.args = args
+        self.serial = None
+        self.baud = None
+
+    @staticmethod
+    def parse_cycles(output):
+        """Cycles from the 'BENCH test=cpu' line, else the last 'cycles=' in the output."""
+        cpu_lines = [line for line in output.splitlines() if "BENCH" in line and "test=cpu" in line]
+        for text in (cpu_lines[-1:] or [output]):
+            matches = BENCH_CYCLES_PATTERN.findall(text)
+            if matches:
+                return int(matches[-1])
+        return None
+
+    def run(self, elf):
+        if self.args.bench == "command":
+            return self.run_command(elf)
+        if self.args.bench == "board":
+            return self.run_board(elf)
+        return None
+
+    def run_command(self, elf):
+        command = [part.replace("{elf}", elf) for part in shlex.split(self.args.bench_command)]
+        try:
+            completed = subprocess.run(command, capture_output=True, text=True, timeout=self.args.bench_timeout)
+        except (subprocess.TimeoutExpired, OSError) as e:
+            print(f"  Benchmark error: {e}")
+            return None
+        return self.parse_cycles(completed.stdout)
+
+    def run_board(self, elf):
+        try:
+            import serial
+        except ImportError:
+            raise RuntimeError("Board benchmarks need pyserial (pip install pyserial)")
+
+        from xsdb_platform_script import program_arty_s7_fpga
+        import uart_baud
+
+        if not program_arty_s7_fpga(self.args.bitfile, elf, self.args.xsa,
+                                    cable_serial=self.args.cable_serial, xsdb_path=self.args.xsdb_path):
+            return None
+
+        if self.baud is None:
+            self.baud = uart_baud.resolve_baud(self.args.baud, self.args.serial_port, self.args.xsa)
+        with serial.Serial(self.args.serial_port, self.baud, timeout=0.5) as port:
+            port.reset_input_buffer()
+            port.write(f"\rbench_cpu {self.args.bench_iterations}\r".encode())
+            output = ""
+            deadline = time.time() + self.args.bench_timeout
+            while time.time() < deadline:
+                output += port.read(256).decode("ascii", "replace")
+                if "test=cpu" in output and output.rstrip().endswith(">"):
+                    break
+        return self.parse_cycles(output)
+
+
+def pareto_front(results, use_cycles=True):
+    """
+    Results not dominated in (image size, cycles), or in image size alone without a benchmark.
+
+    With cycles, results the benchmark gave no cycle count for are left out:
+    they cannot be compared on speed and must not displace timed results.
+    """
+    points = [result for result in results if result["cycles"] is not None] if use_cycles else results
+    front = []
+    for result in points:
+        dominated = False
+        for other in points:
+            if other is result:
+                continue
+            size_le = other["sizes"]["image"] <= result["sizes"]["image"]
+            if not use_cycles:
+                cycles_le, strictly = True, other["sizes"]["image"] < result["sizes"]["image"]
+            else:
+                cycles_le = other["cycles"] <= result["cycles"]
+                strictly = other["sizes"]["image"] < result["sizes"]["image"] or other["cycles"] < result["cycles"]
+            if size_le and cycles_le and strictly:
+                dominated = True
+                break
+        if not dominated:
+            front.append(result)
+    return sorted(front, key=lambda result: result["sizes"]["image"])
+
+
+def select(front, mode, max_size=None):
+    """Pick one point of the front: smallest, fastest, or the knee (closest to the ideal point)."""
+    if max_size is not None:
+        front = [result for result in front if result["sizes"]["image"] <= max_size]
+    if not front:
+        return None
+
+    timed = [result for result in front if result["cycles"] is not None]
+    if mode == "size" or not timed:
+        return min(front, key=lambda result: result["sizes"]["image"])
+    if mode == "speed":
+        return min(timed, key=lambda result: result["cycles"])
+
+    sizes = [result["sizes"]["image"] for result in timed]
+    cycles = [result["cycles"] for result in timed]
+
+    def normalized(value, values):
+        span = max(values) - min(values)
+        return (value - min(values)) / span if span else 0.0
+
+    return min(timed, key=lambda result: normalized(result["sizes"]["image"], sizes) ** 2 +
+                                         normalized(result["cycles"], cycles) ** 2)
+
+
+def print_results(results, front, baseline, bench="none"):
+    on_front = {id(result) for result in front}
+    print(f"\n{'='*78}")
+    print(f"Flag Autotuner Results")
+    print(f"{'='*78}")
+    print(f"{'':2}{'candidate':<22} {'text':>8} {'data':>7} {'bss':>7} {'image':>8} {'cycles':>12} {'vs base':>8}")
+    for result in sorted(results, key=lambda result: result["sizes"]["image"]):
+        marker = "* " if id(result) in on_front else "  "
+        cycles = f"{result['cycles']}" if result["cycles"] is not None else ("failed" if bench != "none" else "-")
+        ratio = "-"
+        if baseline and result["cycles"] and baseline["cycles"]:
+            ratio = f"x{result['cycles'] / baseline['cycles']:.3f}"
+        sizes = result["sizes"]
+        print(f"{marker}{result['name']:<22} {sizes['text']:>8} {sizes['data']:>7} {sizes['bss']:>7} "
+              f"{sizes['image']:>8} {cycles:>12} {ratio:>8}")
+    print(f"\n* = Pareto front (image = text + data)")
+
+
+def write_profile(result, path, mode, bench):
+    """Write the selected candidate as a reusable build profile."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    profile = {
+        "name": result["name"],
+        "description": f"Selected by flag_autotuner.py ({mode}, benchmark: {bench})",
+        "generated": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "compile_flags": result["compile_flags"],
+        "link_flags": result["link_flags"],
+        "metrics": {"sizes": result["sizes"], "cycles": result["cycles"]},
+    }
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+    print(f"✓ Build profile written: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search compiler/linker flags for the size/speed trade-off of the application.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:", 1)[1]
+    )
+    parser.add_argument("--platform_dir", type=str, required=True, help="Path to platform component directory")
+    parser.add_argument("--cli_core_dir", type=str, required=True, help="Path to CLI core directory")
+    parser.add_argument("--app_src_dir", type=str, required=True, help="Path to application source directory")
+    parser.add_argument("--app_name", type=str, default="arty_s7_riscv_app", help="Application component name")
+    parser.add_argument("--work_dir", type=str, default="build_autotune", help="Directory for candidate workspaces")
+    parser.add_argument("--vitis", type=str, default="vitis", help="Path to the vitis executable")
+    parser.add_argument("--jobs", type=int, default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+                        help="Parallel Vitis build workers")
+    parser.add_argument("--strategy", choices=["grid", "random"], default="random", help="Candidate selection")
+    parser.add_argument("--max_candidates", type=int, default=16, help="Number of candidates including the baseline")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for --strategy random")
+    parser.add_argument("--reuse", action="store_true", help="Skip builds whose ELF already exists in --work_dir")
+    parser.add_argument("--build_timeout", type=int, default=1800, help="Seconds per candidate build")
+    parser.add_argument("--dry_run", action="store_true", help="List candidates without building")
+
+    parser.add_argument("--bench", choices=["none", "command", "board"], default="none", help="Cycle benchmark")
+    parser.add_argument("--bench_command", type=str, help="Stand-in benchmark command; '{elf}' is replaced")
+    parser.add_argument("--bench_iterations", type=int, default=100, help="bench_cpu iterations on the board")
+    parser.add_argument("--bench_timeout", type=int, default=120, help="Seconds per benchmark run")
+    parser.add_argument("--bitfile", type=str, help="Bitstream for --bench board")
+    parser.add_argument("--xsa", type=str, help="XSA for --bench board")
+    parser.add_argument("--cable_serial", type=str, default=None, help="JTAG cable serial number (optional)")
+    parser.add_argument("--xsdb_path", type=str, default="xsdb", help="Path to the xsdb executable")
+    parser.add_argument("--serial_port", type=str, default="/dev/ttyUSB1", help="UART console port for --bench board")
+    parser.add_argument("--baud", type=str, default="xsa",
+                        help="UART console baud rate: a number, 'xsa' (from --xsa) or 'auto' (probe the shell)")
+
+    parser.add_argument("--select", choices=["knee", "size", "speed"], default="knee",
+                        help="Which point of the Pareto front to write as the profile")
+    parser.add_argument("--max_size", type=int, default=None, help="Only select candidates with image size <= this")
+    parser.add_argument("--profile_out", type=str, default="build_profiles/autotuned.json",
+                        help="Where to write the selected build profile")
+    args = parser.parse_args()
+
+    if args.bench == "command" and not args.bench_command:
+        parser.error("--bench command requires --bench_command")
+    if args.bench == "board" and not (args.bitfile and args.xsa):
+        parser.error("--bench board requires --bitfile and --xsa")
+
+    for name in ("platform_dir", "cli_core_dir", "app_src_dir", "work_dir"):
+        setattr(args, name, os.path.abspath(getattr(args, name)))
+
+    candidates = generate_candidates(args.strategy, args.max_candidates, args.seed)
+    print(f"Flag autotuner: {len(candidates)} candidates, {args.jobs} parallel builds, benchmark: {args.bench}")
+    for candidate in candidates:
+        print(f"  {candidate['name']:<22} {' '.join(candidate['compile_flags'])} | {' '.join(candidate['link_flags'])}")
+    if args.dry_run:
+        return 0
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    builder = CandidateBuilder(args)
+    builds = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(builder.build, candidate): candidate for candidate in candidates}
+        for future in concurrent.futures.as_completed(futures):
+            candidate = futures[future]
+            builds[candidate["key"]] = future.result()
+            status = "✓" if builds[candidate["key"]]["success"] else "❌"
+            print(f"{status} {candidate['name']} ({builds[candidate['key']]['build_seconds']:.0f} s)")
+
+    # One board: benchmarks run one at a time after the builds
+    benchmark = Benchmark(args)
+    results = []
+    for candidate in candidates:
+        build = builds[candidate["key"]]
+        if not build["success"]:
+            print(f"❌ {candidate['name']}: build failed, see {build['log']}")
+            continue
+        result = dict(candidate, elf=build["elf"], sizes=elf_sizes(build["elf"]), cycles=None)
+        if args.bench != "none":
+            result["cycles"] = benchmark.run(build["elf"])
+            if result["cycles"] is None:
+                print(f"⚠️  {candidate['name']}: no cycle count from the benchmark")
+        results.append(result)
+
+    if not results:
+        print("Error: no candidate built successfully")
+        return 1
+
+    baseline = next((result for result in results if result["key"] == candidates[0]["key"]), None)
+    front = pareto_front(results, use_cycles=args.bench != "none")
+    failed = [result for result in results if args.bench != "none" and result["cycles"] is None]
+    print_results(results, front, baseline, args.bench)
+    if failed:
+        print(f"❌ Benchmark failed for {len(failed)} candidate(s), left out of the Pareto front: "
+              f"{', '.join(result['name'] for result in failed)}")
+
+    with open(os.path.join(args.work_dir, "autotune_results.json"), "w") as f:
+        json.dump({"results": results, "pareto_front": [result["key"] for result in front],
+                   "benchmark_failures": [result["key"] for result in failed]}, f, indent=2)
+
+    if not front:
+        print("Error: the benchmark gave no cycle count for any candidate")
+        return 1
+
+    chosen = select(front, args.select, args.max_size)
+    if chosen is None:
+        print(f"Error: no Pareto-optimal candidate fits --max_size {args.max_size}")
+        return 1
+    print(f"\nSelected ({args.select}): {chosen['name']}")
+    write_profile(chosen, args.profile_out, args.select, args.bench)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+"""
+Profile-guided placement of hot functions into LMB BRAM.
+
+The application is built with -ffunction-sections, so every function lives in
+its own '.text.<symbol>' input section. Given a function-level profile and the
+linker map of a previous build, this picks the set of functions with the most
+profile weight that fits the free LMB space and generates a linker script that
+pins them into a '.lmb_text' output section in LMB. Everything else stays where
+the default Vitis script puts it (DDR behind mig_7series_0). The same script
+maps '.lmb_bss' into LMB for buffers that want zero-wait-state, uncached access.
+
+Profiles:
+  - PC samples: one hex address per line (see the 'sample' command)
+  - Trace: JSON written by 'trace_reader.py --profile' (cycles per function)
+  - Text: '<weight> <symbol>' per line, e.g. from another profiler
+
+Usage:
+  python lmb_placement.py sample --samples 2000 --out profile/pc_samples.txt
+  python lmb_placement.py plan --xsa hw.xsa --map output.map --profile profile/pc_samples.txt
+  python lmb_placement.py plan --platform_dir ../example_platform/build/arty_s7_riscv_platform \
+      --map output.map --profile prof.json --lscript lscript.ld --out lscript_lmb.ld
+  python lmb_placement.py report --before before.json --after after.json --plan lmb_plan.json
+
+The LMB base and size come from the processor's address map in the XSA.
+The build integration lives in vitis_application_script.py (--lmb_profile/--lmb_map).
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+
+import repo_paths  # noqa: F401  (shared import path)
+import xsa_index
+
+# Bytes kept free in LMB for output section alignment and linker padding
+DEFAULT_LMB_RESERVE = 256
+
+LMB_TEXT_SECTION = ".lmb_text"
+LMB_BSS_SECTION = ".lmb_bss"
+FUNCTION_SECTION_PREFIX = ".text."
+
+# Non-allocated output sections sit at address 0 in the map, on top of LMB
+NON_ALLOC_PREFIXES = (".debug", ".comment", ".riscv.attributes", ".gnu.attributes", ".stab", ".note")
+
+
+class MapFile:
+    """Parser for the GNU ld map file (-Wl,-Map=...) of a previous build."""
+
+    def __init__(self, map_path):
+        self.path = map_path
+        self.regions = []            # (name, origin, length)
+        self.output_sections = {}    # name -> (address, size)
+        self.input_sections = []     # dicts: name, output, address, size, object, symbols
+
+        with open(map_path) as f:
+            lines = f.read().splitlines()
+
+        self._parse(lines)
+
+        self.function_sections = sorted(
+            (section for section in self.input_sections
+             if section["name"].startswith(FUNCTION_SECTION_PREFIX) and section["size"] > 0),
+            key=lambda section: section["address"]
+        )
+        self._starts = [section["address"] for section in self.function_sections]
+
+        # Profile names resolve through the section suffix (mangled symbol) or any
+        # symbol the map lists inside the section (demangled when ld demangles)
+        self.by_name = {}
+        for section in self.function_sections:
+            self.by_name.setdefault(section["name"][len(FUNCTION_SECTION_PREFIX):], section)
+            for symbol in section["symbols"]:
+                self.by_name.setdefault(symbol, section)
+
+    @staticmethod
+    def _is_hex(token):
+        return token.startswith("0x")
+
+    def _parse(self, lines):
+        mode = None
+        pending_output = None
+        pending_input = None
+        current_output = None
+        current_input = None
+
+        for line in lines:
+            if line.startswith("Memory Configuration"):
+                mode = "memory"
+                continue
+            if line.startswith("Linker script and memory map"):
+                mode = "map"
+                continue
+            if not line.strip():
+                continue
+
+            tokens = line.split()
+
+            if mode == "memory":
+                if len(tokens) >= 3 and self._is_hex(tokens[1]) and tokens[0] != "*default*":
+                    self.regions.append((tokens[0], int(tokens[1], 16), int(tokens[2], 16)))
+                continue
+            if mode != "map":
+                continue
+
+            if not line[0].isspace():
+                # Output section header: name [address size]
+                pending_input = current_input = None
+                if not tokens[0].startswith("."):
+                    current_output = None
+                    continue
+                current_output = tokens[0]
+                if len(tokens) >= 3 and self._is_hex(tokens[1]) and self._is_hex(tokens[2]):
+                    self.output_sections[current_output] = (int(tokens[1], 16), int(tokens[2], 16))
+                    pending_output = None
+                else:
+                    pending_output = current_output
+                continue
+
+            if line[1] != " ":
+                # Input section: ' name [address size object]'
+                pending_output = None
+                current_input = None
+                name = tokens[0]
+                if name.startswith("*") or current_output is None:
+                    pending_input = None
+                    continue
+                if len(tokens) >= 3 and self._is_hex(tokens[1]) and self._is_hex(tokens[2]):
+                    current_input = self._add_input(name, current_output, tokens[1], tokens[2], tokens[3:])
+                    pending_input = None
+                else:
+                    pending_input = name
+                continue
+
+            # Continuation or symbol line (deeply indented)
+            if pending_output and len(tokens) >= 2 and self._is_hex(tokens[0]) and self._is_hex(tokens[1]):
+                self.output_sections[pending_output] = (int(tokens[0], 16), int(tokens[1], 16))
+                pending_output = None
+            elif pending_input and len(tokens) >= 2 and self._is_hex(tokens[0]) and self._is_hex(tokens[1]):
+                current_input = self._add_input(pending_input, current_output, tokens[0], tokens[1], tokens[2:])
+                pending_input = None
+            elif current_input and len(tokens) >= 2 and self._is_hex(tokens[0]) and "=" not in line:
+                current_input["symbols"].append(" ".join(tokens[1:]))
+
+    def _add_input(self, name, output, address, size, rest):
+        section = {
+            "name": name,
+            "output": output,
+            "address": int(address, 16),
+            "size": int(size, 16),
+            "object": " ".join(rest),
+            "symbols": [],
+        }
+        self.input_sections.append(section)
+        return section
+
+    def section_at(self, address):
+        """Return the function section containing address, or None."""
+        index = bisect.bisect_right(self._starts, address) - 1
+        if index >= 0:
+            section = self.function_sections[index]
+            if address < section["address"] + section["size"]:
+                return section
+        return None
+
+    def bytes_in_range(self, base, size, exclude=()):
+        """Total size of output sections allocated inside [base, base + size)."""
+        total = 0
+        for name, (address, length) in self.output_sections.items():
+            if name in exclude or length == 0 or name.startswith(NON_ALLOC_PREFIXES):
+                continue
+            if base <= address < base + size:
+                total += length
+        return total
+
+
+def load_profile(profile_path, map_file):
+    """
+    Load a function profile and attribute it to function sections.
+
+    Returns:
+        dict: unit, source, total weight, per-section weights and the weight
+              that could not be attributed to a movable function section
+    """
+    with open(profile_path) as f:
+        content = f.read()
+
+    weights = {}
+    unattributed = 0
+    unit = "samples"
+    source = "samples"
+
+    def attribute(section, weight):
+        nonlocal unattributed
+        if section is None:
+            unattributed += weight
+        else:
+            weights[section["name"]] = weights.get(section["name"], 0) + weight
+
+    if content.lstrip().startswith("{"):
+        data = json.loads(content)
+        unit = data.get("unit", "samples")
+        source = data.get("source", "json")
+        for name, weight in data.get("functions", {}).items():
+            attribute(map_file.by_name.get(name), weight)
+    else:
+        for line in content.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            tokens = line.split(None, 1)
+            if len(tokens) == 1:
+                attribute(map_file.section_at(int(tokens[0], 16)), 1)
+            else:
+                source = "text"
+                attribute(map_file.by_name.get(tokens[1].strip()), float(tokens[0]))
+
+    total = sum(weights.values()) + unattributed
+    return {
+        "unit": unit,
+        "source": source,
+        "total": total,
+        "weights": weights,
+        "unattributed": unattributed,
+    }
+
+
+def select_functions(candidates, budget):
+    """
+    0/1 knapsack over 4-byte units: the set of sections with the most profile
+    weight whose aligned sizes fit the budget.
+
+    Args:
+        candidates (list): (section, weight) pairs with weight > 0
+        budget (int): Free bytes
+
+    Returns:
+        list: Selected sections, hottest first
+    """
+    capacity = max(0, budget) // 4
+    if capacity == 0 or not candidates:
+        return []
+
+    sizes = [(section["size"] + 3) // 4 for section, _ in candidates]
+    best = [0.0] * (capacity + 1)
+    keep = [bytearray(capacity + 1) for _ in candidates]
+
+    for i, (_, weight) in enumerate(candidates):
+        size = sizes[i]
+        for units in range(capacity, size - 1, -1):
+            value = best[units - size] + weight
+            if value > best[units]:
+                best[units] = value
+                keep[i][units] = 1
+
+    selected = []
+    units = capacity
+    for i in range(len(candidates) - 1, -1, -1):
+        if keep[i][units]:
+            selected.append(candidates[i])
+            units -= sizes[i]
+
+    selected.sort(key=lambda item: -item[1])
+    return [section for section, _ in selected]
+
+
+def predicted_ratio(fraction_before, fraction_after, ddr_slowdown):
+    """Predicted runtime after/before when code run from DDR is ddr_slowdown times slower."""
+    if not ddr_slowdown or ddr_slowdown <= 0:
+        return None
+    before = (1 - fraction_before) * ddr_slowdown + fraction_before
+    after = (1 - fraction_after) * ddr_slowdown + fraction_after
+    return after / before
+
+
+def read_lmb(xsa_path, processor=None):
+    """
+    LMB range of the processor from the XSA address map.
+
+    Returns:
+        Dict with 'base', 'size' and 'instances' (see XsaFile.local_memory())
+    """
+    with xsa_index.XsaFile(xsa_path) as xsa:
+        lmb = xsa.local_memory(processor)
+    if not lmb:
+        raise ValueError(f"No LMB memory in the address map of {xsa_path}")
+    return lmb
+
+
+def plan_placement(map_file, profile, lmb, reserve=DEFAULT_LMB_RESERVE, ddr_slowdown=None):
+    """
+    Choose the functions to pin into LMB.
+
+    The budget is the LMB size minus what the previous build already placed
+    there (vectors, and stack/heap if the default script put them in LMB), the
+    '.lmb_bss' buffers the generated script will move there, and a reserve.
+
+    Args:
+        map_file: MapFile of the profiled build
+        profile: Profile from load_profile()
+        lmb: LMB range from read_lmb()
+        reserve: Bytes of LMB to leave free
+        ddr_slowdown: DDR/LMB code speed ratio for the runtime prediction (optional)
+    """
+    lmb_base, lmb_size = lmb["base"], lmb["size"]
+    lmb_used = map_file.bytes_in_range(lmb_base, lmb_size, exclude=(LMB_TEXT_SECTION, LMB_BSS_SECTION))
+    lmb_bss = sum(section["size"] for section in map_file.input_sections
+                  if section["name"] == LMB_BSS_SECTION or section["name"].startswith(LMB_BSS_SECTION + "."))
+    budget = lmb_size - lmb_used - lmb_bss - reserve
+
+    by_section = {section["name"]: section for section in map_file.function_sections}
+    candidates = [(by_section[name], weight) for name, weight in profile["weights"].items() if weight > 0]
+
+    # Functions already in LMB through the default script stay there
+    in_lmb = {name for name, section in by_section.items()
+              if lmb_base <= section["address"] < lmb_base + lmb_size and section["output"] != LMB_TEXT_SECTION}
+    movable = [(section, weight) for section, weight in candidates if section["name"] not in in_lmb]
+    selected = select_functions(movable, budget)
+
+    total = profile["total"] or 1
+    weight_of = profile["weights"]
+    fraction_before = sum(weight_of.get(name, 0) for name in in_lmb) / total
+    fraction_after = fraction_before + sum(weight_of[section["name"]] for section in selected) / total
+
+    return {
+        "lmb_base": lmb_base,
+        "lmb_size": lmb_size,
+        "lmb_instances": list(lmb.get("instances", [])),
+        "lmb_used": lmb_used,
+        "lmb_bss_bytes": lmb_bss,
+        "reserve": reserve,
+        "budget": max(0, budget),
+        "selected": [section["name"] for section in selected],
+        "selected_bytes": sum(section["size"] for section in selected),
+        "selected_symbols": sorted({name for section in selected
+                                    for name in [section["name"][len(FUNCTION_SECTION_PREFIX):]] + section["symbols"]}),
+        "profile_unit": profile["unit"],
+        "profile_source": profile["source"],
+        "profile_functions": len(profile["weights"]),
+        "unattributed_fraction": profile["unattributed"] / total,
+        "lmb_fraction_before": fraction_before,
+        "lmb_fraction_predicted": fraction_after,
+        "ddr_slowdown": ddr_slowdown,
+        "predicted_runtime_ratio": predicted_ratio(fraction_before, fraction_after, ddr_slowdown),
+        "_weights": weight_of,
+        "_total": total,
+        "_sizes": {section["name"]: section["size"] for section in selected},
+    }
+
+
+def memory_regions(lscript_text):
+    """MEMORY regions of a linker script as (name, origin, length)."""
+    pattern = re.compile(r"^\s*(\S+)\s*(?:\([^)]*\))?\s*:\s*ORIGIN\s*=\s*(0x[0-9a-fA-F]+|\d+)\s*,\s*LENGTH\s*=\s*(0x[0-9a-fA-F]+|\d+)",
+                         re.MULTILINE)
+    return [(match.group(1), int(match.group(2), 0), int(match.group(3), 0))
+            for match in pattern.finditer(lscript_text)]
+
+
+def find_memory_region(lscript_text, plan):
+    """
+    Name of the linker script MEMORY region for the planned LMB, or None.
+
+    Vitis names regions after the memory controllers (e.g.
+    'microblaze_riscv_0_local_memory_ilmb_bram_if_cntlr_Mem_..._dlmb_...'), so a
+    region naming one of the LMB controllers is taken first. Otherwise the
+    region must lie within the LMB range; its origin may be past the LMB base
+    when the vectors are kept out of it.
+    """
+    regions = memory_regions(lscript_text)
+    for name, _, _ in regions:
+        if any(instance in name for instance in plan.get("lmb_instances", [])):
+            return name
+    lmb_end = plan["lmb_base"] + plan["lmb_size"]
+    for name, origin, length in regions:
+        if length and plan["lmb_base"] <= origin and origin + length <= lmb_end:
+            return name
+    return None
+
+
+def generate_linker_script(lscript_text, plan, region=None):
+    """
+    Insert '.lmb_text' and '.lmb_bss' output sections into a Vitis linker script.
+
+    They go in front of the '.text' output section: ld assigns each input
+    section to the first output section whose pattern matches, so the pinned
+    functions never reach the generic '*(.text.*)' rule.
+    """
+    region = region or find_memory_region(lscript_text, plan)
+    if region is None:
+        found = ", ".join(f"{name} (0x{origin:08x} + 0x{length:x})"
+                          for name, origin, length in memory_regions(lscript_text)) or "none"
+        raise ValueError(f"No MEMORY region for the LMB (0x{plan['lmb_base']:08x} + 0x{plan['lmb_size']:x}, "
+                         f"{', '.join(plan.get('lmb_instances', [])) or 'no controller names'}) "
+                         f"in the linker script; regions: {found}")
+
+    match = re.search(r"^[ \t]*\.text\s*:", lscript_text, re.MULTILINE)
+    if match is None:
+        raise ValueError("No '.text' output section found in the linker script")
+
+    patterns = "\n".join(f"   *({name})" for name in plan["selected"])
+    block = (
+        f"/* Generated by lmb_placement.py: {len(plan['selected'])} hot functions, "
+        f"{plan['selected_bytes']} of {plan['budget']} bytes */\n"
+        f"{LMB_TEXT_SECTION} : {{\n"
+        f"{patterns}\n"
+        f"}} > {region}\n"
+        f"\n"
+        f"{LMB_BSS_SECTION} (NOLOAD) : ALIGN(32) {{\n"
+        f"   *({LMB_BSS_SECTION})\n"
+        f"   *({LMB_BSS_SECTION}.*)\n"
+        f"}} > {region}\n"
+        f"\n"
+    )
+    return lscript_text[:match.start()] + block + lscript_text[match.start():]
+
+
+def achieved_placement(map_file, plan):
+    """Compare a post-build map against the plan."""
+    lmb_base, lmb_size = plan["lmb_base"], plan["lmb_size"]
+    weights = plan["_weights"]
+    placed_names = {section["name"] for section in map_file.function_sections
+                    if lmb_base <= section["address"] < lmb_base + lmb_size}
+    return {
+        "lmb_fraction": sum(weights.get(name, 0) for name in placed_names) / plan["_total"],
+        "lmb_text_bytes": map_file.output_sections.get(LMB_TEXT_SECTION, (0, 0))[1],
+        "missing": [name for name in plan["selected"] if name not in placed_names],
+    }
+
+
+def print_plan(plan, limit=15):
+    """Print the selection and the predicted impact."""
+    print(f"\n{'='*60}")
+    print(f"LMB Placement Plan")
+    print(f"{'='*60}")
+    print(f"LMB:            0x{plan['lmb_base']:08x} + {plan['lmb_size']} bytes")
+    print(f"Already used:   {plan['lmb_used']} bytes (+{plan['lmb_bss_bytes']} .lmb_bss, {plan['reserve']} reserve)")
+    print(f"Budget:         {plan['budget']} bytes")
+    print(f"Profile:        {plan['profile_functions']} functions ({plan['profile_source']}, {plan['profile_unit']})")
+    print(f"Selected:       {len(plan['selected'])} functions, {plan['selected_bytes']} bytes")
+
+    weights = plan["_weights"]
+    for name in plan["selected"][:limit]:
+        print(f"  {100.0 * weights[name] / plan['_total']:6.2f}%  {plan['_sizes'][name]:6d} B  {name}")
+    if len(plan["selected"]) > limit:
+        print(f"  ... {len(plan['selected']) - limit} more")
+
+    print(f"Profile weight in LMB: {100.0 * plan['lmb_fraction_before']:.1f}% -> "
+          f"{100.0 * plan['lmb_fraction_predicted']:.1f}% (predicted)")
+    if plan["unattributed_fraction"] > 0:
+        print(f"Not movable:    {100.0 * plan['unattributed_fraction']:.1f}% "
+              f"(outside per-function sections or unknown symbols)")
+    if plan["predicted_runtime_ratio"] is not None:
+        print(f"Predicted runtime: x{plan['predicted_runtime_ratio']:.3f} "
+              f"(DDR code {plan['ddr_slowdown']:.2f}x slower than LMB)")
+    print(f"{'='*60}\n")
+
+
+def print_achieved(plan, achieved):
+    """Print predicted vs achieved placement after a build."""
+    print(f"LMB placement: predicted {100.0 * plan['lmb_fraction_predicted']:.1f}% of profile weight in LMB, "
+          f"achieved {100.0 * achieved['lmb_fraction']:.1f}% ({achieved['lmb_text_bytes']} bytes in {LMB_TEXT_SECTION})")
+    if achieved["missing"]:
+        print(f"⚠️  {len(achieved['missing'])} selected functions are not in LMB "
+              f"(removed by --gc-sections, inlined, or renamed since the profiled build):")
+        for name in achieved["missing"][:10]:
+            print(f"    {name}")
+
+
+def save_plan(plan, path):
+    """Write the plan (without internal fields) as JSON for a later 'report'."""
+    with open(path, "w") as f:
+        json.dump({key: value for key, value in plan.items() if not key.startswith("_")}, f, indent=2)
+
+
+def compare_profiles(before_path, after_path, plan_path=None, limit=10):
+    """
+    Report measured impact from two cycle profiles of the same workload, taken
+    before and after placement (trace_reader.py --profile).
+    """
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    if before.get("unit") != "cycles" or after.get("unit") != "cycles":
+        print("Error: measured impact needs cycle profiles (trace_reader.py --profile)")
+        return 1
+
+    before_functions = before.get("functions", {})
+    after_functions = after.get("functions", {})
+    total_before = sum(before_functions.values())
+    total_after = sum(after_functions.values())
+    if total_before == 0:
+        print("Error: baseline profile is empty")
+        return 1
+
+    print(f"\n{'='*60}")
+    print(f"LMB Placement Impact (measured)")
+    print(f"{'='*60}")
+    print(f"Traced cycles:  {total_before} -> {total_after} (x{total_after / total_before:.3f})")
+
+    if plan_path:
+        with open(plan_path) as f:
+            plan = json.load(f)
+        if plan.get("predicted_runtime_ratio") is not None:
+            print(f"Predicted:      x{plan['predicted_runtime_ratio']:.3f}")
+        pinned = set(plan.get("selected_symbols", []))
+    else:
+        pinned = set()
+
+    deltas = []
+    for name in set(before_functions) | set(after_functions):
+        deltas.append((after_functions.get(name, 0) - before_functions.get(name, 0), name))
+    deltas.sort()
+
+    print(f"\n{'delta':>12} {'before':>12} {'after':>12}  function")
+    for delta, name in deltas[:limit]:
+        marker = " [lmb]" if name in pinned else ""
+        print(f"{delta:>12} {before_functions.get(name, 0):>12} {after_functions.get(name, 0):>12}  {name}{marker}")
+    print(f"{'='*60}\n")
+    return 0
+
+
+def sample_pcs(count, output_path, interval_ms, cable_serial=None, xsdb_path="xsdb"):
+    """Collect PC samples from the running target over JTAG."""
+    from xsdb_platform_script import XSDBController
+
+    xsdb = XSDBController(xsdb_path)
+    if not xsdb.start_xsdb_session():
+        return 1
+    try:
+        xsdb.connect_to_hw_server()
+        xsdb.select_target_device(serial_number=cable_serial)
+        xsdb.select_processor_target()
+        samples = xsdb.sample_program_counter(count, output_path, interval_ms,
+                                              timeout=max(120, count * (interval_ms + 50) / 1000))
+    finally:
+        xsdb.disconnect()
+        xsdb.close_session()
+
+    if samples is None:
+        return 1
+    print(f"✓ {len(samples)} PC samples written: {output_path}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Profile-guided placement of hot functions into LMB BRAM.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:", 1)[1]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sample = commands.add_parser("sample", help="Sample the PC of the running target over JTAG")
+    sample.add_argument("--samples", type=int, default=2000, help="Number of PC samples")
+    sample.add_argument("--interval_ms", type=int, default=2, help="Delay between samples")
+    sample.add_argument("--out", type=str, required=True, help="Output file (one hex PC per line)")
+    sample.add_argument("--cable_serial", type=str, default=None, help="JTAG cable serial number (optional)")
+    sample.add_argument("--xsdb_path", type=str, default="xsdb", help="Path to the xsdb executable")
+
+    plan = commands.add_parser("plan", help="Select hot functions and optionally generate a linker script")
+    hardware = plan.add_mutually_exclusive_group(required=True)
+    hardware.add_argument("--xsa", type=str, help="XSA to take the LMB range from")
+    hardware.add_argument("--platform_dir", type=str, help="Vitis platform directory to take the XSA from")
+    plan.add_argument("--map", type=str, required=True, help="Linker map of the profiled build")
+    plan.add_argument("--profile", type=str, required=True, help="PC samples, trace profile JSON or '<weight> <symbol>' text")
+    plan.add_argument("--lscript", type=str, help="Default linker script to extend")
+    plan.add_argument("--out", type=str, help="Generated linker script (requires --lscript)")
+    plan.add_argument("--plan_out", type=str, help="Write the plan as JSON for 'report'")
+    plan.add_argument("--lmb_reserve", type=int, default=DEFAULT_LMB_RESERVE, help="Bytes of LMB to leave free")
+    plan.add_argument("--ddr_slowdown", type=float, default=None,
+                      help="How much slower code runs from DDR than LMB (e.g. from bench_lat) for the runtime prediction")
+
+    report = commands.add_parser("report", help="Measured impact from before/after trace profiles")
+    report.add_argument("--before", type=str, required=True, help="Cycle profile of the default placement")
+    report.add_argument("--after", type=str, required=True, help="Cycle profile with LMB placement")
+    report.add_argument("--plan", type=str, help="Plan JSON, to show the prediction alongside")
+
+    args = parser.parse_args()
+
+    if args.command == "sample":
+        return sample_pcs(args.samples, args.out, args.interval_ms, args.cable_serial, args.xsdb_path)
+
+    if args.command == "report":
+        return compare_profiles(args.before, args.after, args.plan)
+
+    xsa_path = args.xsa or xsa_index.find_platform_xsa(args.platform_dir)
+    if not xsa_path or not os.path.exists(xsa_path):
+        print(f"Error: No XSA found: {args.xsa or args.platform_dir}")
+        return 1
+    try:
+        lmb = read_lmb(xsa_path)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    map_file = MapFile(args.map)
+    profile = load_profile(args.profile, map_file)
+    result = plan_placement(map_file, profile, lmb, args.lmb_reserve, args.ddr_slowdown)
+    print_plan(result)
+
+    if args.plan_out:
+        save_plan(result, args.plan_out)
+        print(f"✓ Plan written: {args.plan_out}")
+    if args.out:
+        if not args.lscript:
+            print("Error: --out requires --lscript")
+            return 1
+        with open(args.lscript) as f:
+            lscript_text = f.read()
+        try:
+            generated = generate_linker_script(lscript_text, result)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        with open(args.out, "w") as f:
+            f.write(generated)
+        print(f"✓ Linker script written: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
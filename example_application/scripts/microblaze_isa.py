@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Derive -march/-mabi and tuning flags from the MicroBlaze V configuration in an XSA.
+
+The block design decides which RISC-V extensions microblaze_riscv_0 implements
+(multiply/divide, atomics, compressed, FPU, bit manipulation). The exported XSA
+carries those choices as C_* parameters in the hardware handoff (.hwh). This
+reads them, builds the matching ISA string the same way the Vitis BSP is
+configured, checks it against the RISC-V GCC in use and reports every flag
+together with the parameter it came from.
+
+Usage:
+  python microblaze_isa.py --xsa ../example_platform/xsa/arty_s7_riscv.xsa
+  python microblaze_isa.py --platform_dir ../example_platform/build/arty_s7_riscv_platform --check
+
+The build integration lives in vitis_application_script.py (on by default,
+--no_xsa_isa to keep the platform defaults).
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+import zipfile
+
+import repo_paths  # noqa: F401  (shared import path)
+import xsa_index
+
+CPU_INSTANCE = "microblaze_riscv_0"
+CPU_MODTYPE = "microblaze_riscv"
+
+# C_USE_MULDIV: 1 = multiply only, 2 = multiply and divide. Multiply without
+# divide is Zmmul; only the level with divide is the full M extension.
+MULDIV_EXTENSIONS = {1: ("zmmul", "hardware multiply, no divide"), 2: ("m", "hardware multiply/divide")}
+
+# C_USE_FPU: 1 = single precision, 2 = double precision
+FPU_EXTENSIONS = {1: ("f", "ilp32f"), 2: ("fd", "ilp32d")}
+
+# Each bit manipulation subset has its own parameter -> Zb* extension
+# (C_USE_BITMAN is not a bitmask of them)
+BITMAN_EXTENSIONS = [("C_USE_BITMAN_A", "zba"), ("C_USE_BITMAN_B", "zbb"),
+                     ("C_USE_BITMAN_C", "zbc"), ("C_USE_BITMAN_S", "zbs")]
+
+# Compiler names tried when none is given; Vitis puts its RISC-V GCC on PATH
+TOOLCHAIN_CANDIDATES = ["riscv64-unknown-elf-gcc", "riscv32-unknown-elf-gcc"]
+
+
+def read_cpu_parameters(xsa_path, instance=CPU_INSTANCE):
+    """
+    Read the C_* parameters of the processor instance from the XSA's .hwh.
+
+    Args:
+        xsa_path: Path to the XSA
+        instance: Processor instance name in the block design
+
+    Returns:
+        (parameters, source) - parameter dict and '<xsa>:<hwh member>' they came from
+    """
+    with xsa_index.XsaFile(xsa_path) as xsa:
+        hwh = xsa.index["files"]["hwh"]
+        if not hwh:
+            raise ValueError(f"No hardware handoff (.hwh) in {xsa_path}")
+        try:
+            ip = xsa.ip(instance)
+        except KeyError:
+            raise ValueError(f"Processor {instance} not found in {xsa_path}")
+        if ip["type"] != CPU_MODTYPE:
+            raise ValueError(f"{instance} in {hwh} is a {ip['type']}, not {CPU_MODTYPE}")
+        return dict(ip["parameters"]), f"{os.path.basename(xsa_path)}:{hwh}"
+
+
+def int_parameter(parameters, name, default=0):
+    """Integer value of a C_* parameter (decimal or 0x hex)."""
+    value = parameters.get(name)
+    if value in (None, ""):
+        return default
+    return int(value, 0)
+
+
+def derive_isa(parameters, source=""):
+    """
+    Map the processor parameters to -march/-mabi and tuning flags.
+
+    Args:
+        parameters: C_* parameter dict from read_cpu_parameters()
+        source: Where the parameters came from, recorded with every flag
+
+    Returns:
+        Dict with 'march', 'mabi', 'extensions' and 'flags'. Extensions and flags
+        are lists of {'name', 'reason', 'source'} in command line order.
+    """
+    def origin(*names):
+        return ", ".join(f"{n}={parameters.get(n, 'unset')}" for n in names)
+
+    xlen = int_parameter(parameters, "C_DATA_SIZE", 32)
+    if xlen not in (32, 64):
+        raise ValueError(f"Unsupported C_DATA_SIZE={xlen}")
+
+    extensions = [{"name": "i", "reason": "base integer ISA", "source": origin("C_DATA_SIZE")}]
+    mabi = "ilp32" if xlen == 32 else "lp64"
+    mabi_reason = {"reason": "integer calling convention", "source": origin("C_DATA_SIZE")}
+
+    # Single-letter extensions, canonical order i m a f d c
+    muldiv = int_parameter(parameters, "C_USE_MULDIV")
+    if muldiv and muldiv not in MULDIV_EXTENSIONS:
+        raise ValueError(f"Unsupported C_USE_MULDIV={muldiv}")
+    if muldiv == 2:
+        extensions.append({"name": "m", "reason": MULDIV_EXTENSIONS[muldiv][1], "source": origin("C_USE_MULDIV")})
+    if int_parameter(parameters, "C_USE_ATOMIC"):
+        extensions.append({"name": "a", "reason": "atomic instructions", "source": origin("C_USE_ATOMIC")})
+    fpu = int_parameter(parameters, "C_USE_FPU")
+    if fpu:
+        if fpu not in FPU_EXTENSIONS:
+            raise ValueError(f"Unsupported C_USE_FPU={fpu}")
+        letters, fp_abi = FPU_EXTENSIONS[fpu]
+        for letter in letters:
+            extensions.append({"name": letter, "reason": "hardware floating point", "source": origin("C_USE_FPU")})
+        mabi = fp_abi if xlen == 32 else fp_abi.replace("ilp32", "lp64")
+        mabi_reason = {"reason": "floating point arguments in FPU registers", "source": origin("C_USE_FPU")}
+    if int_parameter(parameters, "C_USE_COMPRESSION"):
+        extensions.append({"name": "c", "reason": "compressed instructions", "source": origin("C_USE_COMPRESSION")})
+
+    # Multi-letter extensions, Zi* then Zm* then Zb*, alphabetical within each
+    if int_parameter(parameters, "C_USE_COUNTERS"):
+        extensions.append({"name": "zicntr", "reason": "cycle/instret counters", "source": origin("C_USE_COUNTERS"),
+                           "optional": True})
+    extensions.append({"name": "zicsr", "reason": "CSR access, always implemented", "source": "MicroBlaze V"})
+    extensions.append({"name": "zifencei", "reason": "instruction fence, always implemented", "source": "MicroBlaze V"})
+    if muldiv == 1:
+        extensions.append({"name": "zmmul", "reason": MULDIV_EXTENSIONS[muldiv][1], "source": origin("C_USE_MULDIV")})
+    for parameter, name in BITMAN_EXTENSIONS:
+        if int_parameter(parameters, parameter):
+            extensions.append({"name": name, "reason": "bit manipulation", "source": origin(parameter)})
+
+    flags = []
+    if int_parameter(parameters, "C_MISALIGNED_EXCEPTIONS"):
+        flags.append({"name": "-mstrict-align", "reason": "misaligned accesses trap",
+                      "source": origin("C_MISALIGNED_EXCEPTIONS")})
+
+    isa = {
+        "xlen": xlen,
+        "extensions": extensions,
+        "mabi": mabi,
+        "mabi_origin": mabi_reason,
+        "flags": flags,
+        "source": source,
+    }
+    isa["march"] = march_string(isa)
+    return isa
+
+
+def march_string(isa):
+    """Assemble the -march value: 'rv32' + single letters + '_'-joined multi-letter extensions."""
+    single = "".join(e["name"] for e in isa["extensions"] if len(e["name"]) == 1)
+    multi = [e["name"] for e in isa["extensions"] if len(e["name"]) > 1]
+    return "_".join([f"rv{isa['xlen']}{single}"] + multi)
+
+
+def arch_flags(isa):
+    """Compiler flags for a derived ISA, in command line order."""
+    return [f"-march={isa['march']}", f"-mabi={isa['mabi']}"] + [f["name"] for f in isa["flags"]]
+
+
+def find_toolchain(compiler=None):
+    """Path of the RISC-V GCC to check flags against, or None."""
+    if compiler:
+        return shutil.which(compiler) or (compiler if os.path.exists(compiler) else None)
+    for candidate in TOOLCHAIN_CANDIDATES:
+        path = shutil.which(candidate)
+        if path:
+            return path
+    vitis_root = os.environ.get("XILINX_VITIS")
+    if vitis_root:
+        matches = sorted(glob.glob(os.path.join(vitis_root, "gnu", "riscv", "**", "riscv*-elf-gcc"), recursive=True))
+        if matches:
+            return matches[0]
+    return None
+
+
+def compiler_accepts(compiler, flags):
+    """True if the compiler preprocesses an empty file with these flags."""
+    try:
+        result = subprocess.run([compiler] + flags + ["-E", "-x", "c", "-", "-o", os.devnull],
+                                input="", capture_output=True, text=True, timeout=30)
+    except (subprocess.TimeoutExpired, OSError):
+        return False
+    return result.returncode == 0
+
+
+def check_toolchain(isa, compiler):
+    """
+    Check the derived flags against the compiler, dropping what it cannot take.
+
+    Optional extensions (zicntr; older GCC folds the counters into the base
+    ISA) are removed when rejected. Anything else the compiler rejects is an
+    error: building without a hardware extension is safe, but the BSP was
+    compiled for the same ISA, so a mismatch points at the wrong toolchain.
+
+    Args:
+        isa: Dict from derive_isa(), updated in place
+        compiler: Path to the RISC-V GCC
+
+    Returns:
+        List of messages describing what was dropped
+    """
+    notes = []
+    for ext in [e for e in isa["extensions"] if e.get("optional")]:
+        if compiler_accepts(compiler, [f"-march={isa['march']}", f"-mabi={isa['mabi']}"]):
+            break
+        isa["extensions"].remove(ext)
+        isa["march"] = march_string(isa)
+        notes.append(f"dropped _{ext['name']}: not known to {os.path.basename(compiler)}")
+
+    base_flags = [f"-march={isa['march']}", f"-mabi={isa['mabi']}"]
+    if not compiler_accepts(compiler, base_flags):
+        raise RuntimeError(f"{compiler} rejects {' '.join(base_flags)}")
+
+    for flag in list(isa["flags"]):
+        if not compiler_accepts(compiler, base_flags + [flag["name"]]):
+            isa["flags"].remove(flag)
+            notes.append(f"dropped {flag['name']}: not supported by {os.path.basename(compiler)}")
+    return notes
+
+
+def print_isa(isa):
+    """Print the derived flags and where each part came from."""
+    print(f"CPU parameters: {isa['source']}")
+    print(f"  -march={isa['march']}")
+    for ext in isa["extensions"]:
+        print(f"      {ext['name']:<10} {ext['reason']:<40} ({ext['source']})")
+    print(f"  -mabi={isa['mabi']:<28} {isa['mabi_origin']['reason']} ({isa['mabi_origin']['source']})")
+    for flag in isa["flags"]:
+        print(f"  {flag['name']:<34} {flag['reason']} ({flag['source']})")
+
+
+def load_isa(xsa_path, instance=CPU_INSTANCE, compiler=None, check=True):
+    """
+    Read, derive and (optionally) toolchain-check the flags for an XSA.
+
+    Returns:
+        (isa, compiler, notes) - compiler is None when no RISC-V GCC was found
+    """
+    parameters, source = read_cpu_parameters(xsa_path, instance)
+    isa = derive_isa(parameters, source)
+    notes = []
+    gcc = find_toolchain(compiler) if check else None
+    if gcc:
+        notes = check_toolchain(isa, gcc)
+    return isa, gcc, notes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Derive RISC-V compiler flags from the MicroBlaze V configuration in an XSA.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--xsa", type=str, help="Path to the XSA")
+    source.add_argument("--platform_dir", type=str, help="Vitis platform directory to take the XSA from")
+    parser.add_argument("--instance", type=str, default=CPU_INSTANCE, help="Processor instance name")
+    parser.add_argument("--check", action="store_true", help="Check the flags against the RISC-V GCC")
+    parser.add_argument("--compiler", type=str, default=None, help="RISC-V GCC to check against (default: search PATH)")
+    args = parser.parse_args()
+
+    xsa_path = args.xsa or xsa_index.find_platform_xsa(args.platform_dir)
+    if not xsa_path or not os.path.exists(xsa_path):
+        print(f"❌ No XSA found: {args.xsa or args.platform_dir}")
+        return 1
+
+    try:
+        isa, gcc, notes = load_isa(xsa_path, args.instance, args.compiler, check=args.check)
+    except (ValueError, RuntimeError, zipfile.BadZipFile, ET.ParseError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    print_isa(isa)
+    if args.check:
+        if gcc:
+            for note in notes:
+                print(f"⚠️  {note}")
+            print(f"✓ Accepted by {gcc}")
+        else:
+            print("⚠️  No RISC-V GCC found; flags not checked")
+    print(" ".join(arch_flags(isa)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
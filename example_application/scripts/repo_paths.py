@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Repository layout and the import path shared by the application scripts.
+
+Importing this module puts example_platform/scripts (xsa_index and the other
+modules shared with the platform and hardware builds) and this directory on
+sys.path, once, so every application script can import its siblings and the
+shared modules by name, whether it runs under python, 'vitis -s' or is
+imported from another script:
+
+  import repo_paths  # noqa: F401  (shared import path)
+  import xsa_index
+"""
+
+import os
+import sys
+
+APP_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.normpath(os.path.join(APP_SCRIPT_DIR, "..", ".."))
+PLATFORM_SCRIPT_DIR = os.path.join(REPO_DIR, "example_platform", "scripts")
+
+for directory in (PLATFORM_SCRIPT_DIR, APP_SCRIPT_DIR):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Source import for application components without redundant file I/O.
+
+vitis_application_script.py used to copy cli_core/include, the platform
+adapter include/ and src/ and the application sources into every
+component's src/ through Vitis' import_files. This module places them from
+a content-addressed pool instead:
+
+  - every source file is stored once in the pool, keyed by its SHA-256; a
+    stat index (path, size, mtime, inode) means unchanged files are not
+    even re-read
+  - files land in the component as hardlinks to the pool objects, as
+    reflinks (copy-on-write clones) where hardlinks are not possible, and
+    as plain copies as a last resort (e.g. pool on another filesystem)
+  - header-only directories can be left out altogether and referenced in
+    place through USER_INCLUDE_DIRECTORIES (shared_includes)
+  - what was placed where is recorded in import_manifest.json next to the
+    component's src/, and verification stats the listed files instead of
+    walking the tree
+
+Pool objects are read-only and are never written through: replacing a file
+in a component unlinks it first, so editing a component's copy cannot
+change the pool or other components. Hardlinked files share the object's
+inode, so they are read-only in the component too and keep the object's
+mtime. A file that changes to content already in the pool (which may be
+older than the component's build outputs) is therefore placed as a reflink
+or copy, so make still sees the change. The pool lives under
+~/.cache/microblaze_v_cli/source_pool unless SOURCE_POOL_DIR says otherwise.
+
+Usage:
+  python source_import.py verify build/arty_s7_riscv_app
+  python source_import.py verify build/arty_s7_riscv_app --hashes
+  python source_import.py info
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+# Bump when the layout of the manifest or the stat index changes
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "import_manifest.json"
+
+DEFAULT_POOL_DIR = os.path.join(os.path.expanduser("~"), ".cache", "microblaze_v_cli", "source_pool")
+
+# Placement methods, in the order 'link' tries them
+METHODS = ["hardlink", "reflink", "copy"]
+
+# ioctl(dest, FICLONE, src): whole-file reflink (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
+
+def default_pool_dir():
+    """Directory of the source pool (SOURCE_POOL_DIR overrides the default)."""
+    return os.environ.get("SOURCE_POOL_DIR", DEFAULT_POOL_DIR)
+
+
+def import_tasks(cli_core_dir, app_src_dir):
+    """
+    What goes into a component's src/.
+
+    'shared' marks header-only directories that can be referenced in place
+    instead of imported.
+    """
+    return [
+        {'desc': 'CLI core headers', 'dest': 'src', 'shared': True,
+         'src': os.path.join(cli_core_dir, 'include')},
+        {'desc': 'Platform adapter headers', 'dest': 'src', 'shared': True,
+         'src': os.path.join(cli_core_dir, 'platform_adapters', 'include')},
+        {'desc': 'Platform adapter sources', 'dest': 'src', 'shared': False,
+         'src': os.path.join(cli_core_dir, 'platform_adapters', 'src')},
+        {'desc': 'Application sources', 'dest': 'src', 'shared': False,
+         'src': app_src_dir},
+    ]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SourcePool:
+    """Content-addressed store of source files: objects/<sha[:2]>/<sha>."""
+
+    def __init__(self, pool_dir=None):
+        self.pool_dir = os.path.abspath(pool_dir or default_pool_dir())
+        self.objects_dir = os.path.join(self.pool_dir, "objects")
+        self.index_path = os.path.join(self.pool_dir, "stat_index.json")
+        self.index = {}
+        self.index_dirty = False
+        self.hashed = 0
+        self.stored = 0
+        os.makedirs(self.objects_dir, exist_ok=True)
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.index = data["files"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def object_path(self, sha):
+        return os.path.join(self.objects_dir, sha[:2], sha)
+
+    def digest(self, path, stat=None):
+        """SHA-256 of a file, from the stat index when size, mtime and inode still match."""
+        stat = stat or os.stat(path)
+        key = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        entry = self.index.get(path)
+        if entry and entry[:3] == key:
+            return entry[3]
+        sha = file_sha256(path)
+        self.hashed += 1
+        self.index[path] = key + [sha]
+        self.index_dirty = True
+        return sha
+
+    def store(self, path):
+        """
+        Make sure a file's content is in the pool.
+
+        Returns:
+            (sha256, object path)
+        """
+        stat = os.stat(path)
+        sha = self.digest(path, stat)
+        obj = self.object_path(sha)
+        try:
+            # Objects are read-only, but root can still write through a link;
+            # a size mismatch gets the object rewritten (as a new inode)
+            intact = os.path.getsize(obj) == stat.st_size
+        except OSError:
+            intact = False
+        if not intact:
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            # Write aside and rename, so parallel builds never see a partial object
+            partial = f"{obj}.{os.getpid()}.part"
+            shutil.copyfile(path, partial)
+            os.chmod(partial, 0o444)
+            os.replace(partial, obj)
+            self.stored += 1
+        return sha, obj
+
+    def save_index(self):
+        if not self.index_dirty:
+            return
+        partial = f"{self.index_path}.{os.getpid()}.part"
+        try:
+            with open(partial, "w") as f:
+                json.dump({"version": MANIFEST_VERSION, "files": self.index}, f)
+            os.replace(partial, self.index_path)
+            self.index_dirty = False
+        except OSError as e:
+            print(f"⚠️  Could not save the source pool index: {e}")
+
+    def info(self):
+        count = size = 0
+        for directory, _, names in os.walk(self.objects_dir):
+            for name in names:
+                stat = os.stat(os.path.join(directory, name))
+                count += 1
+                size += stat.st_size
+        return {"pool": self.pool_dir, "objects": count, "bytes": size, "indexed_files": len(self.index)}
+
+
+def place_file(obj, dest, method):
+    """
+    Put a pool object at dest by method, never writing through an existing file.
+
+    Returns:
+        Method that worked ('hardlink', 'reflink' or 'copy')
+    """
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    partial = f"{dest}.{os.getpid()}.part"
+    tried = METHODS[METHODS.index(method):]
+    for candidate in tried:
+        try:
+            if candidate == "hardlink":
+                os.link(obj, partial)
+            elif candidate == "reflink":
+                import fcntl
+                with open(obj, "rb") as src, open(partial, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                os.chmod(partial, 0o644)
+            else:
+                shutil.copyfile(obj, partial)
+                os.chmod(partial, 0o644)
+        except (OSError, ImportError):
+            # EXDEV, EPERM, EOPNOTSUPP, ...: try the next method
+            if os.path.lexists(partial):
+                os.remove(partial)
+            if candidate == "copy":
+                raise
+            continue
+        os.replace(partial, dest)
+        return candidate
+
+
+class SourceImporter:
+    """Imports the sources of one component from the pool and keeps its manifest."""
+
+    def __init__(self, component_dir, tasks, pool=None, method="link", shared_includes=False):
+        """
+        Args:
+            component_dir: Application component directory (holds src/)
+            tasks: import_tasks() list
+            pool: SourcePool (default: the shared one)
+            method: 'link' (hardlink, then reflink, then copy), 'reflink' or 'copy'
+            shared_includes: Reference header-only directories in place instead of importing them
+        """
+        self.component_dir = os.path.abspath(component_dir)
+        self.manifest_path = os.path.join(self.component_dir, MANIFEST_NAME)
+        self.tasks = tasks
+        self.pool = pool or SourcePool()
+        self.method = "hardlink" if method == "link" else method
+        self.shared_includes = shared_includes
+        self.files = {}
+        # Start of the current run()/update(); see place()
+        self.pass_start = time.time()
+
+    def imported_tasks(self):
+        return [t for t in self.tasks if not (self.shared_includes and t['shared'])]
+
+    def include_directories(self):
+        """Directories the compiler has to search in place (shared_includes)."""
+        return [t['src'] for t in self.tasks if self.shared_includes and t['shared']]
+
+    def destination(self, path):
+        """Manifest key (path under the component) of a source file, or None."""
+        for task in self.imported_tasks():
+            root = task['src']
+            if path.startswith(root + os.sep):
+                return os.path.join(task['dest'], os.path.relpath(path, root)).replace(os.sep, "/")
+        return None
+
+    def place(self, path, rel):
+        sha, obj = self.pool.store(path)
+        dest = os.path.join(self.component_dir, rel)
+        entry = self.files.get(rel)
+        if entry and entry['sha256'] == sha and self.check(rel, entry) is None:
+            return None
+        method = self.method
+        replacing = rel in self.files or os.path.lexists(dest)
+        if method == "hardlink" and replacing and os.path.getmtime(obj) < self.pass_start:
+            # A hardlink carries the object's mtime. An object that was already
+            # in the pool (e.g. going back to an earlier version, or content
+            # another component or an autotune workspace pooled) may be older
+            # than this component's build outputs, so make would skip the
+            # rebuild. The object is shared and is not touched; this file gets
+            # a fresh clone instead. Objects written during this pass are newer
+            # than any earlier build and are linked.
+            method = "reflink"
+        placed = place_file(obj, dest, method)
+        if method == self.method:
+            # A method that failed once (e.g. pool on another filesystem) will keep failing
+            self.method = placed
+        method = placed
+        self.files[rel] = {'sha256': sha, 'size': os.path.getsize(obj), 'source': path, 'method': method}
+        return method
+
+    def source_files(self):
+        """(source path, manifest key) of every file to import."""
+        for task in self.imported_tasks():
+            if not os.path.isdir(task['src']):
+                raise FileNotFoundError(f"Source directory not found: {task['src']}")
+            for directory, _, names in os.walk(task['src']):
+                for name in sorted(names):
+                    path = os.path.join(directory, name)
+                    yield path, self.destination(path)
+
+    def record_existing(self, method="import_files"):
+        """Write a manifest for files some other way put in place (e.g. Vitis' import_files)."""
+        self.files = {}
+        for path, rel in self.source_files():
+            self.files[rel] = {'sha256': self.pool.digest(path), 'size': os.path.getsize(path),
+                               'source': path, 'method': method}
+        self.pool.save_index()
+        self.write_manifest()
+
+    def run(self):
+        """Import every task; returns {method: file count}."""
+        start = self.pass_start = time.time()
+        self.load_manifest()
+        counts = {}
+        seen = set()
+        for task in self.tasks:
+            if self.shared_includes and task['shared']:
+                print(f"✓ {task['desc']}: shared in place ({task['src']})")
+                continue
+            if not os.path.isdir(task['src']):
+                raise FileNotFoundError(f"Source directory not found: {task['src']}")
+            task_counts = {}
+            for directory, _, names in os.walk(task['src']):
+                for name in sorted(names):
+                    path = os.path.join(directory, name)
+                    rel = self.destination(path)
+                    seen.add(rel)
+                    method = self.place(path, rel) or "unchanged"
+                    task_counts[method] = task_counts.get(method, 0) + 1
+            for method, count in task_counts.items():
+                counts[method] = counts.get(method, 0) + count
+            detail = ", ".join(f"{count} {method}" for method, count in sorted(task_counts.items()))
+            print(f"✓ Imported {task['desc']}: {detail or 'no files'}")
+        # Left over from an earlier import of a source that is gone now
+        for rel in sorted(set(self.files) - seen):
+            dest = os.path.join(self.component_dir, rel)
+            if os.path.lexists(dest):
+                os.remove(dest)
+            del self.files[rel]
+        self.pool.save_index()
+        self.write_manifest()
+        print(f"✓ Source import: {len(self.files)} files in {time.time() - start:.2f} s "
+              f"({self.pool.hashed} hashed, {self.pool.stored} new in pool {self.pool.pool_dir})")
+        return counts
+
+    def update(self, paths):
+        """
+        Re-import changed source paths (for incremental rebuilds).
+
+        Returns:
+            (updated, removed, layout_changed): manifest keys placed and
+            deleted (changed shared headers by their own path), and whether
+            files appeared or disappeared
+        """
+        self.pass_start = time.time()
+        self.load_manifest()
+        updated, removed = [], []
+        layout_changed = False
+        shared = self.include_directories()
+        for path in sorted(paths):
+            rel = self.destination(path)
+            if rel is None:
+                # Referenced in place: nothing to copy, but the build has to run
+                if any(path.startswith(root + os.sep) for root in shared):
+                    updated.append(path)
+                continue
+            if os.path.isfile(path):
+                new = rel not in self.files
+                if self.place(path, rel):
+                    updated.append(rel)
+                    layout_changed |= new
+            elif rel in self.files:
+                dest = os.path.join(self.component_dir, rel)
+                if os.path.lexists(dest):
+                    os.remove(dest)
+                del self.files[rel]
+                removed.append(rel)
+                layout_changed = True
+        self.pool.save_index()
+        self.write_manifest()
+        return updated, removed, layout_changed
+
+    def load_manifest(self):
+        manifest = read_manifest(self.component_dir)
+        if manifest and manifest.get('shared_includes') == self.shared_includes:
+            self.files = manifest['files']
+        return self.files
+
+    def write_manifest(self):
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'pool': self.pool.pool_dir,
+            'shared_includes': self.shared_includes,
+            'include_directories': self.include_directories(),
+            'tasks': self.tasks,
+            'files': self.files,
+        }
+        partial = f"{self.manifest_path}.part"
+        with open(partial, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(partial, self.manifest_path)
+
+    def check(self, rel, entry, hashes=False):
+        """Problem with one placed file, or None."""
+        dest = os.path.join(self.component_dir, rel)
+        try:
+            stat = os.stat(dest)
+        except OSError:
+            return "missing"
+        if stat.st_size != entry['size']:
+            return f"size {stat.st_size}, expected {entry['size']}"
+        if entry['method'] == "hardlink":
+            try:
+                if os.stat(self.pool.object_path(entry['sha256'])).st_ino != stat.st_ino:
+                    return "no longer linked to the pool"
+            except OSError:
+                return "pool object missing"
+        if hashes and file_sha256(dest) != entry['sha256']:
+            return "content changed"
+        return None
+
+
+def read_manifest(component_dir):
+    """The import manifest of a component, or None."""
+    try:
+        with open(os.path.join(component_dir, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def verify_component(component_dir, hashes=False):
+    """
+    Check a component's imported files against its manifest.
+
+    Returns:
+        (file count, {method: count}, [(path, problem)]) or None without a manifest
+    """
+    manifest = read_manifest(component_dir)
+    if manifest is None:
+        return None
+    importer = SourceImporter(component_dir, manifest['tasks'], SourcePool(manifest['pool']),
+                              shared_includes=manifest['shared_includes'])
+    methods = {}
+    problems = []
+    for rel, entry in sorted(manifest['files'].items()):
+        methods[entry['method']] = methods.get(entry['method'], 0) + 1
+        problem = importer.check(rel, entry, hashes)
+        if problem:
+            problems.append((rel, problem))
+    return len(manifest['files']), methods, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verify component source imports and inspect the source pool.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:", 1)[1]
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    verify = sub.add_parser("verify", help="Check a component's files against its import manifest")
+    verify.add_argument("component_dir", help="Application component directory")
+    verify.add_argument("--hashes", action="store_true", help="Also re-hash every file")
+    info = sub.add_parser("info", help="Size of the source pool")
+    info.add_argument("--pool", type=str, default=None, help="Pool directory (default: SOURCE_POOL_DIR or ~/.cache)")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        stats = SourcePool(args.pool).info()
+        print(f"Pool:    {stats['pool']}")
+        print(f"Objects: {stats['objects']} ({stats['bytes'] / 1024:.1f} KB)")
+        print(f"Indexed: {stats['indexed_files']} source paths")
+        return 0
+
+    result = verify_component(args.component_dir, args.hashes)
+    if result is None:
+        print(f"❌ No import manifest in {args.component_dir}")
+        return 1
+    count, methods, problems = result
+    detail = ", ".join(f"{n} {method}" for method, n in sorted(methods.items()))
+    for rel, problem in problems:
+        print(f"❌ {rel}: {problem}")
+    if problems:
+        return 1
+    print(f"✓ {count} imported files match the manifest ({detail})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Host-side reader for the cli_core event trace buffer (CLI_ENABLE_TRACE=1).
+
+Locates the 'cli_trace_buffer' symbol in the application ELF, pulls the buffer
+over JTAG with one XSDB block read (or loads a previously saved dump), and
+prints a timeline with per-event duration statistics. The trace can also be
+written as Chrome trace JSON for chrome://tracing or https://ui.perfetto.dev.
+
+Live reads leave the processor running unless --halt is given. JTAG reads
+bypass the D-cache, so the buffer must be uncached (CLI_TRACE_BUFFER_ATTR) or
+flushed by the application before the read; the example application writes it
+back every TRACE_FLUSH_PERIOD_MS (100 ms) from a scheduler task.
+
+Usage:
+  python trace_reader.py --elf app.elf                       # live read over JTAG
+  python trace_reader.py --elf app.elf --save_dump trace.bin # live read, keep raw dump
+  python trace_reader.py --elf app.elf --halt                # stop the core for the read
+  python trace_reader.py --elf app.elf --dump trace.bin      # offline
+  python trace_reader.py --elf app.elf --chrome trace.json
+  python trace_reader.py --elf app.elf --profile profile.json  # function profile for lmb_placement.py
+"""
+
+import argparse
+import bisect
+import json
+import os
+import struct
+import sys
+import tempfile
+
+TRACE_SYMBOL = "cli_trace_buffer"
+TRACE_MAGIC = 0x54524345
+TRACE_VERSION = 1
+TRACE_HEADER_FORMAT = "<8I"    # magic, version, capacity, event_size, timestamp_hz, head, reserved[2]
+TRACE_HEADER_SIZE = struct.calcsize(TRACE_HEADER_FORMAT)
+TRACE_EVENT_FORMAT = "<IHBBII"
+TRACE_EVENT_SIZE = struct.calcsize(TRACE_EVENT_FORMAT)
+
+# Mirrors cli_core::trace::TraceEventId in cli_core/include/cli_trace.h
+EVENT_NAMES = {
+    1: "dispatch",
+    2: "handler",
+    3: "uart_rx_wait",
+    4: "uart_tx_wait",
+    5: "task",
+}
+TRACE_USER = 0x100
+
+# Events whose arg0 is the address of a name string in the ELF
+STRING_ARG_EVENTS = {2, 5}
+
+# Events whose BEGIN arg1 is the address of the function that ran
+FUNCTION_ARG_EVENTS = {2, 5}
+
+PHASE_INSTANT = 0
+PHASE_BEGIN = 1
+PHASE_END = 2
+
+
+class ElfImage:
+    """Minimal ELF32 little-endian reader: symbols and loadable segment contents."""
+
+    def __init__(self, elf_path):
+        with open(elf_path, "rb") as f:
+            self.data = f.read()
+
+        if self.data[:4] != b"\x7fELF":
+            raise ValueError(f"Not an ELF file: {elf_path}")
+        if self.data[4] != 1 or self.data[5] != 1:
+            raise ValueError(f"Only little-endian ELF32 is supported: {elf_path}")
+
+        (self.entry, e_phoff, e_shoff) = struct.unpack_from("<III", self.data, 0x18)
+        (e_phentsize, e_phnum, e_shentsize, e_shnum) = struct.unpack_from("<HHHH", self.data, 0x2A)
+
+        self.segments = []
+        self.memory_sizes = []
+        for i in range(e_phnum):
+            (p_type, p_offset, p_vaddr, _, p_filesz, p_memsz, _, _) = struct.unpack_from(
+                "<8I", self.data, e_phoff + i * e_phentsize)
+            if p_type == 1:  # PT_LOAD
+                self.segments.append((p_vaddr, p_offset, p_filesz))
+                self.memory_sizes.append(p_memsz)
+
+        sections = []
+        for i in range(e_shnum):
+            sections.append(struct.unpack_from("<10I", self.data, e_shoff + i * e_shentsize))
+
+        self.symbols = {}
+        functions = []
+        for section in sections:
+            sh_type, sh_offset, sh_size, sh_link, sh_entsize = section[1], section[4], section[5], section[6], section[9]
+            if sh_type != 2 or sh_entsize == 0:  # SHT_SYMTAB
+                continue
+            strtab = sections[sh_link]
+            str_offset = strtab[4]
+            for offset in range(sh_offset, sh_offset + sh_size, sh_entsize):
+                (st_name, st_value, st_size, st_info, _, _) = struct.unpack_from("<IIIBBH", self.data, offset)
+                if st_name == 0:
+                    continue
+                name_start = str_offset + st_name
+                name_end = self.data.index(b"\0", name_start)
+                name = self.data[name_start:name_end].decode("ascii", "replace")
+                self.symbols[name] = (st_value, st_size)
+                if st_info & 0xF == 2 and st_size > 0:  # STT_FUNC
+                    functions.append((st_value, st_size, name))
+
+        functions.sort()
+        self.functions = functions
+        self.function_starts = [entry[0] for entry in functions]
+
+    def symbol(self, name):
+        """Return (address, size) of a symbol, or None."""
+        return self.symbols.get(name)
+
+    def function_at(self, address):
+        """Return the (mangled) name of the function containing address, or None."""
+        index = bisect.bisect_right(self.function_starts, address) - 1
+        if index >= 0:
+            start, size, name = self.functions[index]
+            if address < start + size:
+                return name
+        return None
+
+    def read_string(self, address, max_len=64):
+        """Read a NUL-terminated string from initialized ELF contents, or None."""
+        for vaddr, offset, filesz in self.segments:
+            if vaddr <= address < vaddr + filesz:
+                start = offset + (address - vaddr)
+                end = min(offset + filesz, start + max_len)
+                raw = self.data[start:end].split(b"\0", 1)[0]
+                return raw.decode("ascii", "replace")
+        return None
+
+
+class TraceDecoder:
+    """Decodes a raw trace buffer image into time-ordered events."""
+
+    def __init__(self, raw, elf=None):
+        if len(raw) < TRACE_HEADER_SIZE:
+            raise ValueError("Trace dump is shorter than the buffer header")
+
+        (magic, version, capacity, event_size, timestamp_hz, head, _, _) = struct.unpack_from(
+            TRACE_HEADER_FORMAT, raw, 0)
+        if magic != TRACE_MAGIC:
+            raise ValueError(f"Bad trace magic 0x{magic:08x} -- tracing not initialized, "
+                             f"or the buffer is still in the D-cache")
+        if version != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {version} (expected {TRACE_VERSION})")
+        if event_size != TRACE_EVENT_SIZE:
+            raise ValueError(f"Unexpected event size {event_size} (expected {TRACE_EVENT_SIZE})")
+        if len(raw) < TRACE_HEADER_SIZE + capacity * event_size:
+            raise ValueError("Trace dump is shorter than the event buffer")
+
+        self.raw = raw
+        self.elf = elf
+        self.capacity = capacity
+        self.timestamp_hz = timestamp_hz or 1
+        self.head = head
+        self.dropped = max(0, head - capacity)
+        self._names = {}
+
+    def event_name(self, event_id, arg0):
+        if event_id in EVENT_NAMES:
+            name = EVENT_NAMES[event_id]
+        elif event_id >= TRACE_USER:
+            name = f"user+{event_id - TRACE_USER}"
+        else:
+            name = f"event{event_id}"
+
+        if event_id in STRING_ARG_EVENTS and self.elf:
+            if arg0 not in self._names:
+                self._names[arg0] = self.elf.read_string(arg0)
+            label = self._names[arg0]
+            if label:
+                name = f"{name}:{label}"
+        return name
+
+    def events(self):
+        """
+        Yield event dicts oldest first. 32-bit timestamps are unwrapped into a
+        monotonic cycle count starting at the oldest retained event.
+        """
+        first = self.head - min(self.head, self.capacity)
+        last_raw = None
+        cycles = 0
+
+        for sequence in range(first, self.head):
+            slot = sequence % self.capacity
+            offset = TRACE_HEADER_SIZE + slot * TRACE_EVENT_SIZE
+            (timestamp, event_id, phase, _, arg0, arg1) = struct.unpack_from(TRACE_EVENT_FORMAT, self.raw, offset)
+
+            if last_raw is not None:
+                cycles += (timestamp - last_raw) & 0xFFFFFFFF
+            last_raw = timestamp
+
+            yield {
+                "seq": sequence,
+                "cycles": cycles,
+                "us": cycles * 1e6 / self.timestamp_hz,
+                "id": event_id,
+                "phase": phase,
+                "arg0": arg0,
+                "arg1": arg1,
+                "name": self.event_name(event_id, arg0),
+            }
+
+
+def print_timeline(decoder, events):
+    """Print events with nesting and BEGIN->END durations."""
+    print(f"Trace: {decoder.head} events recorded, {len(events)} retained, "
+          f"{decoder.dropped} overwritten, {decoder.timestamp_hz} Hz timestamps")
+    print(f"{'time_us':>12} {'delta_us':>10}  event")
+
+    stack = []
+    previous = None
+    for event in events:
+        delta = event["us"] - previous if previous is not None else 0.0
+        previous = event["us"]
+
+        if event["phase"] == PHASE_END:
+            begin = None
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i]["id"] == event["id"] and stack[i]["arg0"] == event["arg0"]:
+                    begin = stack[i]
+                    del stack[i:]
+                    break
+            indent = "  " * len(stack)
+            duration = f" ({event['us'] - begin['us']:.3f} us)" if begin else ""
+            print(f"{event['us']:12.3f} {delta:10.3f}  {indent}< {event['name']}{duration}")
+        elif event["phase"] == PHASE_BEGIN:
+            indent = "  " * len(stack)
+            print(f"{event['us']:12.3f} {delta:10.3f}  {indent}> {event['name']} arg0=0x{event['arg0']:x}")
+            stack.append(event)
+        else:
+            indent = "  " * len(stack)
+            print(f"{event['us']:12.3f} {delta:10.3f}  {indent}* {event['name']} "
+                  f"arg0=0x{event['arg0']:x} arg1=0x{event['arg1']:x}")
+
+
+def summarize(events):
+    """Aggregate BEGIN/END pairs per event name: count, total and max cycles."""
+    open_events = {}
+    summary = {}
+    for event in events:
+        key = (event["id"], event["arg0"])
+        if event["phase"] == PHASE_BEGIN:
+            open_events.setdefault(key, []).append(event)
+        elif event["phase"] == PHASE_END and open_events.get(key):
+            begin = open_events[key].pop()
+            cycles = event["cycles"] - begin["cycles"]
+            entry = summary.setdefault(event["name"], {"count": 0, "total_cycles": 0, "max_cycles": 0})
+            entry["count"] += 1
+            entry["total_cycles"] += cycles
+            entry["max_cycles"] = max(entry["max_cycles"], cycles)
+    return summary
+
+
+def print_summary(summary, timestamp_hz):
+    if not summary:
+        return
+    print(f"\n{'event':<32} {'count':>7} {'mean_us':>10} {'max_us':>10} {'total_us':>12}")
+    for name, entry in sorted(summary.items(), key=lambda item: -item[1]["total_cycles"]):
+        scale = 1e6 / timestamp_hz
+        mean = entry["total_cycles"] / entry["count"]
+        print(f"{name:<32} {entry['count']:>7} {mean * scale:>10.3f} "
+              f"{entry['max_cycles'] * scale:>10.3f} {entry['total_cycles'] * scale:>12.3f}")
+
+
+def function_profile(events, elf):
+    """
+    Self time in cycles of each traced handler/task function: BEGIN/END spans
+    minus the spans nested inside them. Coarse (callees are charged to the
+    traced function) but enough to rank code for lmb_placement.py.
+    """
+    profile = {}
+    stack = []
+    for event in events:
+        if event["id"] not in FUNCTION_ARG_EVENTS:
+            continue
+        if event["phase"] == PHASE_BEGIN:
+            stack.append({"event": event, "child_cycles": 0})
+        elif event["phase"] == PHASE_END and stack:
+            frame = stack.pop()
+            begin = frame["event"]
+            if begin["id"] != event["id"] or begin["arg0"] != event["arg0"]:
+                # Unbalanced after a buffer wrap; drop the partial span
+                stack.clear()
+                continue
+            total = event["cycles"] - begin["cycles"]
+            if stack:
+                stack[-1]["child_cycles"] += total
+            name = elf.function_at(begin["arg1"]) or f"0x{begin['arg1']:08x}"
+            profile[name] = profile.get(name, 0) + max(0, total - frame["child_cycles"])
+    return profile
+
+
+def write_profile(profile, output_path):
+    """Write a function profile in the JSON format read by lmb_placement.py."""
+    with open(output_path, "w") as f:
+        json.dump({"source": "trace", "unit": "cycles", "functions": profile}, f, indent=2)
+    print(f"✓ Function profile written: {output_path} ({len(profile)} functions)")
+
+
+def write_chrome_trace(events, output_path):
+    """Write events in the Chrome trace event format."""
+    phases = {PHASE_BEGIN: "B", PHASE_END: "E", PHASE_INSTANT: "i"}
+    trace_events = []
+    for event in events:
+        entry = {
+            "name": event["name"],
+            "ph": phases.get(event["phase"], "i"),
+            "ts": event["us"],
+            "pid": 0,
+            "tid": 0,
+            "args": {"arg0": event["arg0"], "arg1": event["arg1"]},
+        }
+        if entry["ph"] == "i":
+            entry["s"] = "t"
+        trace_events.append(entry)
+
+    with open(output_path, "w") as f:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ns"}, f)
+    print(f"✓ Chrome trace written: {output_path}")
+
+
+def read_live(address, size, cable_serial=None, xsdb_path="xsdb", halt=False):
+    """
+    Read the trace buffer from a running target over JTAG.
+
+    The JTAG read sees memory, not the D-cache: the buffer must be placed in
+    uncached memory (CLI_TRACE_BUFFER_ATTR, e.g. an LMB section) or flushed by
+    the application (Xil_DCacheFlushRange) before it is read, otherwise the
+    most recent events are missing or stale. The processor keeps running by
+    default, so reading the trace does not disturb the timing it records.
+
+    Args:
+        address: Start address of the buffer
+        size: Buffer size in bytes
+        cable_serial: JTAG cable serial number (None for the first cable)
+        xsdb_path: Path to the xsdb executable
+        halt: Stop the processor for the read and resume it afterwards, for a
+              consistent snapshot while events are still being recorded
+
+    Returns:
+        Raw buffer contents, or None if the read failed
+    """
+    from xsdb_platform_script import XSDBController
+
+    xsdb = XSDBController(xsdb_path)
+    if not xsdb.start_xsdb_session():
+        return None
+
+    with tempfile.TemporaryDirectory(prefix="cli_trace_") as dump_dir:
+        try:
+            xsdb.connect_to_hw_server()
+            xsdb.select_target_device(serial_number=cable_serial)
+            xsdb.select_processor_target()
+            if halt:
+                xsdb.stop_execution()
+            try:
+                return xsdb.read_memory_to_file(address, (size + 3) // 4, os.path.join(dump_dir, "trace.bin"))
+            finally:
+                if halt:
+                    xsdb.continue_execution()
+        finally:
+            xsdb.disconnect()
+            xsdb.close_session()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Read and decode the cli_core event trace buffer.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:", 1)[1]
+    )
+    parser.add_argument("--elf", type=str, required=True,
+                        help="Application ELF (locates the buffer and resolves command/task names)")
+    parser.add_argument("--dump", type=str,
+                        help="Decode a saved raw buffer dump instead of reading the target")
+    parser.add_argument("--save_dump", type=str,
+                        help="Also save the raw buffer read from the target to this file")
+    parser.add_argument("--chrome", type=str,
+                        help="Write Chrome trace JSON to this file")
+    parser.add_argument("--profile", type=str,
+                        help="Write per-function self time (cycles) as JSON for lmb_placement.py")
+    parser.add_argument("--cable_serial", type=str, default=None,
+                        help="JTAG cable serial number (optional)")
+    parser.add_argument("--xsdb_path", type=str, default="xsdb",
+                        help="Path to the xsdb executable")
+    parser.add_argument("--halt", action="store_true",
+                        help="Stop the processor while reading (the buffer must be uncached or flushed either way)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Print only the summary, not the full timeline")
+    args = parser.parse_args()
+
+    elf = ElfImage(args.elf)
+    symbol = elf.symbol(TRACE_SYMBOL)
+    if symbol is None:
+        print(f"Error: '{TRACE_SYMBOL}' not found in {args.elf} -- build with CLI_ENABLE_TRACE=1 (--enable_trace)")
+        return 1
+    address, size = symbol
+
+    if args.dump:
+        with open(args.dump, "rb") as f:
+            raw = f.read()
+    else:
+        print(f"Reading {size} bytes of trace buffer at 0x{address:08x}...")
+        raw = read_live(address, size, args.cable_serial, args.xsdb_path, halt=args.halt)
+        if raw is None:
+            return 1
+        if args.save_dump:
+            with open(args.save_dump, "wb") as f:
+                f.write(raw)
+            print(f"✓ Raw dump saved: {args.save_dump}")
+
+    try:
+        decoder = TraceDecoder(raw, elf)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    events = list(decoder.events())
+    if not args.quiet:
+        print_timeline(decoder, events)
+    print_summary(summarize(events), decoder.timestamp_hz)
+
+    if args.chrome:
+        write_chrome_trace(events, args.chrome)
+    if args.profile:
+        write_profile(function_profile(events, elf), args.profile)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
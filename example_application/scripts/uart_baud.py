@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+UART baud rate: what the hardware was built with, what the host should open, how fast it really is.
+
+The rate of axi_uartlite_0 is fixed when the hardware is built
+(make -C example_hw hw UART_BAUD=<rate>) and recorded in the XSA as C_BAUDRATE.
+UART Lite divides its AXI clock by 16 * an integer ratio, so the line really
+runs at clk / (16 * floor(clk / (16 * baud))) (uartlite.py, shared with the
+hardware build). The host tools open the port at that rate, read from the XSA,
+unless told otherwise.
+
+Usage:
+  python uart_baud.py show                                   # rate of the platform's XSA, achievable rates
+  python uart_baud.py show --xsa ../example_hw/build/out/arty_s7_riscv.xsa
+  python uart_baud.py detect --serial_port /dev/ttyUSB1      # probe the running shell
+  python uart_baud.py report --serial_port /dev/ttyUSB1      # bench_uart tx/rx, kept per rate
+
+Other scripts take --baud <rate|xsa|auto> through add_baud_argument()/resolve_baud().
+"""
+
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+import time
+
+from repo_paths import REPO_DIR
+import xsa_index
+from uartlite import RATE_TOLERANCE, host_rate, uart_clock, uartlite_rate
+
+UART_INSTANCE = "axi_uartlite_0"
+DEFAULT_BAUD = 9600
+PROMPT = "mbv> "
+
+# Where the XSA is looked for when none is given: the built platform, then the bundled one
+DEFAULT_PLATFORM_DIR = os.path.join(REPO_DIR, "example_platform", "build", "arty_s7_riscv_platform")
+BUNDLED_XSA = os.path.join(REPO_DIR, "example_platform", "xsa", "arty_s7_riscv.xsa")
+
+# Candidates for 'show' and 'auto'; the last three divide 100 MHz / 16 evenly
+STANDARD_RATES = [9600, 19200, 38400, 57600, 115200, 230400, 460800, 921600,
+                  1000000, 1562500, 2083333, 3125000]
+
+# UART frame: start + 8 data + stop
+BITS_PER_BYTE = 10
+
+BENCH_PATTERN = re.compile(r"BENCH test=(uart_\w+)((?: \w+=\S+)+)")
+
+
+def find_xsa(xsa_path=None, platform_dir=None):
+    """XSA to take the UART configuration from: explicit, platform, built default platform, bundled."""
+    if xsa_path:
+        return xsa_path if os.path.exists(xsa_path) else None
+    for directory in ([platform_dir] if platform_dir else []) + [DEFAULT_PLATFORM_DIR]:
+        found = xsa_index.find_platform_xsa(directory) if os.path.isdir(directory) else None
+        if found:
+            return found
+    return BUNDLED_XSA if os.path.exists(BUNDLED_XSA) else None
+
+
+def hardware_uart(xsa_path=None, platform_dir=None, instance=UART_INSTANCE):
+    """
+    UART configuration recorded in the XSA.
+
+    Returns:
+        Dict with 'xsa', 'baud', 'clock_hz', 'ratio', 'actual', 'error' and 'host',
+        or None when no XSA is found
+    """
+    path = find_xsa(xsa_path, platform_dir)
+    if not path:
+        return None
+    with xsa_index.XsaFile(path) as xsa:
+        baud = xsa_index.parse_int(xsa.parameter(instance, "C_BAUDRATE"))
+        clock_hz = uart_clock(xsa, instance)
+    ratio, actual, error = uartlite_rate(baud, clock_hz)
+    return {
+        "xsa": path,
+        "baud": baud,
+        "clock_hz": clock_hz,
+        "ratio": ratio,
+        "actual": actual,
+        "error": error,
+        "host": host_rate(baud, clock_hz),
+    }
+
+
+def open_port(serial_port, baud, timeout=0.05):
+    try:
+        import serial
+    except ImportError:
+        raise RuntimeError("UART access needs pyserial (pip install pyserial)")
+    return serial.Serial(serial_port, baud, timeout=timeout)
+
+
+def probe(port, wait=0.3):
+    """True if the shell answers a bare return with its prompt at the port's current rate."""
+    port.reset_input_buffer()
+    port.write(b"\r")
+    text = ""
+    deadline = time.time() + wait + 20.0 * BITS_PER_BYTE / port.baudrate
+    while time.time() < deadline:
+        text += port.read(max(1, port.in_waiting)).decode("ascii", "replace")
+        if PROMPT in text:
+            return True
+    return False
+
+
+def detect_baud(serial_port, candidates, wait=0.3):
+    """First candidate rate at which the shell prompt comes back intact, or None."""
+    for baud in candidates:
+        with open_port(serial_port, baud) as port:
+            if probe(port, wait):
+                return baud
+    return None
+
+
+def candidate_rates(hardware=None):
+    """Rates to try for 'auto': the XSA's rate first, then the standard ones."""
+    rates = [hardware["host"]] if hardware else []
+    return rates + [rate for rate in STANDARD_RATES if rate not in rates]
+
+
+def add_baud_argument(parser, default="xsa"):
+    parser.add_argument("--baud", type=str, default=default,
+                        help="UART baud rate: a number, 'xsa' (the rate the hardware was built with) "
+                             "or 'auto' (probe the shell)")
+
+
+def resolve_baud(value, serial_port=None, xsa_path=None, platform_dir=None):
+    """
+    Turn a --baud value into the rate to open the port at.
+
+    Args:
+        value: A number, 'xsa' or 'auto'
+        serial_port: Port to probe for 'auto'
+        xsa_path, platform_dir: Where to read C_BAUDRATE for 'xsa' (and to try first for 'auto')
+
+    Returns:
+        Baud rate as int
+    """
+    if value not in ("xsa", "auto"):
+        return int(value)
+
+    try:
+        hardware = hardware_uart(xsa_path, platform_dir)
+    except (KeyError, ValueError) as e:
+        print(f"⚠️  No UART configuration in the XSA: {e}")
+        hardware = None
+
+    if value == "xsa":
+        if not hardware:
+            print(f"⚠️  No XSA found; assuming {DEFAULT_BAUD} baud")
+            return DEFAULT_BAUD
+        note = "" if hardware["host"] == hardware["baud"] else f", UART Lite runs at {hardware['host']}"
+        print(f"✓ UART: {hardware['baud']} baud (C_BAUDRATE in {os.path.basename(hardware['xsa'])}{note})")
+        return hardware["host"]
+
+    if not serial_port:
+        raise RuntimeError("--baud auto needs a serial port to probe")
+    baud = detect_baud(serial_port, candidate_rates(hardware))
+    if baud is None:
+        raise RuntimeError(f"No shell prompt on {serial_port} at any of {', '.join(map(str, candidate_rates(hardware)))}")
+    print(f"✓ UART: detected {baud} baud on {serial_port}")
+    return baud
+
+
+def bench_pattern(count):
+    """Same printable pattern as bench_uart in bench_commands.cpp."""
+    return bytes(0x21 + i % 94 for i in range(count))
+
+
+def parse_bench(text, test):
+    """Key/value pairs of the last 'BENCH test=<test>' line, or None."""
+    found = None
+    for match in BENCH_PATTERN.finditer(text):
+        if match.group(1) == test:
+            found = dict(pair.split("=", 1) for pair in match.group(2).split())
+    return found
+
+
+class ThroughputTest:
+    """Runs bench_uart tx/rx on the shell and measures the host side of the wire."""
+
+    def __init__(self, port, size, timeout=10.0):
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.text = ""
+
+    def read_until(self, marker, deadline):
+        while time.time() < deadline:
+            self.text += self.port.read(max(1, self.port.in_waiting)).decode("ascii", "replace")
+            if marker in self.text:
+                return True
+        return False
+
+    def start(self, command, marker):
+        """Run a bench_uart command; returns whatever followed its marker line."""
+        self.port.reset_input_buffer()
+        self.port.write(f"\r{command}\r".encode())
+        self.text = ""
+        deadline = time.time() + self.timeout
+        if not self.read_until(marker, deadline):
+            raise RuntimeError(f"No '{marker}' from '{command}'; is bench_uart in this build?")
+        while "\n" not in self.text[self.text.index(marker):]:
+            if time.time() > deadline:
+                raise RuntimeError(f"Incomplete '{marker}' line from '{command}'")
+            self.text += self.port.read(1).decode("ascii", "replace")
+        end = self.text.index("\n", self.text.index(marker)) + 1
+        rest = self.text[end:].encode("ascii", "replace")
+        self.text = ""
+        return rest
+
+    def transmit(self):
+        """Target to host: bytes arrive as fast as the target can send them."""
+        data = bytearray(self.start(f"bench_uart tx {self.size}", "BENCH_DATA"))
+        start = time.time()
+        deadline = start + self.timeout + self.size * BITS_PER_BYTE / self.port.baudrate * 2
+        while len(data) < self.size and time.time() < deadline:
+            data.extend(self.port.read(min(self.size - len(data), max(1, self.port.in_waiting))))
+        elapsed = time.time() - start
+        payload = bytes(data[:self.size])
+        self.text = bytes(data[self.size:]).decode("ascii", "replace")
+        self.read_until(PROMPT, time.time() + self.timeout)
+        errors = sum(1 for a, b in zip(payload, bench_pattern(len(payload))) if a != b)
+        target = parse_bench(self.text, "uart_tx") or {}
+        return {
+            "bytes": self.size,
+            "received": len(payload),
+            "errors": errors + self.size - len(payload),
+            "host_bps": len(payload) / elapsed if elapsed > 0 else 0.0,
+            "target_bps": int(target.get("bps", 0)),
+        }
+
+    def receive(self):
+        """Host to target: the host writes as fast as the port takes it, the target counts."""
+        self.start(f"bench_uart rx {self.size}", "BENCH_READY")
+        start = time.time()
+        self.port.write(bench_pattern(self.size))
+        self.port.flush()
+        elapsed = time.time() - start
+        if not self.read_until(PROMPT, time.time() + self.timeout + 1.0):
+            raise RuntimeError("No result from 'bench_uart rx'")
+        target = parse_bench(self.text, "uart_rx")
+        if not target:
+            raise RuntimeError("Could not parse the 'bench_uart rx' result")
+        return {
+            "bytes": self.size,
+            "received": int(target["received"]),
+            "errors": int(target["errors"]) + self.size - int(target["received"]),
+            "host_bps": self.size / elapsed if elapsed > 0 else 0.0,
+            "target_bps": int(target["bps"]),
+        }
+
+
+def run_report(args):
+    hardware = hardware_uart(args.xsa, args.platform_dir) if args.baud in ("xsa", "auto") else None
+    baud = resolve_baud(args.baud, args.serial_port, args.xsa, args.platform_dir)
+    with open_port(args.serial_port, baud) as port:
+        if not probe(port):
+            print(f"❌ No shell prompt at {baud} baud")
+            return 1
+        test = ThroughputTest(port, args.bytes, args.timeout)
+        tx = test.transmit()
+        rx = test.receive()
+
+    result = {
+        "baud": baud,
+        "hardware_baud": hardware["baud"] if hardware else None,
+        "line_bps": baud / BITS_PER_BYTE,
+        "tx": tx,
+        "rx": rx,
+        "serial_port": args.serial_port,
+        "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    history = {}
+    if os.path.exists(args.history):
+        with open(args.history) as f:
+            history = json.load(f)
+    history[str(baud)] = result
+    os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+    with open(args.history, "w") as f:
+        json.dump(history, f, indent=2)
+
+    print_report(history, current=baud)
+    print(f"✓ Saved to {args.history}")
+    return 0 if tx["errors"] == 0 and rx["errors"] == 0 else 1
+
+
+def print_report(history, current=None):
+    """One line per baud rate measured so far (each needs its own hardware build)."""
+    print("=" * 60)
+    print(f"{'Baud':>9} {'Line B/s':>9} {'TX B/s':>8} {'TX %':>5} {'RX B/s':>8} {'RX %':>5} {'Errors':>7}  Date")
+    for key in sorted(history, key=int):
+        entry = history[key]
+        line = entry["line_bps"]
+        tx, rx = entry["tx"], entry["rx"]
+        # RX is limited by the target: count what it saw, over its own first-to-last byte time
+        rx_bps = rx["target_bps"] or rx["host_bps"]
+        errors = tx["errors"] + rx["errors"]
+        marker = "*" if current is not None and int(key) == current else " "
+        print(f"{int(key):>9}{marker}{line:>9.0f} {tx['host_bps']:>8.0f} {100.0 * tx['host_bps'] / line:>5.0f} "
+              f"{rx_bps:>8.0f} {100.0 * rx_bps / line:>5.0f} {errors:>7}  {entry['date']}")
+    print("=" * 60)
+
+
+def run_show(args):
+    hardware = hardware_uart(args.xsa, args.platform_dir)
+    if not hardware:
+        print("❌ No XSA found")
+        return 1
+    print(f"XSA:        {hardware['xsa']}")
+    print(f"C_BAUDRATE: {hardware['baud']} ({UART_INSTANCE} at {hardware['clock_hz'] / 1e6:.3f} MHz)")
+    print(f"Line rate:  {hardware['actual']:.0f} baud (ratio {hardware['ratio']}, {hardware['error']:.2f}% off)")
+    print(f"Host port:  {hardware['host']} baud")
+    print(f"\nRates for UART_BAUD= at {hardware['clock_hz'] / 1e6:.0f} MHz:")
+    for rate in STANDARD_RATES:
+        try:
+            ratio, actual, error = uartlite_rate(rate, hardware["clock_hz"])
+        except ValueError:
+            continue
+        status = "✓" if error < RATE_TOLERANCE else "⚠️ "
+        print(f"  {status} {rate:>8} -> {actual:>9.0f} baud ({error:5.2f}% off, host opens at "
+              f"{host_rate(rate, hardware['clock_hz'])})")
+    return 0
+
+
+def run_detect(args):
+    hardware = None
+    try:
+        hardware = hardware_uart(args.xsa, args.platform_dir)
+    except (KeyError, ValueError):
+        pass
+    baud = detect_baud(args.serial_port, candidate_rates(hardware))
+    if baud is None:
+        print(f"❌ No shell prompt on {args.serial_port}")
+        return 1
+    print(f"✓ {args.serial_port}: {baud} baud")
+    if hardware and baud != hardware["host"]:
+        print(f"⚠️  The XSA says {hardware['host']}; the running bitstream is from a different build")
+    return 0
+
+
+def parse_size(text):
+    """Decimal size with optional K/M suffix, like parse_size() on the target."""
+    match = re.fullmatch(r"(\d+)([kKmM]?)", text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid size: {text}")
+    return int(match.group(1)) << {"": 0, "k": 10, "m": 20}[match.group(2).lower()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UART baud rate of the hardware, detection and throughput report.")
+    parser.add_argument("command", choices=["show", "detect", "report"], help="What to do")
+    parser.add_argument("--xsa", type=str, default=None, help="XSA to read C_BAUDRATE from")
+    parser.add_argument("--platform_dir", type=str, default=None, help="Vitis platform directory to take the XSA from")
+    parser.add_argument("--serial_port", type=str, default="/dev/ttyUSB1", help="UART console port")
+    add_baud_argument(parser)
+    parser.add_argument("--bytes", type=parse_size, default=64 << 10, help="Bytes per direction for 'report'")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for the shell")
+    parser.add_argument("--history", type=str, default="uart_throughput.json",
+                        help="Per-rate results for 'report' (one entry per baud rate)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "show":
+            return run_show(args)
+        if args.command == "detect":
+            return run_detect(args)
+        return run_report(args)
+    except (RuntimeError, ValueError, KeyError, OSError) as e:
+        print(f"❌ {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
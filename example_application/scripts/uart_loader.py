@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Fast application reload over the UART console, without JTAG or reprogramming.
+
+Talks to the 'load' command of the running application (loader_commands.cpp):
+asks the target for CRCs of the memory the new ELF occupies, sends only the
+chunks that differ into the DDR staging area as windowed, CRC-checked frames,
+then commits. The target verifies the staged data, copies it into place and
+jumps to the new entry point; the FPGA keeps its bitstream.
+
+Usage:
+  python uart_loader.py --elf app.elf --serial_port /dev/ttyUSB1
+  python uart_loader.py --elf app.elf --full              # send every byte, no diff
+  python uart_loader.py --elf app.elf --dry_run           # stage and verify, keep running the old image
+
+The first image still comes from xsdb_platform_script.py (JTAG); every later
+one can go over the UART. The application must include the 'load' command.
+"""
+
+import argparse
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+
+import repo_paths  # noqa: F401  (shared import path)
+from trace_reader import ElfImage
+import uart_baud
+
+# Frame layout, see loader_commands.cpp
+SOF_HOST = 0xA5
+SOF_TARGET = 0x5A
+RESPONSE_FLAG = 0x80
+FRAME_HEADER = struct.Struct("<BHH")   # type, seq, len
+FRAME_OVERHEAD = 1 + FRAME_HEADER.size + 4
+
+FRAME_HELLO = 0x01
+FRAME_CRC = 0x02
+FRAME_DATA = 0x03
+FRAME_COMMIT = 0x04
+FRAME_ABORT = 0x05
+FRAME_NAK = 0x7F
+
+PROTOCOL_VERSION = 1
+COMMIT_FLAG_JUMP = 0x01
+MIN_REPLY_LIMIT = 64                   # longest reply before HELLO has settled the block size
+RUN_FORMAT = struct.Struct("<III")     # dest, staging offset, bytes
+
+STATUS_NAMES = {
+    0: "ok",
+    1: "bad CRC",
+    2: "bad sequence",
+    3: "bad range",
+    4: "bad length",
+    5: "verify failed",
+    6: "bad type",
+}
+
+READY_PATTERN = re.compile(r"LOADER READY version=(\d+) baud=(\d+) block=(\d+) window=(\d+) "
+                           r"staging=0x([0-9a-fA-F]+) size=(\d+)")
+
+# UART frame: start + 8 data + stop
+BITS_PER_BYTE = 10
+
+
+class LoaderError(Exception):
+    """The target rejected a request or stopped answering."""
+
+
+def crc32(data):
+    return zlib.crc32(data) & 0xFFFFFFFF
+
+
+def align_down(value, alignment=4):
+    return value & ~(alignment - 1)
+
+
+def align_up(value, alignment=4):
+    return (value + alignment - 1) & ~(alignment - 1)
+
+
+def image_regions(elf):
+    """
+    Memory contents of the ELF as word-aligned regions.
+
+    Loadable segments are extended with zeros to their memory size (.bss) and
+    merged where their aligned extents touch, so every region can be written
+    with whole words without guessing neighbouring bytes.
+
+    Returns:
+        Sorted list of (address, bytearray)
+    """
+    spans = []
+    for (vaddr, offset, filesz), memsz in zip(elf.segments, elf.memory_sizes):
+        if memsz == 0:
+            continue
+        contents = elf.data[offset:offset + filesz] + bytes(memsz - filesz)
+        spans.append((vaddr, contents))
+    spans.sort(key=lambda span: span[0])
+
+    regions = []
+    for vaddr, contents in spans:
+        start, end = align_down(vaddr), align_up(vaddr + len(contents))
+        if regions and start <= regions[-1][0] + len(regions[-1][1]):
+            base, data = regions[-1]
+            if end > base + len(data):
+                data.extend(bytes(end - base - len(data)))
+        else:
+            base, data = start, bytearray(end - start)
+            regions.append((base, data))
+        data[vaddr - base:vaddr - base + len(contents)] = contents
+    return regions
+
+
+class LoaderLink:
+    """Framing, sequence numbers and retransmission on top of a serial port."""
+
+    def __init__(self, port, timeout=1.0, retries=5, verbose=False):
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.verbose = verbose
+        self.seq = 0
+        self.block = 0
+        self.window = 1
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retransmits = 0
+        self.rx = bytearray()
+
+    def send_frame(self, frame_type, seq, payload=b""):
+        body = FRAME_HEADER.pack(frame_type, seq & 0xFFFF, len(payload)) + payload
+        frame = bytes([SOF_HOST]) + body + struct.pack("<I", crc32(body))
+        self.port.write(frame)
+        self.bytes_sent += len(frame)
+
+    def read_frame(self, timeout):
+        """
+        Next valid target frame as (type, seq, payload), or None on timeout.
+        Bytes that do not form a frame with a good CRC are skipped.
+        """
+        deadline = time.time() + timeout
+        while True:
+            frame = self.parse_frame()
+            if frame:
+                return frame
+            if time.time() >= deadline:
+                return None
+            chunk = self.port.read(max(1, self.port.in_waiting))
+            self.bytes_received += len(chunk)
+            self.rx.extend(chunk)
+
+    def parse_frame(self):
+        while True:
+            start = self.rx.find(bytes([SOF_TARGET]))
+            if start < 0:
+                self.rx.clear()
+                return None
+            del self.rx[:start]
+            if len(self.rx) < 1 + FRAME_HEADER.size:
+                return None
+            frame_type, seq, length = FRAME_HEADER.unpack_from(self.rx, 1)
+            if length > max(self.block, MIN_REPLY_LIMIT):
+                del self.rx[:1]
+                continue
+            total = FRAME_OVERHEAD + length
+            if len(self.rx) < total:
+                return None
+            body = bytes(self.rx[1:total - 4])
+            (expected,) = struct.unpack_from("<I", self.rx, total - 4)
+            if crc32(body) == expected:
+                del self.rx[:total]
+                return frame_type, seq, body[FRAME_HEADER.size:]
+            # Not a frame after all: resynchronize on the next start byte
+            del self.rx[:1]
+
+    def request(self, frame_type, payload=b"", timeout=None):
+        """Send one frame and wait for its response; resent on NAK or timeout."""
+        seq = self.seq
+        self.seq = (self.seq + 1) & 0xFFFF
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.retransmits += 1
+            self.send_frame(frame_type, seq, payload)
+            deadline = time.time() + (timeout or self.timeout)
+            while time.time() < deadline:
+                frame = self.read_frame(deadline - time.time())
+                if frame is None:
+                    break
+                reply_type, reply_seq, reply = frame
+                if reply_type == frame_type | RESPONSE_FLAG and reply_seq == seq:
+                    return reply
+                if reply_type == FRAME_NAK and reply_seq == seq:
+                    break
+        raise LoaderError(f"No response to frame type 0x{frame_type:02x} (seq {seq})")
+
+    def send_window(self, payloads):
+        """
+        Send DATA frames with up to 'window' in flight (go-back-N).
+
+        The target acknowledges frames in order; a NAK carries the sequence
+        number it expects next, from which everything is resent.
+        """
+        first = self.seq
+        count = len(payloads)
+        acked = 0          # payloads[:acked] are acknowledged
+        sent = 0           # payloads[:sent] have been transmitted at least once
+        attempts = 0
+        # A full window may still be queued ahead of the ack on a slow line
+        frame_seconds = (self.block + FRAME_OVERHEAD + 4) * BITS_PER_BYTE / self.port.baudrate
+        wait = self.timeout + self.window * frame_seconds
+        while acked < count:
+            while sent < count and sent - acked < self.window:
+                self.send_frame(FRAME_DATA, first + sent, payloads[sent])
+                sent += 1
+            frame = self.read_frame(wait)
+            if frame is None:
+                attempts += 1
+                if attempts > self.retries:
+                    raise LoaderError(f"Timed out waiting for DATA ack {(first + acked) & 0xFFFF}")
+                self.retransmits += sent - acked
+                sent = acked
+                continue
+            reply_type, reply_seq, reply = frame
+            index = (reply_seq - first) & 0xFFFF
+            if reply_type == FRAME_NAK:
+                if acked <= index <= sent:
+                    if self.verbose:
+                        print(f"  NAK at {reply_seq} ({STATUS_NAMES.get(reply[0], reply[0])}), resending {sent - index}")
+                    self.retransmits += sent - index
+                    acked, sent = index, index
+                continue
+            if reply_type != FRAME_DATA | RESPONSE_FLAG or index >= sent:
+                continue
+            if reply and reply[0] != 0:
+                raise LoaderError(f"DATA frame {reply_seq} rejected: {STATUS_NAMES.get(reply[0], reply[0])}")
+            if index >= acked:
+                acked = index + 1
+                attempts = 0
+        self.seq = (first + count) & 0xFFFF
+
+
+class UartLoader:
+    """One reload session: attach to the shell, diff, transfer, commit."""
+
+    def __init__(self, port, args):
+        self.port = port
+        self.args = args
+        self.link = LoaderLink(port, timeout=args.timeout, retries=args.retries, verbose=args.verbose)
+        self.ready = None
+        self.staging_base = 0
+        self.staging_size = 0
+        self.baud = 0
+
+    def enter_loader(self):
+        """Start 'load' on the shell and wait for its READY line."""
+        self.port.reset_input_buffer()
+        self.port.write(b"\r")
+        time.sleep(0.1)
+        self.port.reset_input_buffer()
+        self.port.write(b"load\r")
+        text = ""
+        deadline = time.time() + self.args.timeout * 3
+        while time.time() < deadline:
+            text += self.port.read(max(1, self.port.in_waiting)).decode("ascii", "replace")
+            match = READY_PATTERN.search(text)
+            if match and text.endswith("\n"):
+                self.ready = match
+                return
+        raise LoaderError("No 'LOADER READY' from the target; is the application running and built with the loader?")
+
+    def hello(self):
+        version, baud, block, window, staging, size = self.ready.groups()
+        if int(version) != PROTOCOL_VERSION:
+            raise LoaderError(f"Target speaks loader protocol {version}, this tool {PROTOCOL_VERSION}")
+        block = min(int(block), self.args.block)
+        window = min(int(window), self.args.window)
+        self.link.seq = 0
+        reply = self.link.request(FRAME_HELLO, struct.pack("<BHB", PROTOCOL_VERSION, block, window))
+        (_, self.link.block, self.link.window, self.baud,
+         self.staging_base, self.staging_size) = struct.unpack_from("<BHBIII", reply)
+        print(f"✓ Loader: block {self.link.block} bytes, window {self.link.window}, "
+              f"staging 0x{self.staging_base:08x} ({self.staging_size // 1024} KB)")
+        # UART Lite may run off its nominal rate (see uart_baud.py); only a gross mismatch matters
+        if self.baud and abs(self.baud - self.port.baudrate) > self.baud * 0.05:
+            print(f"⚠️  Target reports {self.baud} baud, port is open at {self.port.baudrate}")
+
+    def remote_crcs(self, address, length, chunk):
+        """CRC-32 of each chunk of live target memory in [address, address + length)."""
+        per_request = max(1, (self.link.block - 4) // 4) * chunk
+        crcs = []
+        for offset in range(0, length, per_request):
+            span = min(per_request, length - offset)
+            reply = self.link.request(FRAME_CRC, struct.pack("<III", address + offset, span, chunk))
+            if len(reply) == 1:
+                raise LoaderError(f"CRC query at 0x{address + offset:08x} rejected: "
+                                  f"{STATUS_NAMES.get(reply[0], reply[0])}")
+            count = (span + chunk - 1) // chunk
+            crcs.extend(struct.unpack_from(f"<{count}I", reply, 4))
+        return crcs
+
+    def changed_runs(self, regions):
+        """
+        (address, bytes) runs of the new image that differ from target memory.
+        Adjacent changed chunks are merged into one run.
+        """
+        chunk = self.args.chunk
+        runs = []
+        for base, data in regions:
+            if self.args.full:
+                runs.append((base, bytes(data)))
+                continue
+            remote = self.remote_crcs(base, len(data), chunk)
+            run_start = None
+            for index, remote_crc in enumerate(remote + [None]):
+                offset = index * chunk
+                changed = remote_crc is not None and crc32(data[offset:offset + chunk]) != remote_crc
+                if changed and run_start is None:
+                    run_start = offset
+                elif not changed and run_start is not None:
+                    end = min(offset, len(data))
+                    runs.append((base + run_start, bytes(data[run_start:end])))
+                    run_start = None
+        return runs
+
+    def stage(self, runs):
+        """
+        Lay out the staging area: run data, then the run table.
+
+        Returns:
+            (staging bytes, table offset)
+        """
+        staging = bytearray()
+        table = []
+        for address, data in runs:
+            table.append(RUN_FORMAT.pack(address, len(staging), len(data)))
+            staging.extend(data)
+            staging.extend(bytes(align_up(len(staging)) - len(staging)))
+        table_offset = len(staging)
+        staging.extend(b"".join(table))
+        return bytes(staging), table_offset
+
+    def transfer(self, staging):
+        step = self.link.block
+        payloads = [struct.pack("<I", offset) + staging[offset:offset + step]
+                    for offset in range(0, len(staging), step)]
+        self.link.send_window(payloads)
+
+    def commit(self, entry, table_offset, run_count, staging, jump):
+        payload = struct.pack("<IIIIIB", entry, table_offset, run_count, len(staging),
+                              crc32(staging), COMMIT_FLAG_JUMP if jump else 0)
+        reply = self.link.request(FRAME_COMMIT, payload, timeout=self.args.timeout + len(staging) / 1e6)
+        if reply[0] != 0:
+            raise LoaderError(f"COMMIT rejected: {STATUS_NAMES.get(reply[0], reply[0])}")
+
+    def abort(self):
+        try:
+            self.link.request(FRAME_ABORT)
+        except LoaderError:
+            pass
+
+    def wait_for_banner(self):
+        """Read the new image's output until its prompt; returns the text."""
+        # Whatever followed the COMMIT ack in the same read already belongs to the new image
+        text = self.link.rx.decode("ascii", "replace")
+        self.link.rx.clear()
+        deadline = time.time() + self.args.boot_timeout
+        while time.time() < deadline:
+            text += self.port.read(max(1, self.port.in_waiting)).decode("ascii", "replace")
+            if "Version:" in text and text.rstrip().endswith(">"):
+                break
+        return text
+
+    def run(self, elf_path):
+        elf = ElfImage(elf_path)
+        regions = image_regions(elf)
+        image_bytes = sum(len(data) for _, data in regions)
+
+        start = time.time()
+        self.enter_loader()
+        self.hello()
+        try:
+            runs = self.changed_runs(regions)
+            staging, table_offset = self.stage(runs)
+            if len(staging) > self.staging_size:
+                raise LoaderError(f"Changes need {len(staging)} bytes, staging area holds {self.staging_size}")
+            diff_done = time.time()
+            self.transfer(staging)
+            self.commit(elf.entry, table_offset, len(runs), staging, jump=not self.args.dry_run)
+        except (LoaderError, KeyboardInterrupt):
+            self.abort()
+            raise
+        elapsed = time.time() - start
+
+        changed = sum(len(data) for _, data in runs)
+        self.report(image_bytes, changed, len(runs), len(staging), diff_done - start, elapsed)
+        if self.args.dry_run:
+            print("✓ Staged image verified on the target (not started)")
+            return
+        print(f"✓ Started new image at 0x{elf.entry:08x}")
+        if self.args.boot_timeout > 0:
+            banner = self.wait_for_banner()
+            version = re.search(r"Version:\s*(\S+)", banner)
+            if version:
+                print(f"✓ Application is up: version {version.group(1)} ({time.time() - start:.2f} s total)")
+            else:
+                print(f"⚠️  No banner from the new image within {self.args.boot_timeout} s")
+
+    def report(self, image_bytes, changed, run_count, staged, diff_seconds, elapsed):
+        link = self.link
+        wire = link.bytes_sent + link.bytes_received
+        line_rate = self.port.baudrate / BITS_PER_BYTE
+        skipped = 100.0 * (1 - changed / image_bytes) if image_bytes else 0.0
+        print("=" * 60)
+        print(f"Image:        {image_bytes} bytes in loadable segments")
+        print(f"Changed:      {changed} bytes in {run_count} runs ({skipped:.1f}% skipped)")
+        print(f"Staged:       {staged} bytes (data + run table)")
+        print(f"On the wire:  {link.bytes_sent} sent, {link.bytes_received} received, {link.retransmits} retransmits")
+        print(f"Time:         {elapsed:.2f} s ({diff_seconds:.2f} s CRC diff)")
+        if elapsed > 0:
+            print(f"Throughput:   {staged / elapsed:.0f} B/s payload, {wire / elapsed:.0f} B/s on the wire, "
+                  f"{100.0 * link.bytes_sent / elapsed / line_rate:.0f}% of {self.port.baudrate} baud")
+            print(f"Effective:    {image_bytes / elapsed:.0f} B/s of image reloaded")
+        print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reload the application over the UART console.")
+    parser.add_argument("--elf", type=str, required=True, help="Application ELF to load")
+    parser.add_argument("--serial_port", type=str, default="/dev/ttyUSB1", help="UART console port")
+    uart_baud.add_baud_argument(parser)
+    parser.add_argument("--xsa", type=str, default=None, help="XSA to read the baud rate from (default: platform's)")
+    parser.add_argument("--block", type=int, default=1024, help="Requested DATA payload bytes per frame")
+    parser.add_argument("--window", type=int, default=4, help="Requested DATA frames in flight")
+    parser.add_argument("--chunk", type=int, default=256, help="Diff granularity in bytes (multiple of 4)")
+    parser.add_argument("--full", action="store_true", help="Send the whole image instead of the changed chunks")
+    parser.add_argument("--dry_run", action="store_true", help="Stage and verify, but keep running the old image")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Seconds to wait for a response")
+    parser.add_argument("--retries", type=int, default=5, help="Resends before giving up")
+    parser.add_argument("--boot_timeout", type=float, default=5.0, help="Seconds to wait for the new banner (0: don't)")
+    parser.add_argument("--verbose", action="store_true", help="Report NAKs and retransmissions")
+    args = parser.parse_args()
+
+    if args.chunk <= 0 or args.chunk % 4:
+        parser.error("--chunk must be a positive multiple of 4")
+
+    try:
+        import serial
+    except ImportError:
+        print("❌ uart_loader.py needs pyserial (pip install pyserial)")
+        return 1
+
+    try:
+        baud = uart_baud.resolve_baud(args.baud, args.serial_port, args.xsa)
+    except (RuntimeError, ValueError, OSError, serial.SerialException) as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"Reloading {os.path.basename(args.elf)} over {args.serial_port} at {baud} baud")
+    try:
+        with serial.Serial(args.serial_port, baud, timeout=0.05) as port:
+            UartLoader(port, args).run(args.elf)
+    except (LoaderError, ValueError, OSError, serial.SerialException) as e:
+        print(f"❌ {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("❌ Interrupted; loader aborted")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,8 +17,47 @@ import subprocess
 import datetime
 import json
 
+import repo_paths  # noqa: F401  (shared import path)
+import xsa_index
+
+# Default compiler/linker flags. A build profile (--build_profile, e.g. written by
+# flag_autotuner.py) replaces both lists.
+DEFAULT_COMPILE_FLAGS = [
+    "-fno-rtti",
+    "-fno-exceptions",
+    "-fno-threadsafe-statics",
+    "-s",
+    "-ffunction-sections",
+    "-fdata-sections",
+    "-Os",
+]
+DEFAULT_LINK_FLAGS = [
+    "-Wl,--gc-sections",
+]
+
+# Always linked with a map file: LMB placement and size reports read it
+MAP_FILE_FLAG = "-Wl,-Map=output.map"
+
+# UART whose C_BAUDRATE becomes the firmware's UART_BAUD_RATE
+UART_INSTANCE = "axi_uartlite_0"
+
+def load_build_profile(profile_path):
+    """
+    Load a build profile: JSON with 'compile_flags' and 'link_flags' lists
+    (plus optional 'name', 'description' and 'metrics').
+    """
+    with open(profile_path) as f:
+        profile = json.load(f)
+    for key in ("compile_flags", "link_flags"):
+        if not isinstance(profile.get(key), list):
+            raise ValueError(f"Build profile {profile_path} has no '{key}' list")
+    return profile
+
 class VitisApplicationBuilder:
-    def __init__(self, workspace_dir, platform_dir, cli_core_dir, app_src_dir, app_name):
+    def __init__(self, workspace_dir, platform_dir, cli_core_dir, app_src_dir, app_name, enable_profiling=True, enable_trace=False,
+                 lmb_profile=None, lmb_map=None, lmb_reserve=None, ddr_slowdown=None, build_profile=None,
+                 xsa_isa=True, xsa_path=None, toolchain_gcc=None, import_mode="link", shared_includes=False,
+                 source_pool=None):
         """Initialize the Vitis application builder with validated paths."""
         self.workspace_dir = os.path.abspath(workspace_dir)
         self.platform_dir = os.path.abspath(platform_dir)
@@ -26,6 +65,28 @@ class VitisApplicationBuilder:
         self.cli_core_dir = os.path.abspath(cli_core_dir)
         self.app_src_dir = os.path.abspath(app_src_dir)
         self.app_name = app_name
+        self.enable_profiling = enable_profiling
+        self.enable_trace = enable_trace
+        self.lmb_profile = os.path.abspath(lmb_profile) if lmb_profile else None
+        self.lmb_map = os.path.abspath(lmb_map) if lmb_map else None
+        self.lmb_reserve = lmb_reserve
+        self.ddr_slowdown = ddr_slowdown
+        self.lmb_plan = None
+        self.build_profile = os.path.abspath(build_profile) if build_profile else None
+        self.xsa_isa = xsa_isa
+        self.xsa_path = os.path.abspath(xsa_path) if xsa_path else None
+        self.toolchain_gcc = toolchain_gcc
+        self.import_mode = import_mode
+        self.shared_includes = shared_includes
+        self.source_pool = os.path.abspath(source_pool) if source_pool else None
+        self.importer = None
+        self.cpu_flags = []
+        self.hw_fingerprint = None
+        self.uart_baud = None
+        self.cpu_clock_hz = None
+        self.lmb = None
+        self.ddr = None
+        self.cache_bytes = {}
         self.client = None
         self.app_comp = None
         self.build_info = {}
@@ -139,7 +200,9 @@ class VitisApplicationBuilder:
             'build_user': system_info['user'],
             'python_version': system_info['python_version'],
             'app_name': self.app_name,
-            'platform_name': self.platform_name
+            'platform_name': self.platform_name,
+            'hw_fingerprint': self.hw_fingerprint['sha256'][:12] if self.hw_fingerprint else 'unknown',
+            'uart_baud': self.uart_baud or 0
         }
         
         # Create version string
@@ -166,6 +229,8 @@ class VitisApplicationBuilder:
         print(f"  Git Hash: {self.build_info['git_short_hash']}")
         print(f"  Build Date: {self.build_info['build_timestamp']}")
         print(f"  Branch: {self.build_info['git_branch']}")
+        print(f"  Hardware: {self.build_info['hw_fingerprint']}")
+        print(f"  UART: {self.build_info['uart_baud'] or 'unknown'} baud")
         if self.build_info['git_dirty']:
             print(f"  ⚠️  Working directory has uncommitted changes")
     
@@ -201,10 +266,63 @@ class VitisApplicationBuilder:
                 raise FileNotFoundError(f"Required CLI core subdirectory not found: {full_path}")
             print(f"✓ CLI core subdirectory: {full_path}")
         
+        if self.build_profile:
+            if not os.path.exists(self.build_profile):
+                raise FileNotFoundError(f"Build profile not found: {self.build_profile}")
+            load_build_profile(self.build_profile)
+            print(f"✓ Build profile: {self.build_profile}")
+        
+        if self.xsa_path and not os.path.exists(self.xsa_path):
+            raise FileNotFoundError(f"XSA not found: {self.xsa_path}")
+        self.validate_hardware()
+        
+        if self.lmb_profile:
+            if not self.lmb_map:
+                raise ValueError("LMB placement needs the linker map of the profiled build (--lmb_map)")
+            for name, path in [("LMB profile", self.lmb_profile), ("LMB map file", self.lmb_map)]:
+                if not os.path.exists(path):
+                    raise FileNotFoundError(f"{name} not found: {path}")
+                print(f"✓ {name}: {path}")
+        
         # Ensure workspace directory exists
         os.makedirs(self.workspace_dir, exist_ok=True)
         print(f"✓ Workspace directory: {self.workspace_dir}")
         
+    def validate_hardware(self):
+        """Check the platform's XSA without a Vitis session and record its fingerprint."""
+        self.xsa_path = self.xsa_path or xsa_index.find_platform_xsa(self.platform_dir)
+        if not self.xsa_path:
+            print(f"⚠️  No XSA found under {self.platform_dir}; hardware not checked")
+            return
+        
+        with xsa_index.XsaFile(self.xsa_path) as xsa:
+            # Compiling needs the hardware description only; the bitstream is
+            # checked when the board is programmed (xsdb_platform_script.py)
+            problems = xsa.validate(require_bitstream=False)
+            if problems:
+                raise ValueError(f"XSA {self.xsa_path} is not usable: {'; '.join(problems)}")
+            self.hw_fingerprint = xsa.fingerprint()
+            print(f"✓ Hardware: {self.hw_fingerprint['top']} ({self.hw_fingerprint['part']}), "
+                  f"XSA {self.hw_fingerprint['sha256'][:12]} (index {xsa.index_source})")
+            self.uart_baud = xsa_index.parse_int(xsa.parameter(UART_INSTANCE, "C_BAUDRATE"))
+            if self.uart_baud:
+                print(f"✓ UART: {UART_INSTANCE} built for {self.uart_baud} baud")
+            self.cpu_clock_hz = xsa.clock_frequency(xsa.processor())
+            if self.cpu_clock_hz:
+                print(f"✓ CPU clock: {xsa.processor()} at {self.cpu_clock_hz / 1e6:.3f} MHz")
+            processor = xsa.processor()
+            for cache in ("DCACHE", "ICACHE"):
+                used = xsa_index.parse_int(xsa.parameter(processor, f"C_USE_{cache}"), 0)
+                self.cache_bytes[cache] = xsa_index.parse_int(xsa.parameter(processor, f"C_{cache}_BYTE_SIZE"), 0) if used else 0
+            print(f"✓ Caches: {self.cache_bytes['DCACHE'] // 1024}K D, {self.cache_bytes['ICACHE'] // 1024}K I")
+            self.ddr = xsa.external_memory()
+            if self.ddr:
+                print(f"✓ DDR: 0x{self.ddr['base']:08x} + {self.ddr['size'] >> 20}M ({self.ddr['instance']})")
+            self.lmb = xsa.local_memory()
+            if self.lmb:
+                print(f"✓ LMB: 0x{self.lmb['base']:08x} + {self.lmb['size'] // 1024}K "
+                      f"({', '.join(self.lmb['instances'])})")
+        
     def print_configuration(self):
         """Print the build configuration."""
         print(f"\n{'='*60}")
@@ -216,6 +334,13 @@ class VitisApplicationBuilder:
         print(f"CLI Core:      {self.cli_core_dir}")
         print(f"App Source:    {self.app_src_dir}")
         print(f"App Name:      {self.app_name}")
+        print(f"Profiling:     {'enabled' if self.enable_profiling else 'disabled'}")
+        print(f"Tracing:       {'enabled' if self.enable_trace else 'disabled'}")
+        print(f"LMB Placement: {self.lmb_profile if self.lmb_profile else 'default linker script'}")
+        print(f"Build Profile: {self.build_profile if self.build_profile else 'default flags'}")
+        print(f"XSA:           {self.xsa_path if self.xsa_path else 'not found'}")
+        print(f"CPU Flags:     {'from XSA' if self.xsa_isa else 'platform defaults'}")
+        print(f"Source Import: {self.import_mode}{', shared includes' if self.shared_includes else ''}")
         print(f"{'='*60}\n")
         
     def initialize_client(self):
@@ -280,80 +405,148 @@ class VitisApplicationBuilder:
             raise RuntimeError(f"Failed to create application component: {e}")
     
     def import_source_files(self):
-        """Import all required source files into the application."""
-        print(f"\nImporting source files...")
-        
-        import_tasks = [
-            {
-                'desc': 'CLI core headers',
-                'dest': 'src',
-                'src': os.path.join(self.cli_core_dir, 'include')
-            },
-            {
-                'desc': 'Platform adapter headers', 
-                'dest': 'src',
-                'src': os.path.join(self.cli_core_dir, 'platform_adapters', 'include')
-            },
-            {
-                'desc': 'Platform adapter sources',
-                'dest': 'src', 
-                'src': os.path.join(self.cli_core_dir, 'platform_adapters', 'src')
-            },
-            {
-                'desc': 'Application sources',
-                'dest': 'src',
-                'src': self.app_src_dir
-            }
-        ]
+        """
+        Put the CLI core, platform adapter and application sources into the component.
+
+        By default files are hardlinked (or reflinked, or copied) from the
+        content-addressed pool of source_import.py; --import_mode vitis keeps
+        Vitis' import_files. Either way the result is recorded in the
+        component's import manifest.
+        """
+        import source_import
+        print(f"\nImporting source files ({self.import_mode})...")
+        
+        import_tasks = source_import.import_tasks(self.cli_core_dir, self.app_src_dir)
+        component_dir = os.path.join(self.workspace_dir, self.app_name)
         
         try:
-            for task in import_tasks:
-                print(f"Importing {task['desc']}...")
-                print(f"  From: {task['src']}")
-                print(f"  To:   {task['dest']}")
-                
-                if not os.path.exists(task['src']):
-                    raise FileNotFoundError(f"Source directory not found: {task['src']}")
-                
-                self.app_comp.import_files(
-                    dest_dir_in_cmp=task['dest'],
-                    from_loc=task['src']
-                )
-                print(f"✓ Imported {task['desc']}")
+            pool = source_import.SourcePool(self.source_pool)
+            if self.import_mode == "vitis":
+                self.importer = source_import.SourceImporter(component_dir, import_tasks, pool)
+                for task in import_tasks:
+                    print(f"Importing {task['desc']}...")
+                    print(f"  From: {task['src']}")
+                    print(f"  To:   {task['dest']}")
+                    
+                    if not os.path.exists(task['src']):
+                        raise FileNotFoundError(f"Source directory not found: {task['src']}")
+                    
+                    self.app_comp.import_files(
+                        dest_dir_in_cmp=task['dest'],
+                        from_loc=task['src']
+                    )
+                    print(f"✓ Imported {task['desc']}")
+                self.importer.record_existing()
+            else:
+                self.importer = source_import.SourceImporter(
+                    component_dir, import_tasks, pool,
+                    method=self.import_mode, shared_includes=self.shared_includes)
+                self.importer.run()
             
         except Exception as e:
             raise RuntimeError(f"Failed to import source files: {e}")
     
     def list_imported_files(self):
-        """Verify imported files by checking the workspace directory structure."""
+        """Verify imported files against the import manifest (stats the listed files only)."""
+        import source_import
         print(f"\nVerifying imported files...")
         try:
-            app_dir = os.path.join(self.workspace_dir, self.app_name)
-            if os.path.exists(app_dir):
-                print(f"✓ Application directory: {app_dir}")
-                src_dir = os.path.join(app_dir, 'src')
-                if os.path.exists(src_dir):
-                    print(f"✓ Source directory structure:")
-                    for root, dirs, files in os.walk(src_dir):
-                        level = root.replace(src_dir, '').count(os.sep)
-                        indent = '  ' * level
-                        rel_path = os.path.relpath(root, src_dir)
-                        if rel_path == '.':
-                            print(f"{indent}src/")
-                        else:
-                            print(f"{indent}{rel_path}/")
-                        subindent = '  ' * (level + 1)
-                        for file in sorted(files):
-                            print(f"{subindent}{file}")
-                else:
-                    print(f"Warning: Source directory not found at {src_dir}")
-            else:
-                print(f"Warning: Application directory not found at {app_dir}")
+            component_dir = os.path.join(self.workspace_dir, self.app_name)
+            result = source_import.verify_component(component_dir)
+            if result is None:
+                print(f"Warning: No import manifest in {component_dir}")
+                return
+            count, methods, problems = result
+            for rel, problem in problems:
+                print(f"Warning: {rel}: {problem}")
+            detail = ", ".join(f"{n} {method}" for method, n in sorted(methods.items()))
+            if not problems:
+                print(f"✓ {count} imported files match the manifest ({detail})")
+            for directory in self.importer.include_directories():
+                print(f"✓ Shared include directory: {directory}")
                     
         except Exception as e:
             print(f"Warning: Could not verify application files: {e}")
             print("This is not critical - the build may still succeed.")
     
+    def configure_lmb_placement(self):
+        """Replace the default linker script with one that pins profiled hot functions into LMB BRAM."""
+        if not self.lmb_profile:
+            return
+        
+        print(f"\nPlanning LMB placement...")
+        try:
+            import lmb_placement
+            
+            if not self.lmb:
+                raise ValueError(f"no LMB in the address map of {self.xsa_path}" if self.xsa_path
+                                 else "no XSA to read the LMB range from")
+            map_file = lmb_placement.MapFile(self.lmb_map)
+            profile = lmb_placement.load_profile(self.lmb_profile, map_file)
+            reserve = self.lmb_reserve if self.lmb_reserve is not None else lmb_placement.DEFAULT_LMB_RESERVE
+            self.lmb_plan = lmb_placement.plan_placement(map_file, profile, self.lmb, reserve=reserve,
+                                                         ddr_slowdown=self.ddr_slowdown)
+            lmb_placement.print_plan(self.lmb_plan)
+            
+            lscript = os.path.join(self.workspace_dir, self.app_name, 'src', 'lscript.ld')
+            if not os.path.exists(lscript):
+                raise FileNotFoundError(f"Default linker script not found: {lscript}")
+            with open(lscript) as f:
+                default_text = f.read()
+            with open(lscript + '.default', 'w') as f:
+                f.write(default_text)
+            with open(lscript, 'w') as f:
+                f.write(lmb_placement.generate_linker_script(default_text, self.lmb_plan))
+            print(f"✓ Linker script updated: {lscript} (original kept as lscript.ld.default)")
+            
+            plan_path = os.path.join(self.workspace_dir, f"{self.app_name}_lmb_plan.json")
+            lmb_placement.save_plan(self.lmb_plan, plan_path)
+            print(f"✓ Placement plan written: {plan_path}")
+            
+        except Exception as e:
+            raise RuntimeError(f"Failed to configure LMB placement: {e}")
+    
+    def report_lmb_placement(self):
+        """Check the linked result against the LMB placement plan."""
+        if not self.lmb_plan:
+            return
+        
+        import lmb_placement
+        build_dir = os.path.join(self.workspace_dir, self.app_name, "build")
+        map_files = list(Path(build_dir).rglob("output.map")) if os.path.exists(build_dir) else []
+        if not map_files:
+            print(f"⚠️  No output.map found in {build_dir}; cannot verify LMB placement")
+            return
+        
+        achieved = lmb_placement.achieved_placement(lmb_placement.MapFile(str(map_files[0])), self.lmb_plan)
+        lmb_placement.print_achieved(self.lmb_plan, achieved)
+    
+    def derive_cpu_flags(self):
+        """Derive -march/-mabi and tuning flags from the microblaze_riscv_0 configuration in the XSA."""
+        if not self.xsa_isa:
+            return
+        
+        print(f"\nDeriving CPU flags from the hardware...")
+        import microblaze_isa
+        
+        if not self.xsa_path:
+            print(f"⚠️  No XSA found under {self.platform_dir}; keeping the platform's default -march/-mabi")
+            return
+        
+        try:
+            isa, gcc, notes = microblaze_isa.load_isa(self.xsa_path, compiler=self.toolchain_gcc)
+        except Exception as e:
+            raise RuntimeError(f"Failed to derive CPU flags from {self.xsa_path}: {e}")
+        
+        microblaze_isa.print_isa(isa)
+        for note in notes:
+            print(f"⚠️  {note}")
+        if gcc:
+            print(f"✓ CPU flags accepted by {gcc}")
+        else:
+            print(f"⚠️  No RISC-V GCC found (--toolchain_gcc); CPU flags not checked against the toolchain")
+        self.cpu_flags = microblaze_isa.arch_flags(isa)
+    
     def configure_build_settings(self):
         """Configure build settings and add version string as compiler define."""
         print(f"\nConfiguring build settings...")
@@ -364,33 +557,58 @@ class VitisApplicationBuilder:
             # Add user compiler defines
             version_define = f'VERSION_STRING=\\"{self.build_info["version_string"]}\\"\"'
             timestamp_define = f'TIMESTAMP_STRING=\\"{self.build_info["build_timestamp"]}\\"\"'
+            profiling_define = f'CLI_ENABLE_PROFILING={1 if self.enable_profiling else 0}'
+            trace_define = f'CLI_ENABLE_TRACE={1 if self.enable_trace else 0}'
+            hw_define = f'HW_FINGERPRINT_STRING=\\"{self.build_info["hw_fingerprint"]}\\"\"'
+            # Without an XSA the firmware falls back to xparameters.h
+            uart_define = f'UART_BAUD_RATE={self.build_info["uart_baud"]}' if self.uart_baud else None
+            cpu_clock_define = f'CPU_CLOCK_HZ={int(self.cpu_clock_hz)}' if self.cpu_clock_hz else None
+            memory_defines = [f'LMB_BASE_ADDR=0x{self.lmb["base"]:08x}', f'LMB_SIZE=0x{self.lmb["size"]:x}'] if self.lmb else []
+            memory_defines += [f'DDR_BASE_ADDR=0x{self.ddr["base"]:08x}', f'DDR_SIZE=0x{self.ddr["size"]:x}'] if self.ddr else []
+            memory_defines += [f'CPU_{cache}_BYTES={size}' for cache, size in self.cache_bytes.items()]
             try:
-                self.app_comp.append_app_config(key = 'USER_COMPILE_DEFINITIONS', values = [version_define, timestamp_define])
+                self.app_comp.append_app_config(key = 'USER_COMPILE_DEFINITIONS', values = [d for d in [version_define, timestamp_define, profiling_define, trace_define, hw_define, uart_define, cpu_clock_define] + memory_defines if d])
                 
                 
 
-                ## DEBUG ##
-                comp_other_flags = [
-                    "-fno-rtti",
-                    "-fno-exceptions",
-                    "-fno-threadsafe-statics",
-                    "-s",
-                    "-ffunction-sections",
-                    "-fdata-sections",
-                    "-Os",
-                ]
+                if self.build_profile:
+                    profile = load_build_profile(self.build_profile)
+                    comp_other_flags = list(profile["compile_flags"])
+                    link_other_flags = list(profile["link_flags"])
+                else:
+                    comp_other_flags = list(DEFAULT_COMPILE_FLAGS)
+                    link_other_flags = list(DEFAULT_LINK_FLAGS)
+                if MAP_FILE_FLAG not in link_other_flags:
+                    link_other_flags.insert(0, MAP_FILE_FLAG)
+                # CPU flags go first so an explicit -march/-mabi in a build profile still wins;
+                # the linker needs them too to pick the matching multilib
+                comp_other_flags = self.cpu_flags + comp_other_flags
+                link_other_flags = self.cpu_flags + link_other_flags
+                
+                include_dirs = self.importer.include_directories() if self.importer else []
+                if include_dirs:
+                    self.app_comp.append_app_config(key = 'USER_INCLUDE_DIRECTORIES', values = include_dirs)
+                
                 self.app_comp.set_app_config(key = 'USER_COMPILE_OTHER_FLAGS', values = " ".join(comp_other_flags))
-
-                link_other_flags = [
-                    "-Wl,-Map=output.map",
-                    "-Wl,--gc-sections",
-                ]
                 self.app_comp.set_app_config(key = 'USER_LINK_OTHER_FLAGS', values = " ".join(link_other_flags))
                 [print(n) for n in self.app_comp.get_app_config()]
 
                 print(f"✓ Added compiler defines: ")
                 print(f"     {version_define}")
                 print(f"     {timestamp_define}")
+                print(f"     {profiling_define}")
+                print(f"     {trace_define}")
+                print(f"     {hw_define}")
+                if uart_define:
+                    print(f"     {uart_define}")
+                if cpu_clock_define:
+                    print(f"     {cpu_clock_define}")
+                for define in memory_defines:
+                    print(f"     {define}")
+                if include_dirs:
+                    print(f"✓ Include directories: {' '.join(include_dirs)}")
+                print(f"✓ Compile flags: {' '.join(comp_other_flags)}")
+                print(f"✓ Link flags:    {' '.join(link_other_flags)}")
             except Exception as e:
                 print(f"Warning: Could not set compiler define via 'set_app_config': {e}")
 
@@ -399,9 +617,6 @@ class VitisApplicationBuilder:
             # Example: Set optimization level
             # self.app_comp.set_property("compiler.optimization", "-O2")
             
-            # Example: Set RISC-V architecture
-            # self.app_comp.set_property("compiler.arch", "rv32i")
-            
             print("✓ Build settings configured with version information")
             
         except Exception as e:
@@ -487,6 +702,8 @@ class VitisApplicationBuilder:
             self.create_application(platform_xpfm)
             self.import_source_files()
             self.list_imported_files()
+            self.configure_lmb_placement()
+            self.derive_cpu_flags()
             self.configure_build_settings()  # This now includes version define generation
             
             build_result = self.generate_and_build()
@@ -500,6 +717,7 @@ class VitisApplicationBuilder:
                 print(f"BUILD COMPLETED SUCCESSFULLY")
                 print(f"{'='*60}")
                 print(f"Version: {self.build_info['version_string']}")
+                self.report_lmb_placement()
                 
                 if output_files.get('elf'):
                     print(f"Output files:")
@@ -571,6 +789,82 @@ Example usage:
         required=True,
         help="Name of the application component to create"
     )
+    parser.add_argument(
+        "--disable_profiling",
+        action="store_true",
+        help="Build without the CLI 'time'/'repeat'/'stats' built-ins (CLI_ENABLE_PROFILING=0)"
+    )
+    parser.add_argument(
+        "--enable_trace",
+        action="store_true",
+        help="Record dispatch/handler/UART/task events for scripts/trace_reader.py (CLI_ENABLE_TRACE=1)"
+    )
+    parser.add_argument(
+        "--lmb_profile",
+        type=str,
+        default=None,
+        help="Function profile of a previous build (PC samples or trace_reader.py --profile JSON); pins the hottest functions into LMB BRAM"
+    )
+    parser.add_argument(
+        "--lmb_map",
+        type=str,
+        default=None,
+        help="Linker map (output.map) of the profiled build, required with --lmb_profile"
+    )
+    parser.add_argument(
+        "--lmb_reserve",
+        type=int,
+        default=None,
+        help="Bytes of LMB to leave free when placing functions (default 256)"
+    )
+    parser.add_argument(
+        "--ddr_slowdown",
+        type=float,
+        default=None,
+        help="How much slower code runs from DDR than from LMB, for the predicted runtime (e.g. from bench_lat)"
+    )
+    parser.add_argument(
+        "--build_profile",
+        type=str,
+        default=None,
+        help="JSON build profile with compile_flags/link_flags (e.g. from flag_autotuner.py) replacing the default flags"
+    )
+    parser.add_argument(
+        "--no_xsa_isa",
+        action="store_true",
+        help="Keep the platform's default -march/-mabi instead of deriving them from the microblaze_riscv_0 configuration"
+    )
+    parser.add_argument(
+        "--xsa",
+        type=str,
+        default=None,
+        help="XSA to validate and read the CPU configuration from (default: the one exported with the platform)"
+    )
+    parser.add_argument(
+        "--toolchain_gcc",
+        type=str,
+        default=None,
+        help="RISC-V GCC to check the derived CPU flags against (default: search PATH and XILINX_VITIS)"
+    )
+    parser.add_argument(
+        "--import_mode",
+        choices=["link", "reflink", "copy", "vitis"],
+        default="link",
+        help="How sources get into the component: from the source pool as hardlinks (falling back to "
+             "reflinks, then copies), as reflinks, as copies, or through Vitis' import_files. "
+             "Hardlinked sources (the 'link' default) are read-only pool objects; edit the originals"
+    )
+    parser.add_argument(
+        "--shared_includes",
+        action="store_true",
+        help="Reference the header-only CLI core and adapter include directories in place (USER_INCLUDE_DIRECTORIES) instead of importing them"
+    )
+    parser.add_argument(
+        "--source_pool",
+        type=str,
+        default=None,
+        help="Source pool directory (default: SOURCE_POOL_DIR or ~/.cache/microblaze_v_cli/source_pool)"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -585,7 +879,20 @@ Example usage:
         platform_dir=args.platform_dir,
         cli_core_dir=args.cli_core_dir,
         app_src_dir=args.app_src_dir,
-        app_name=args.app_name
+        app_name=args.app_name,
+        enable_profiling=not args.disable_profiling,
+        enable_trace=args.enable_trace,
+        lmb_profile=args.lmb_profile,
+        lmb_map=args.lmb_map,
+        lmb_reserve=args.lmb_reserve,
+        ddr_slowdown=args.ddr_slowdown,
+        build_profile=args.build_profile,
+        xsa_isa=not args.no_xsa_isa,
+        xsa_path=args.xsa,
+        toolchain_gcc=args.toolchain_gcc,
+        import_mode=args.import_mode,
+        shared_includes=args.shared_includes,
+        source_pool=args.source_pool
     )
     
     success, output_files = builder.build()
@@ -9,10 +9,14 @@ with a bitstream and downloading an ELF file to a RISC-V processor.
 
 import subprocess
 import sys
+import tempfile
 import time
 import os
 from pathlib import Path
 
+import repo_paths  # noqa: F401  (shared import path)
+import xsa_index
+
 class XSDBController:
     def __init__(self, xsdb_path="xsdb"):
         """
@@ -163,7 +167,11 @@ class XSDBController:
     def continue_execution(self):
         """Continue program execution."""
         return self.send_command("con")
-    
+
+    def stop_execution(self):
+        """Halt the selected processor."""
+        return self.send_command("stop")
+
     def check_target_state(self):
         """Check the current state of the target."""
         return self.send_command("state")
@@ -187,7 +195,81 @@ class XSDBController:
     def read_memory(self, address, size=1):
         """Read memory at specified address."""
         return self.send_command(f"mrd {address} {size}")
+
+    def read_memory_to_file(self, address, words, file_path, force=True, timeout=10):
+        """
+        Read a block of target memory into a binary file on the host.
+        
+        send_command() does not capture XSDB output, so bulk reads go through
+        'mrd -bin -file' and the result is picked up from disk.
+        
+        Args:
+            address (int): Start address
+            words (int): Number of 32-bit words to read
+            file_path (str): Destination file (overwritten)
+            force (bool): Read even if the target memory map does not list the address
+            timeout (float): Seconds to wait for the file to be written
+        
+        Returns:
+            bytes: Memory contents, or None if the read did not complete
+        """
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        
+        expected = words * 4
+        options = "-force -bin" if force else "-bin"
+        path = Path(file_path).as_posix()
+        self.send_command(f'mrd {options} -file "{path}" 0x{address:08x} {words}', wait_time=0.5)
+        
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if os.path.exists(file_path) and os.path.getsize(file_path) >= expected:
+                with open(file_path, "rb") as f:
+                    return f.read(expected)
+            time.sleep(0.2)
+        
+        print(f"Error: memory read of {expected} bytes at 0x{address:08x} timed out")
+        return None
     
+    def sample_program_counter(self, count, file_path, interval_ms=2, timeout=120):
+        """
+        Statistically sample the PC of the selected processor into a text file.
+
+        Runs a Tcl loop inside XSDB (stop, read pc, continue) so each sample
+        costs one JTAG round trip rather than one Python command.
+
+        Args:
+            count (int): Number of samples
+            file_path (str): Destination file, one hex PC per line (overwritten)
+            interval_ms (int): Delay between samples while the target runs
+            timeout (float): Seconds to wait for sampling to finish
+
+        Returns:
+            list: Sampled PC values, or None if sampling did not complete
+        """
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+        path = Path(file_path).as_posix()
+        partial = path + ".part"
+        self.send_command(
+            f'set f [open "{partial}" w]; '
+            f'for {{set i 0}} {{$i < {count}}} {{incr i}} '
+            f'{{ stop; puts $f [rrd -nv pc]; con; after {interval_ms} }}; '
+            f'close $f; file rename -force "{partial}" "{path}"',
+            wait_time=0.5
+        )
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if os.path.exists(file_path):
+                with open(file_path) as f:
+                    return [int(line, 16) for line in f if line.strip()]
+            time.sleep(0.5)
+
+        print(f"Error: PC sampling did not finish within {timeout} s")
+        return None
+
     def disconnect(self):
         """Disconnect from hardware server."""
         if self.connected:
@@ -203,13 +285,56 @@ class XSDBController:
             self.process = None
             print("XSDB session closed")
 
+def bitstream_from_xsa(xsa_file_path, dest_dir=None):
+    """
+    Stream the bitstream embedded in an XSA to a file xsdb can load.
+    
+    The file is keyed on the XSA hash and only rewritten when its content
+    differs, so programming the same hardware again costs no extraction.
+    
+    Args:
+        xsa_file_path (str): Path to .xsa file
+        dest_dir (str): Directory for the extracted bitstream (default: XSA index cache)
+    
+    Returns:
+        str: Path to the extracted .bit file
+    """
+    with xsa_index.XsaFile(xsa_file_path) as xsa:
+        problems = xsa.validate()
+        if problems:
+            raise ValueError(f"XSA {xsa_file_path} is not usable: {'; '.join(problems)}")
+        dest_dir = dest_dir or os.path.join(xsa.cache_dir, xsa.sha256()[:16])
+        bit_path, written = xsa.extract_bitstream(os.path.join(dest_dir, os.path.basename(xsa.bitstream_name())))
+    print(f"Bitstream {'extracted to' if written else 'up to date at'} {bit_path}")
+    return bit_path
+
+def check_bitstream_matches_xsa(bitfile_path, xsa_file_path):
+    """
+    Warn when a separately given bitstream was not built for the XSA's design.
+    
+    Returns:
+        bool: True if the bitstream matches the XSA (or cannot be compared)
+    """
+    with open(bitfile_path, "rb") as f:
+        try:
+            header = xsa_index.parse_bitstream_header(f.read(512))
+        except (ValueError, IndexError) as e:
+            print(f"Warning: cannot read .bit header of {bitfile_path}: {e}")
+            return True
+    with xsa_index.XsaFile(xsa_file_path) as xsa:
+        expected = xsa.bitstream_header() or {}
+    mismatches = [key for key in ("design", "part") if expected.get(key) and header.get(key) != expected.get(key)]
+    for key in mismatches:
+        print(f"Warning: bitstream {key} '{header.get(key)}' differs from the XSA's '{expected.get(key)}'")
+    return not mismatches
+
 def program_arty_s7_fpga(bitfile_path, elf_file_path, xsa_file_path=None, 
                         cable_serial=None, xsdb_path="xsdb", start_execution=True):
     """
     Complete function to program Arty S7-50 FPGA with bitstream and ELF file.
     
     Args:
-        bitfile_path (str): Path to .bit file
+        bitfile_path (str): Path to .bit file (None to use the one inside the XSA)
         elf_file_path (str): Path to .elf file  
         xsa_file_path (str): Path to .xsa hardware description file (optional)
         cable_serial (str): Serial number of JTAG cable (optional)
@@ -218,12 +343,18 @@ def program_arty_s7_fpga(bitfile_path, elf_file_path, xsa_file_path=None,
     """
     
     # Validate input files
+    if xsa_file_path and not os.path.exists(xsa_file_path):
+        raise FileNotFoundError(f"XSA file not found: {xsa_file_path}")
+    if bitfile_path is None:
+        if not xsa_file_path:
+            raise ValueError("Need a bitfile or an XSA to take the bitstream from")
+        bitfile_path = bitstream_from_xsa(xsa_file_path)
+    elif xsa_file_path and os.path.exists(bitfile_path):
+        check_bitstream_matches_xsa(bitfile_path, xsa_file_path)
     if not os.path.exists(bitfile_path):
         raise FileNotFoundError(f"Bitfile not found: {bitfile_path}")
     if not os.path.exists(elf_file_path):
         raise FileNotFoundError(f"ELF file not found: {elf_file_path}")
-    if xsa_file_path and not os.path.exists(xsa_file_path):
-        raise FileNotFoundError(f"XSA file not found: {xsa_file_path}")
     
     print("Starting FPGA programming sequence...")
     print(f"Bitfile: {bitfile_path}")
@@ -316,6 +447,65 @@ def program_arty_s7_fpga(bitfile_path, elf_file_path, xsa_file_path=None,
         xsdb.disconnect()
         xsdb.close_session()
 
+def download_elf_only(elf_file_path, xsa_file_path=None, cable_serial=None, xsdb_path="xsdb",
+                      hw_server_url="tcp:127.0.0.1:3121", timeout=60):
+    """
+    Replace the running application with a new ELF, leaving the FPGA configured.
+
+    For the edit/rebuild loop: no bitstream, no system reset and no fixed
+    waits. The commands run as one XSDB batch script, so the call returns as
+    soon as the processor is running the new image.
+
+    Args:
+        elf_file_path (str): Path to .elf file
+        xsa_file_path (str): Hardware description to load for the memory map (optional)
+        cable_serial (str): Serial number of JTAG cable (optional)
+        xsdb_path (str): Path to xsdb executable
+        hw_server_url (str): hw_server to connect to
+        timeout (float): Seconds to wait for XSDB
+
+    Returns:
+        bool: True if the ELF was downloaded and started
+    """
+    if not os.path.exists(elf_file_path):
+        raise FileNotFoundError(f"ELF file not found: {elf_file_path}")
+
+    processor_filter = 'name =~ "*Hart**#0"'
+    if cable_serial:
+        processor_filter += f' && jtag_cable_name =~ "*{cable_serial}"'
+    commands = [
+        f"connect -url {hw_server_url}",
+        f"targets -set -nocase -filter {{{processor_filter}}}",
+    ]
+    if xsa_file_path:
+        commands.append(f'loadhw -hw "{Path(xsa_file_path).as_posix()}" -regs')
+    commands += [
+        "catch {stop}",
+        "rst -processor",
+        f'dow "{Path(elf_file_path).as_posix()}"',
+        "con",
+        "disconnect",
+        'puts "DOWNLOAD_DONE"',
+    ]
+
+    with tempfile.NamedTemporaryFile("w", suffix=".tcl", delete=False) as script:
+        script.write("\n".join(commands) + "\n")
+    try:
+        result = subprocess.run([xsdb_path, script.name], capture_output=True, text=True, timeout=timeout)
+    except FileNotFoundError:
+        print(f"Error: XSDB executable not found at '{xsdb_path}'")
+        return False
+    except subprocess.TimeoutExpired:
+        print(f"Error: XSDB did not finish within {timeout} s")
+        return False
+    finally:
+        os.remove(script.name)
+
+    if result.returncode != 0 or "DOWNLOAD_DONE" not in result.stdout:
+        print(f"Error: ELF download failed: {(result.stderr or result.stdout).strip()}")
+        return False
+    return True
+
 def main():
     """Main function with example usage."""
     
@@ -2,6 +2,7 @@
 #include "app_context.h"
 #include "cli_io_interface.h"
 #include <stdio.h>
+#include <string.h>
 #include "xgpio.h"
 #include "xparameters.h"
 
@@ -28,7 +29,31 @@ namespace app_commands {
 		return;
 	}
 
-	const cli_core::CommandDefinition<AppContext> command_list[] = {
+	void show_tasks(int argc, char* const argv[], AppContext *ctx)
+	{
+		AppScheduler& sched = ctx->scheduler;
+
+		if (argc > 1 && strcmp(argv[1], "reset") == 0) {
+			sched.reset_stats();
+			ctx->uart.send_line("\r\nTask statistics cleared");
+			return;
+		}
+
+		ctx->uart.send_line("\r\nTasks (times in CPU cycles):");
+		for (size_t i = 0; i < sched.task_count(); i++) {
+			const cli_core::Task& task = sched.task(i);
+			uint32_t avg = task.stats.run_count ? (uint32_t)(task.stats.total_ticks / task.stats.run_count) : 0;
+			uint32_t total_ms = (uint32_t)(task.stats.total_ticks / (APP_CPU_CLOCK_HZ / 1000));
+			ctx->uart.send_fmt("  %s%s\r\n", task.name, task.enabled ? "" : " (disabled)");
+			ctx->uart.send_fmt("    period: %u  runs: %u  avg: %u  max: %u  total: %u ms\r\n",
+				task.period, task.stats.run_count, avg, task.stats.max_ticks, total_ms);
+		}
+		uint32_t overhead_ms = (uint32_t)(sched.overhead_ticks() / (APP_CPU_CLOCK_HZ / 1000));
+		ctx->uart.send_fmt("  scheduler overhead: %u ms\r\n", overhead_ms);
+	}
+
+	// Sorted by name at compile time so the engine can binary search it
+	constexpr auto command_table = cli_core::make_command_table<AppContext>({
 		CLI_REGISTER_COMMAND(
 			cmd_test_demo,
 			cmd_test_demo,
@@ -38,8 +63,16 @@ namespace app_commands {
 			toggle_led,
 			toggle_led,
 			"Toggles on-board LEDs"
+		),
+		CLI_REGISTER_COMMAND(
+			tasks,
+			show_tasks,
+			"Show cooperative task runtime statistics ('tasks reset' clears them)"
 		)
-	};
+	});
+	static_assert(command_table.has_unique_names(), "Duplicate command name in command_table");
 
-	const size_t command_count = sizeof(command_list) / sizeof(command_list[0]);
-}
+	const cli_core::CommandDefinition<AppContext>* const command_list = command_table.entries;
+	const size_t command_count = command_table.size();
+	const size_t command_rom_bytes = command_table.rom_bytes();
+}
\ No newline at end of file
@@ -8,10 +8,12 @@ namespace app_commands {
     // Command function declarations
     void cmd_test_demo(int argc, char* const argv[], AppContext* ctx);
     void toggle_led(int argc, char* const argv[], AppContext* ctx);
+    void show_tasks(int argc, char* const argv[], AppContext* ctx);
     // void help(int argc, char* const argv[], AppContext* ctx);
 
-    // Command registration array
-    extern const cli_core::CommandDefinition<AppContext> command_list[];
+    // Command registration table (sorted by name)
+    extern const cli_core::CommandDefinition<AppContext>* const command_list;
     extern const size_t command_count;
+    extern const size_t command_rom_bytes;    // Table plus name/help strings
 
 }
\ No newline at end of file
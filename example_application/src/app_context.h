@@ -1,9 +1,66 @@
 #pragma once
 
 #include "uart_cli_adapter.h"
+#include "cli_scheduler.h"
 #include "xgpio.h"
+#include "xparameters.h"
+
+// UART line rate: C_BAUDRATE of axi_uartlite_0, passed in by the application build from the XSA
+#ifndef UART_BAUD_RATE
+#if defined(XPAR_AXI_UARTLITE_0_BAUDRATE)
+#define UART_BAUD_RATE XPAR_AXI_UARTLITE_0_BAUDRATE
+#elif defined(XPAR_XUARTLITE_0_BAUDRATE)
+#define UART_BAUD_RATE XPAR_XUARTLITE_0_BAUDRATE
+#else
+#define UART_BAUD_RATE 0
+#endif
+#endif
+
+// LMB BRAM range: the LMB entries of the XSA address map, passed in by the application build
+#ifndef LMB_BASE_ADDR
+#if defined(XPAR_MICROBLAZE_RISCV_0_LOCAL_MEMORY_DLMB_BRAM_IF_CNTLR_BASEADDRESS)
+#define LMB_BASE_ADDR XPAR_MICROBLAZE_RISCV_0_LOCAL_MEMORY_DLMB_BRAM_IF_CNTLR_BASEADDRESS
+#define LMB_SIZE (XPAR_MICROBLAZE_RISCV_0_LOCAL_MEMORY_DLMB_BRAM_IF_CNTLR_HIGHADDRESS - LMB_BASE_ADDR + 1)
+#elif defined(XPAR_MICROBLAZE_RISCV_0_LOCAL_MEMORY_DLMB_BRAM_IF_CNTLR_BASEADDR)
+#define LMB_BASE_ADDR XPAR_MICROBLAZE_RISCV_0_LOCAL_MEMORY_DLMB_BRAM_IF_CNTLR_BASEADDR
+#define LMB_SIZE (XPAR_MICROBLAZE_RISCV_0_LOCAL_MEMORY_DLMB_BRAM_IF_CNTLR_HIGHADDR - LMB_BASE_ADDR + 1)
+#else
+#error "LMB range unknown: build with LMB_BASE_ADDR/LMB_SIZE or an xparameters.h that has the dlmb controller"
+#endif
+#endif
+
+// DDR range: the processor's largest AXI memory (the MIG) in the XSA, passed in by the application build
+#ifndef DDR_BASE_ADDR
+#if defined(XPAR_MIG_0_BASEADDRESS)
+#define DDR_BASE_ADDR XPAR_MIG_0_BASEADDRESS
+#define DDR_SIZE (XPAR_MIG_0_HIGHADDRESS - DDR_BASE_ADDR + 1)
+#elif defined(XPAR_MIG7SERIES_0_BASEADDR)
+#define DDR_BASE_ADDR XPAR_MIG7SERIES_0_BASEADDR
+#define DDR_SIZE (XPAR_MIG7SERIES_0_HIGHADDR - DDR_BASE_ADDR + 1)
+#else
+#error "DDR range unknown: build with DDR_BASE_ADDR/DDR_SIZE or an xparameters.h that has the MIG"
+#endif
+#endif
+
+// Core clock, used to convert cycle counts: the processor's clock in the XSA,
+// passed in by the application build
+#ifndef CPU_CLOCK_HZ
+#if defined(XPAR_CPU_CORE_CLOCK_FREQ_HZ)
+#define CPU_CLOCK_HZ XPAR_CPU_CORE_CLOCK_FREQ_HZ
+#else
+#error "Core clock unknown: build with CPU_CLOCK_HZ or an xparameters.h that has XPAR_CPU_CORE_CLOCK_FREQ_HZ"
+#endif
+#endif
+
+// Cooperative task table size
+constexpr size_t APP_MAX_TASKS = 8;
+constexpr uint32_t APP_CPU_CLOCK_HZ = CPU_CLOCK_HZ;
+constexpr uint32_t APP_UART_BAUD = UART_BAUD_RATE;
+
+using AppScheduler = cli_core::TaskScheduler<APP_MAX_TASKS>;
 
 struct AppContext {
     cli_core::UartCliAdapter& uart;
     XGpio& gpio;
-};
\ No newline at end of file
+    AppScheduler& scheduler;
+};
@@ -0,0 +1,597 @@
+#include "bench_commands.h"
+#include "app_context.h"
+#include "riscv_counters.h"
+#include <string.h>
+#include "xil_cache.h"
+#include "xparameters.h"
+
+/**
+ * Memory benchmarks for the LMB BRAM, the MIG DDR3 and the caches in front of it,
+ * plus a fixed integer workload (bench_cpu) for comparing compiler settings and
+ * UART throughput at the built baud rate (bench_uart).
+ *
+ * Every result is printed as one line of space-separated key=value pairs
+ * starting with "BENCH", e.g.
+ *   BENCH test=seq_read region=ddr bytes=1048576 cycles=123456 mbps=849.36
+ * so a host script can grep and parse the shell log directly.
+ */
+
+// DDR scratch window: top of the MIG range (DDR_BASE_ADDR/DDR_SIZE in app_context.h),
+// away from the program image, heap and stack
+#ifndef BENCH_DDR_SIZE
+#define BENCH_DDR_SIZE 0x04000000
+#endif
+#ifndef BENCH_DDR_BASE
+#define BENCH_DDR_BASE (DDR_BASE_ADDR + DDR_SIZE - BENCH_DDR_SIZE)
+#endif
+static_assert(BENCH_DDR_BASE >= DDR_BASE_ADDR && BENCH_DDR_SIZE <= DDR_SIZE &&
+			  BENCH_DDR_BASE - DDR_BASE_ADDR <= DDR_SIZE - BENCH_DDR_SIZE,
+			  "BENCH_DDR_BASE/BENCH_DDR_SIZE must lie inside the DDR range");
+
+// LMB BRAM address range (LMB_BASE_ADDR/LMB_SIZE in app_context.h)
+#ifndef BENCH_LMB_BASE
+#define BENCH_LMB_BASE LMB_BASE_ADDR
+#endif
+#ifndef BENCH_LMB_SIZE
+#define BENCH_LMB_SIZE LMB_SIZE
+#endif
+
+// Cache sizes: C_DCACHE_BYTE_SIZE / C_ICACHE_BYTE_SIZE of the processor, passed in by the
+// application build from the XSA (CPU_DCACHE_BYTES / CPU_ICACHE_BYTES) or from xparameters.h
+#ifndef BENCH_DCACHE_BYTES
+#if defined(CPU_DCACHE_BYTES)
+#define BENCH_DCACHE_BYTES CPU_DCACHE_BYTES
+#elif defined(XPAR_MICROBLAZE_RISCV_DCACHE_BYTE_SIZE)
+#define BENCH_DCACHE_BYTES XPAR_MICROBLAZE_RISCV_DCACHE_BYTE_SIZE
+#else
+#error "D-cache size unknown: build with CPU_DCACHE_BYTES or an xparameters.h that has XPAR_MICROBLAZE_RISCV_DCACHE_BYTE_SIZE"
+#endif
+#endif
+#ifndef BENCH_ICACHE_BYTES
+#if defined(CPU_ICACHE_BYTES)
+#define BENCH_ICACHE_BYTES CPU_ICACHE_BYTES
+#elif defined(XPAR_MICROBLAZE_RISCV_ICACHE_BYTE_SIZE)
+#define BENCH_ICACHE_BYTES XPAR_MICROBLAZE_RISCV_ICACHE_BYTE_SIZE
+#else
+#error "I-cache size unknown: build with CPU_ICACHE_BYTES or an xparameters.h that has XPAR_MICROBLAZE_RISCV_ICACHE_BYTE_SIZE"
+#endif
+#endif
+
+// LMB scratch buffer. Needs a linker script that maps .lmb_bss into LMB BRAM
+// (LMB placement builds generate one); the default Vitis script places it in
+// DDR and the lmb region is then skipped.
+#ifndef BENCH_LMB_SCRATCH_BYTES
+#define BENCH_LMB_SCRATCH_BYTES 4096
+#endif
+
+namespace bench_commands {
+
+	namespace {
+
+		constexpr uint32_t CACHE_LINE_BYTES = 32;          // C_DCACHE_LINE_LEN = 8 words
+		constexpr uint32_t LATENCY_STEPS = 1u << 16;
+		constexpr uint32_t DEFAULT_BW_BYTES = 1u << 20;
+		constexpr uint32_t DEFAULT_DDR_TEST_BYTES = 1u << 20;
+		constexpr uint32_t DEFAULT_CPU_ITERATIONS = 100;
+		constexpr uint32_t CPU_CRC_BYTES = 1024;
+		constexpr uint32_t CPU_SORT_ELEMENTS = 64;
+		constexpr uint32_t DEFAULT_UART_BYTES = 16u << 10;
+		constexpr uint32_t UART_FIRST_BYTE_TIMEOUT_MS = 5000;
+		constexpr uint32_t UART_IDLE_TIMEOUT_MS = 500;
+
+		uint32_t lmb_scratch[BENCH_LMB_SCRATCH_BYTES / sizeof(uint32_t)]
+			__attribute__((section(".lmb_bss"), aligned(CACHE_LINE_BYTES)));
+
+		// Keeps benchmark reads from being optimized away
+		volatile uint32_t sink;
+
+		struct Region {
+			const char* name;
+			uint32_t* base;
+			uint32_t size;
+		};
+
+		bool find_region(const char* name, Region& region)
+		{
+			if (strcmp(name, "ddr") == 0) {
+				region = Region{"ddr", reinterpret_cast<uint32_t*>(BENCH_DDR_BASE), BENCH_DDR_SIZE};
+				return true;
+			}
+			if (strcmp(name, "lmb") == 0) {
+				// Unsigned offset: addresses below the LMB base wrap and fail the check too
+				uintptr_t offset = reinterpret_cast<uintptr_t>(lmb_scratch) - BENCH_LMB_BASE;
+				if (offset + sizeof(lmb_scratch) > BENCH_LMB_SIZE) {
+					return false;
+				}
+				region = Region{"lmb", lmb_scratch, sizeof(lmb_scratch)};
+				return true;
+			}
+			return false;
+		}
+
+		// Parse a decimal size with optional K/M suffix; returns 0 on error
+		uint32_t parse_size(const char* str)
+		{
+			uint32_t value = 0;
+			while (*str >= '0' && *str <= '9') {
+				value = value * 10 + static_cast<uint32_t>(*str++ - '0');
+			}
+			if (*str == 'k' || *str == 'K') {
+				value <<= 10;
+				str++;
+			} else if (*str == 'm' || *str == 'M') {
+				value <<= 20;
+				str++;
+			}
+			return *str == '\0' ? value : 0;
+		}
+
+		uint32_t round_down_pow2(uint32_t value)
+		{
+			uint32_t result = 1;
+			while (result <= value / 2) {
+				result <<= 1;
+			}
+			return result;
+		}
+
+		uint32_t next_random(uint32_t& state)
+		{
+			state = state * 1664525u + 1013904223u;
+			return state;
+		}
+
+		uint32_t clamp32(uint64_t value)
+		{
+			return value > UINT32_MAX ? UINT32_MAX : static_cast<uint32_t>(value);
+		}
+
+		void report_bandwidth(AppContext* ctx, const char* test, const char* region, uint32_t bytes, uint64_t cycles)
+		{
+			// MB/s (10^6 bytes) with two decimals
+			uint64_t mbps_x100 = cycles ? (static_cast<uint64_t>(bytes) * APP_CPU_CLOCK_HZ * 100) / (cycles * 1000000u) : 0;
+			ctx->uart.send_fmt("BENCH test=%s region=%s bytes=%u cycles=%u mbps=%u.%02u\r\n",
+				test, region, bytes, clamp32(cycles),
+				static_cast<uint32_t>(mbps_x100 / 100), static_cast<uint32_t>(mbps_x100 % 100));
+		}
+
+		// Bytes per second over 'cycles' CPU cycles
+		uint32_t bytes_per_second(uint32_t bytes, uint64_t cycles)
+		{
+			return cycles ? clamp32(static_cast<uint64_t>(bytes) * APP_CPU_CLOCK_HZ / cycles) : 0;
+		}
+
+		// Printable test pattern for bench_uart, so a terminal survives it
+		inline uint8_t uart_pattern(uint32_t index)
+		{
+			return static_cast<uint8_t>('!' + index % 94);
+		}
+
+		uint64_t run_seq_read(const uint32_t* buf, uint32_t words)
+		{
+			uint32_t sum = 0;
+			uint64_t start = cli_core::riscv::read_cycle();
+			for (uint32_t i = 0; i < words; i++) {
+				sum += buf[i];
+			}
+			uint64_t cycles = cli_core::riscv::read_cycle() - start;
+			sink = sum;
+			return cycles;
+		}
+
+		uint64_t run_seq_write(uint32_t* buf, uint32_t words)
+		{
+			volatile uint32_t* vbuf = buf;
+			uint64_t start = cli_core::riscv::read_cycle();
+			for (uint32_t i = 0; i < words; i++) {
+				vbuf[i] = i;
+			}
+			return cli_core::riscv::read_cycle() - start;
+		}
+
+		uint64_t run_copy(uint32_t* dst, const uint32_t* src, uint32_t words)
+		{
+			volatile uint32_t* vdst = dst;
+			uint64_t start = cli_core::riscv::read_cycle();
+			for (uint32_t i = 0; i < words; i++) {
+				vdst[i] = src[i];
+			}
+			return cli_core::riscv::read_cycle() - start;
+		}
+
+		uint64_t run_rand_read(const uint32_t* buf, uint32_t words)
+		{
+			uint32_t mask = words - 1;
+			uint32_t state = 1;
+			uint32_t sum = 0;
+			uint64_t start = cli_core::riscv::read_cycle();
+			for (uint32_t i = 0; i < words; i++) {
+				sum += buf[(next_random(state) >> 8) & mask];
+			}
+			uint64_t cycles = cli_core::riscv::read_cycle() - start;
+			sink = sum;
+			return cycles;
+		}
+
+		uint64_t run_rand_write(uint32_t* buf, uint32_t words)
+		{
+			volatile uint32_t* vbuf = buf;
+			uint32_t mask = words - 1;
+			uint32_t state = 1;
+			uint64_t start = cli_core::riscv::read_cycle();
+			for (uint32_t i = 0; i < words; i++) {
+				vbuf[(next_random(state) >> 8) & mask] = i;
+			}
+			return cli_core::riscv::read_cycle() - start;
+		}
+
+		// Bitwise CRC-32 (no table): branchy integer code, sensitive to -O level and unrolling
+		uint32_t crc32(const uint8_t* data, uint32_t len)
+		{
+			uint32_t crc = 0xFFFFFFFFu;
+			for (uint32_t i = 0; i < len; i++) {
+				crc ^= data[i];
+				for (int bit = 0; bit < 8; bit++) {
+					crc = (crc >> 1) ^ (0xEDB88320u & (0u - (crc & 1u)));
+				}
+			}
+			return ~crc;
+		}
+
+		void insertion_sort(uint32_t* values, uint32_t count)
+		{
+			for (uint32_t i = 1; i < count; i++) {
+				uint32_t value = values[i];
+				uint32_t j = i;
+				while (j > 0 && values[j - 1] > value) {
+					values[j] = values[j - 1];
+					j--;
+				}
+				values[j] = value;
+			}
+		}
+
+		// Link every cache line of the working set into one random cycle (Sattolo's algorithm)
+		uint32_t* build_chase(uint32_t* buf, uint32_t bytes)
+		{
+			const uint32_t stride = CACHE_LINE_BYTES / sizeof(uint32_t);
+			const uint32_t nodes = bytes / CACHE_LINE_BYTES;
+			uint32_t state = 12345;
+
+			for (uint32_t i = 0; i < nodes; i++) {
+				buf[i * stride] = i;
+			}
+			for (uint32_t i = nodes - 1; i > 0; i--) {
+				uint32_t j = (next_random(state) >> 8) % i;
+				uint32_t tmp = buf[i * stride];
+				buf[i * stride] = buf[j * stride];
+				buf[j * stride] = tmp;
+			}
+			for (uint32_t i = 0; i < nodes; i++) {
+				buf[i * stride] = static_cast<uint32_t>(reinterpret_cast<uintptr_t>(&buf[buf[i * stride] * stride]));
+			}
+			return buf;
+		}
+
+	}
+
+	void bench_bw(int argc, char* const argv[], AppContext *ctx)
+	{
+		Region region;
+		if (argc < 2 || !find_region(argv[1], region)) {
+			ctx->uart.send_line("\r\nUsage: bench_bw <ddr|lmb> [bytes[K|M]]");
+			ctx->uart.send_line("  (lmb needs .lmb_bss mapped into LMB BRAM by the linker script)");
+			return;
+		}
+
+		uint32_t bytes = argc > 2 ? parse_size(argv[2]) : DEFAULT_BW_BYTES;
+		// Copy uses both halves of the region
+		if (bytes == 0 || bytes > region.size / 2) {
+			bytes = region.size / 2;
+		}
+		bytes = round_down_pow2(bytes);
+		uint32_t words = bytes / sizeof(uint32_t);
+		uint32_t* buf = region.base;
+		uint32_t* dst = region.base + words;
+
+		ctx->uart.send_line("");
+		run_seq_write(buf, words);      // Warm-up and initialize
+		report_bandwidth(ctx, "seq_read", region.name, bytes, run_seq_read(buf, words));
+		report_bandwidth(ctx, "seq_write", region.name, bytes, run_seq_write(buf, words));
+		report_bandwidth(ctx, "copy", region.name, bytes, run_copy(dst, buf, words));
+		report_bandwidth(ctx, "rand_read", region.name, bytes, run_rand_read(buf, words));
+		report_bandwidth(ctx, "rand_write", region.name, bytes, run_rand_write(buf, words));
+	}
+
+	void bench_latency(int argc, char* const argv[], AppContext *ctx)
+	{
+		Region region;
+		if (argc < 2 || !find_region(argv[1], region)) {
+			ctx->uart.send_line("\r\nUsage: bench_lat <ddr|lmb> [max_bytes[K|M]]");
+			return;
+		}
+
+		uint32_t max_bytes = argc > 2 ? parse_size(argv[2]) : 1u << 20;
+		if (max_bytes == 0 || max_bytes > region.size) {
+			max_bytes = region.size;
+		}
+
+		ctx->uart.send_line("");
+		for (uint32_t ws = 1024; ws <= max_bytes; ws <<= 1) {
+			const uint32_t* p = build_chase(region.base, ws);
+
+			// Walk once to settle the caches, then time
+			for (uint32_t i = 0; i < ws / CACHE_LINE_BYTES; i++) {
+				p = reinterpret_cast<const uint32_t*>(static_cast<uintptr_t>(*p));
+			}
+			uint64_t start = cli_core::riscv::read_cycle();
+			for (uint32_t i = 0; i < LATENCY_STEPS; i++) {
+				p = reinterpret_cast<const uint32_t*>(static_cast<uintptr_t>(*p));
+			}
+			uint64_t cycles = cli_core::riscv::read_cycle() - start;
+			sink = static_cast<uint32_t>(reinterpret_cast<uintptr_t>(p));
+
+			uint32_t cpl_x100 = static_cast<uint32_t>((cycles * 100) / LATENCY_STEPS);
+			ctx->uart.send_fmt("BENCH test=latency region=%s bytes=%u steps=%u cycles=%u cycles_per_load=%u.%02u\r\n",
+				region.name, ws, LATENCY_STEPS, clamp32(cycles), cpl_x100 / 100, cpl_x100 % 100);
+		}
+	}
+
+	void bench_cache([[maybe_unused]] int argc, [[maybe_unused]] char* const argv[], AppContext *ctx)
+	{
+		Region region;
+		find_region("ddr", region);
+		uint32_t bytes = BENCH_DCACHE_BYTES;
+		uint32_t words = bytes / sizeof(uint32_t);
+		uint64_t start;
+
+		ctx->uart.send_line("");
+
+		// Full flush with every line dirty
+		run_seq_write(region.base, words);
+		start = cli_core::riscv::read_cycle();
+		Xil_DCacheFlush();
+		ctx->uart.send_fmt("BENCH test=dcache_flush_dirty bytes=%u cycles=%u\r\n",
+			bytes, clamp32(cli_core::riscv::read_cycle() - start));
+
+		// Full flush with nothing dirty
+		start = cli_core::riscv::read_cycle();
+		Xil_DCacheFlush();
+		ctx->uart.send_fmt("BENCH test=dcache_flush_clean bytes=%u cycles=%u\r\n",
+			bytes, clamp32(cli_core::riscv::read_cycle() - start));
+
+		// Range flush of a dirty working set
+		run_seq_write(region.base, words);
+		start = cli_core::riscv::read_cycle();
+		Xil_DCacheFlushRange(reinterpret_cast<UINTPTR>(region.base), bytes);
+		ctx->uart.send_fmt("BENCH test=dcache_flush_range bytes=%u cycles=%u\r\n",
+			bytes, clamp32(cli_core::riscv::read_cycle() - start));
+
+		start = cli_core::riscv::read_cycle();
+		Xil_DCacheInvalidateRange(reinterpret_cast<UINTPTR>(region.base), bytes);
+		ctx->uart.send_fmt("BENCH test=dcache_invalidate_range bytes=%u cycles=%u\r\n",
+			bytes, clamp32(cli_core::riscv::read_cycle() - start));
+
+		start = cli_core::riscv::read_cycle();
+		Xil_ICacheInvalidate();
+		ctx->uart.send_fmt("BENCH test=icache_invalidate bytes=%u cycles=%u\r\n",
+			BENCH_ICACHE_BYTES, clamp32(cli_core::riscv::read_cycle() - start));
+
+		// Cold vs warm read of the same working set
+		Xil_DCacheFlushRange(reinterpret_cast<UINTPTR>(region.base), bytes);
+		Xil_DCacheInvalidateRange(reinterpret_cast<UINTPTR>(region.base), bytes);
+		report_bandwidth(ctx, "read_cold", region.name, bytes, run_seq_read(region.base, words));
+		report_bandwidth(ctx, "read_warm", region.name, bytes, run_seq_read(region.base, words));
+	}
+
+	void bench_ddr_test(int argc, char* const argv[], AppContext *ctx)
+	{
+		Region region;
+		find_region("ddr", region);
+
+		uint32_t bytes = argc > 1 ? parse_size(argv[1]) : DEFAULT_DDR_TEST_BYTES;
+		if (bytes == 0 || bytes > region.size) {
+			bytes = region.size;
+		}
+		bytes = round_down_pow2(bytes);
+		uint32_t words = bytes / sizeof(uint32_t);
+		volatile uint32_t* mem = region.base;
+		UINTPTR base = reinterpret_cast<UINTPTR>(region.base);
+		uint32_t errors = 0;
+		uint32_t first_error = 0;
+
+		auto check = [&](uint32_t index, uint32_t expected) {
+			if (mem[index] != expected) {
+				if (errors++ == 0) {
+					first_error = static_cast<uint32_t>(base) + index * sizeof(uint32_t);
+				}
+			}
+		};
+
+		// Data bus: walking ones through the first word, forced out to DDR and back
+		for (uint32_t bit = 0; bit < 32; bit++) {
+			mem[0] = 1u << bit;
+			Xil_DCacheFlushRange(base, CACHE_LINE_BYTES);
+			Xil_DCacheInvalidateRange(base, CACHE_LINE_BYTES);
+			check(0, 1u << bit);
+		}
+
+		// Address bus: power-of-two offsets must not alias
+		for (uint32_t off = 1; off < words; off <<= 1) {
+			mem[off] = 0xAAAAAAAAu;
+		}
+		mem[0] = 0x55555555u;
+		Xil_DCacheFlush();
+		Xil_DCacheInvalidate();
+		for (uint32_t off = 1; off < words; off <<= 1) {
+			check(off, 0xAAAAAAAAu);
+		}
+		uint32_t bus_errors = errors;
+
+		// Fill with address-derived pattern and its inverse, timing write and verify
+		uint64_t write_cycles = 0;
+		uint64_t verify_cycles = 0;
+		for (uint32_t pass = 0; pass < 2; pass++) {
+			uint32_t invert = pass ? 0xFFFFFFFFu : 0;
+			uint64_t start = cli_core::riscv::read_cycle();
+			for (uint32_t i = 0; i < words; i++) {
+				mem[i] = (i * 0x9E3779B9u) ^ invert;
+			}
+			Xil_DCacheFlushRange(base, bytes);
+			write_cycles += cli_core::riscv::read_cycle() - start;
+
+			Xil_DCacheInvalidateRange(base, bytes);
+			start = cli_core::riscv::read_cycle();
+			for (uint32_t i = 0; i < words; i++) {
+				check(i, (i * 0x9E3779B9u) ^ invert);
+			}
+			verify_cycles += cli_core::riscv::read_cycle() - start;
+		}
+
+		ctx->uart.send_line("");
+		report_bandwidth(ctx, "ddr_pattern_write", region.name, bytes * 2, write_cycles);
+		report_bandwidth(ctx, "ddr_pattern_verify", region.name, bytes * 2, verify_cycles);
+		ctx->uart.send_fmt("BENCH test=ddr_pattern region=%s bytes=%u bus_errors=%u errors=%u first_error=0x%08x result=%s\r\n",
+			region.name, bytes, bus_errors, errors, first_error, errors ? "FAIL" : "PASS");
+	}
+
+	void bench_uart(int argc, char* const argv[], AppContext *ctx)
+	{
+		bool transmit = argc > 1 && strcmp(argv[1], "tx") == 0;
+		if (argc < 2 || (!transmit && strcmp(argv[1], "rx") != 0)) {
+			ctx->uart.send_line("\r\nUsage: bench_uart <tx|rx> [bytes[K|M]]");
+			ctx->uart.send_line("  (the host side is scripts/uart_baud.py report)");
+			return;
+		}
+		uint32_t bytes = argc > 2 ? parse_size(argv[2]) : DEFAULT_UART_BYTES;
+		if (bytes == 0) {
+			bytes = DEFAULT_UART_BYTES;
+		}
+
+		if (transmit) {
+			// Pattern between two marker lines; the host times it on its side of the wire
+			ctx->uart.send_fmt("\r\nBENCH_DATA bytes=%u\r\n", bytes);
+			uint64_t start = cli_core::riscv::read_cycle();
+			for (uint32_t i = 0; i < bytes; i++) {
+				ctx->uart.send_byte(uart_pattern(i));
+			}
+			ctx->uart.flush();
+			uint64_t cycles = cli_core::riscv::read_cycle() - start;
+			ctx->uart.send_fmt("\r\nBENCH test=uart_tx baud=%u bytes=%u cycles=%u bps=%u\r\n",
+				APP_UART_BAUD, bytes, clamp32(cycles), bytes_per_second(bytes, cycles));
+			return;
+		}
+
+		// Receive: count bytes and pattern mismatches until 'bytes' arrived or the line goes idle
+		ctx->uart.send_fmt("\r\nBENCH_READY bytes=%u\r\n", bytes);
+		ctx->uart.flush();
+		uint32_t received = 0;
+		uint32_t errors = 0;
+		uint64_t first = 0;
+		uint64_t last = 0;
+		uint64_t wait_start = cli_core::riscv::read_cycle();
+		uint64_t timeout = static_cast<uint64_t>(UART_FIRST_BYTE_TIMEOUT_MS) * (APP_CPU_CLOCK_HZ / 1000);
+		while (received < bytes) {
+			uint8_t byte;
+			if (!ctx->uart.try_get_byte(byte)) {
+				if (cli_core::riscv::read_cycle() - wait_start > timeout) {
+					break;
+				}
+				continue;
+			}
+			last = cli_core::riscv::read_cycle();
+			if (received == 0) {
+				first = last;
+			}
+			if (byte != uart_pattern(received)) {
+				errors++;
+			}
+			received++;
+			wait_start = last;
+			timeout = static_cast<uint64_t>(UART_IDLE_TIMEOUT_MS) * (APP_CPU_CLOCK_HZ / 1000);
+		}
+		uint64_t cycles = last - first;
+		ctx->uart.send_fmt("\r\nBENCH test=uart_rx baud=%u bytes=%u received=%u errors=%u cycles=%u bps=%u result=%s\r\n",
+			APP_UART_BAUD, bytes, received, errors, clamp32(cycles), bytes_per_second(received, cycles),
+			(received == bytes && errors == 0) ? "PASS" : "FAIL");
+	}
+
+	void bench_cpu(int argc, char* const argv[], AppContext *ctx)
+	{
+		static uint8_t crc_data[CPU_CRC_BYTES];
+		static const char* const size_strings[] = {"4096", "64K", "1M", "123456", "8k"};
+		uint32_t values[CPU_SORT_ELEMENTS];
+
+		uint32_t iterations = argc > 1 ? parse_size(argv[1]) : DEFAULT_CPU_ITERATIONS;
+		if (iterations == 0) {
+			iterations = DEFAULT_CPU_ITERATIONS;
+		}
+
+		uint32_t state = 1;
+		for (uint32_t i = 0; i < CPU_CRC_BYTES; i++) {
+			crc_data[i] = static_cast<uint8_t>(next_random(state) >> 24);
+		}
+
+		// Mixed integer workload: checksum, sort and string parsing
+		uint32_t check = 0;
+		cli_core::PerfSample start = cli_core::riscv::read_perf_sample();
+		for (uint32_t n = 0; n < iterations; n++) {
+			check ^= crc32(crc_data, CPU_CRC_BYTES);
+			state = n + 1;
+			for (uint32_t i = 0; i < CPU_SORT_ELEMENTS; i++) {
+				values[i] = next_random(state);
+			}
+			insertion_sort(values, CPU_SORT_ELEMENTS);
+			check += values[n % CPU_SORT_ELEMENTS];
+			for (const char* str : size_strings) {
+				check += parse_size(str);
+			}
+		}
+		cli_core::PerfSample end = cli_core::riscv::read_perf_sample();
+		sink = check;
+
+		uint64_t cycles = end.cycles - start.cycles;
+		ctx->uart.send_fmt("\r\nBENCH test=cpu iterations=%u cycles=%u instret=%u cycles_per_iter=%u check=0x%08x\r\n",
+			iterations, clamp32(cycles), clamp32(end.instret - start.instret),
+			clamp32(cycles / iterations), check);
+	}
+
+	// Sorted by name at compile time so the engine can binary search it
+	constexpr auto command_table = cli_core::make_command_table<AppContext>({
+		CLI_REGISTER_COMMAND(
+			bench_bw,
+			bench_bw,
+			"Sequential/random read, write and copy bandwidth: bench_bw <ddr|lmb> [bytes]"
+		),
+		CLI_REGISTER_COMMAND(
+			bench_lat,
+			bench_latency,
+			"Pointer-chase load latency across working sets: bench_lat <ddr|lmb> [max_bytes]"
+		),
+		CLI_REGISTER_COMMAND(
+			bench_cpu,
+			bench_cpu,
+			"CRC, sort and parsing workload for comparing builds: bench_cpu [iterations]"
+		),
+		CLI_REGISTER_COMMAND(
+			bench_cache,
+			bench_cache,
+			"Cache flush/invalidate cost and cold vs warm reads"
+		),
+		CLI_REGISTER_COMMAND(
+			bench_uart,
+			bench_uart,
+			"UART throughput and integrity at the built baud rate: bench_uart <tx|rx> [bytes]"
+		),
+		CLI_REGISTER_COMMAND(
+			bench_ddr,
+			bench_ddr_test,
+			"Fast DDR data/address bus and pattern test: bench_ddr [bytes]"
+		)
+	});
+	static_assert(command_table.has_unique_names(), "Duplicate command name in command_table");
+
+	const cli_core::CommandDefinition<AppContext>* const command_list = command_table.entries;
+	const size_t command_count = command_table.size();
+	const size_t command_rom_bytes = command_table.rom_bytes();
+}
@@ -0,0 +1,21 @@
+#pragma once
+
+#include "cli_types.h"
+#include "app_context.h"
+
+namespace bench_commands {
+
+    // Command function declarations
+    void bench_bw(int argc, char* const argv[], AppContext* ctx);
+    void bench_latency(int argc, char* const argv[], AppContext* ctx);
+    void bench_cache(int argc, char* const argv[], AppContext* ctx);
+    void bench_ddr_test(int argc, char* const argv[], AppContext* ctx);
+    void bench_cpu(int argc, char* const argv[], AppContext* ctx);
+    void bench_uart(int argc, char* const argv[], AppContext* ctx);
+
+    // Command registration table (sorted by name)
+    extern const cli_core::CommandDefinition<AppContext>* const command_list;
+    extern const size_t command_count;
+    extern const size_t command_rom_bytes;
+
+}
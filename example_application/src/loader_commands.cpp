@@ -0,0 +1,593 @@
+#include "loader_commands.h"
+#include "app_context.h"
+#include "riscv_counters.h"
+#include <string.h>
+#include "xil_cache.h"
+#include "xil_exception.h"
+#include "xparameters.h"
+
+/**
+ * UART image loader: replaces the running application without JTAG.
+ *
+ * 'load' prints one text line
+ *   LOADER READY version=1 baud=<rate> block=<bytes> window=<frames> staging=0x<addr> size=<bytes>
+ * and then speaks a framed binary protocol until the host commits or aborts:
+ *
+ *   frame    = sof u8 | type u8 | seq u16 | len u16 | payload[len] | crc32 u32
+ *   sof      = 0xA5 host to target, 0x5A target to host
+ *   crc32    = IEEE CRC-32 over type..payload, all fields little-endian
+ *
+ *   HELLO  01  version u8, block u16, window u8   -> 81: same fields as accepted, baud u32,
+ *                                                        staging base u32, staging size u32
+ *   CRC    02  addr u32, len u32, chunk u32        -> 82: addr u32, crc32 u32 per chunk
+ *   DATA   03  offset u32, bytes                   -> 83: status u8 (cumulative ack of seq)
+ *   COMMIT 04  entry u32, table offset u32, runs u32,
+ *              used u32, crc32 u32, flags u8       -> 84: status u8
+ *   ABORT  05                                      -> 85: status u8
+ *   NAK    7F  (target only) status u8; seq = next sequence number expected
+ *
+ * DATA frames are windowed: the host keeps up to 'window' frames in flight,
+ * the target acknowledges each in-order frame and answers a gap or a bad CRC
+ * with one NAK, after which the host resends from the NAK'd sequence number.
+ *
+ * The host writes the changed parts of the new image into a DDR staging area,
+ * followed by a run table of {dest, staging offset, bytes} entries. COMMIT
+ * checks the CRC of everything staged, then a position-independent trampoline
+ * copied behind the staged data moves the runs into place with interrupts and
+ * caches off, executes fence.i and jumps to the entry point. Runs only cover
+ * what differs from the live memory (see the CRC query), so unchanged code is
+ * never resent. The bitstream is untouched.
+ */
+
+// Staging area in DDR: below the bench scratch window (the top 64 MB), above any sane program image
+#ifndef LOADER_STAGING_SIZE
+#define LOADER_STAGING_SIZE 0x04000000
+#endif
+#ifndef LOADER_STAGING_BASE
+#define LOADER_STAGING_BASE (DDR_BASE_ADDR + DDR_SIZE - 0x04000000 - LOADER_STAGING_SIZE)
+#endif
+
+// Memory the new image may be loaded into (LMB BRAM and MIG DDR3)
+#ifndef LOADER_LMB_BASE
+#define LOADER_LMB_BASE LMB_BASE_ADDR
+#endif
+#ifndef LOADER_LMB_SIZE
+#define LOADER_LMB_SIZE LMB_SIZE
+#endif
+#ifndef LOADER_DDR_BASE
+#define LOADER_DDR_BASE DDR_BASE_ADDR
+#endif
+#ifndef LOADER_DDR_SIZE
+#define LOADER_DDR_SIZE DDR_SIZE
+#endif
+static_assert(LOADER_STAGING_BASE >= DDR_BASE_ADDR && LOADER_STAGING_SIZE <= DDR_SIZE &&
+			  LOADER_STAGING_BASE - DDR_BASE_ADDR <= DDR_SIZE - LOADER_STAGING_SIZE,
+			  "LOADER_STAGING_BASE/LOADER_STAGING_SIZE must lie inside the DDR range");
+
+// Largest DATA payload and window the loader accepts
+#ifndef LOADER_MAX_BLOCK
+#define LOADER_MAX_BLOCK 2048
+#endif
+#ifndef LOADER_MAX_WINDOW
+#define LOADER_MAX_WINDOW 8
+#endif
+
+// Give up and return to the shell after this long without a frame
+#ifndef LOADER_IDLE_TIMEOUT_MS
+#define LOADER_IDLE_TIMEOUT_MS 5000
+#endif
+
+// Line rate reported to the host (C_BAUDRATE of axi_uartlite_0)
+#ifndef LOADER_UART_BAUD
+#define LOADER_UART_BAUD APP_UART_BAUD
+#endif
+
+// Copies the run table {dest, src, bytes} into place and jumps to the entry point.
+// Uses only registers and PC-relative branches, so it runs from wherever it is copied.
+extern "C" void loader_trampoline(const uint32_t* runs, uint32_t run_count, uint32_t entry);
+extern "C" const uint8_t loader_trampoline_end[];
+
+asm(R"(
+	.section .text.loader_trampoline,"ax",@progbits
+	.globl loader_trampoline
+	.globl loader_trampoline_end
+	.p2align 2
+loader_trampoline:
+	beqz a1, 4f
+1:	lw t0, 0(a0)
+	lw t1, 4(a0)
+	lw t2, 8(a0)
+	add t2, t1, t2
+2:	bgeu t1, t2, 3f
+	lw t3, 0(t1)
+	sw t3, 0(t0)
+	addi t1, t1, 4
+	addi t0, t0, 4
+	j 2b
+3:	addi a0, a0, 12
+	addi a1, a1, -1
+	bnez a1, 1b
+4:	fence
+	fence.i
+	jr a2
+loader_trampoline_end:
+	.text
+)");
+
+namespace loader_commands {
+
+	namespace {
+
+		constexpr uint8_t PROTOCOL_VERSION = 1;
+		constexpr uint8_t SOF_HOST = 0xA5;
+		constexpr uint8_t SOF_TARGET = 0x5A;
+		constexpr uint8_t RESPONSE_FLAG = 0x80;
+
+		enum FrameType : uint8_t {
+			FRAME_HELLO = 0x01,
+			FRAME_CRC = 0x02,
+			FRAME_DATA = 0x03,
+			FRAME_COMMIT = 0x04,
+			FRAME_ABORT = 0x05,
+			FRAME_NAK = 0x7F
+		};
+
+		enum Status : uint8_t {
+			STATUS_OK = 0,
+			STATUS_BAD_CRC = 1,
+			STATUS_BAD_SEQUENCE = 2,
+			STATUS_BAD_RANGE = 3,
+			STATUS_BAD_LENGTH = 4,
+			STATUS_VERIFY_FAILED = 5,
+			STATUS_BAD_TYPE = 6
+		};
+
+		constexpr uint8_t COMMIT_FLAG_JUMP = 0x01;
+		constexpr uint32_t DEFAULT_BLOCK = 1024;
+		constexpr uint32_t DEFAULT_WINDOW = 4;
+		constexpr uint32_t HEADER_BYTES = 5;          // type, seq, len
+		constexpr uint32_t DATA_HEADER_BYTES = 4;     // staging offset
+		constexpr uint32_t RUN_BYTES = 12;
+		constexpr uint32_t BYTE_TIMEOUT_MS = 100;
+		constexpr uint32_t CYCLES_PER_MS = APP_CPU_CLOCK_HZ / 1000;
+
+		// One UART character (start + 8 data + stop) in CPU cycles; a millisecond if the rate is unknown
+		constexpr uint32_t char_cycles()
+		{
+			return LOADER_UART_BAUD ? (APP_CPU_CLOCK_HZ / (LOADER_UART_BAUD ? LOADER_UART_BAUD : 1)) * 10 : CYCLES_PER_MS;
+		}
+
+		// Trampoline code goes behind the staged data, cache line aligned
+		constexpr uint32_t TRAMPOLINE_ALIGN = 32;
+		constexpr uint32_t TRAMPOLINE_RESERVE = 256;
+
+		static_assert(LOADER_MAX_BLOCK >= 64 && LOADER_MAX_BLOCK <= 0xFFFF - DATA_HEADER_BYTES, "LOADER_MAX_BLOCK out of range");
+		static_assert(LOADER_MAX_WINDOW >= 1 && LOADER_MAX_WINDOW <= 255, "LOADER_MAX_WINDOW out of range");
+
+		// Frame payload, big enough for a full DATA block
+		uint8_t frame_payload[LOADER_MAX_BLOCK + DATA_HEADER_BYTES];
+
+		// CRC-32 (IEEE 802.3, reflected) with a 16-entry table: two lookups per byte
+		constexpr uint32_t CRC_NIBBLE_TABLE[16] = {
+			0x00000000, 0x1DB71064, 0x3B6E20C8, 0x26D930AC, 0x76DC4190, 0x6B6B51F4, 0x4DB26158, 0x5005713C,
+			0xEDB88320, 0xF00F9344, 0xD6D6A3E8, 0xCB61B38C, 0x9B64C2B0, 0x86D3D2D4, 0xA00AE278, 0xBDBDF21C
+		};
+
+		inline uint32_t crc32_update(uint32_t crc, uint8_t byte)
+		{
+			crc ^= byte;
+			crc = (crc >> 4) ^ CRC_NIBBLE_TABLE[crc & 0x0F];
+			crc = (crc >> 4) ^ CRC_NIBBLE_TABLE[crc & 0x0F];
+			return crc;
+		}
+
+		uint32_t crc32(const uint8_t* data, uint32_t len)
+		{
+			uint32_t crc = 0xFFFFFFFFu;
+			for (uint32_t i = 0; i < len; i++) {
+				crc = crc32_update(crc, data[i]);
+			}
+			return ~crc;
+		}
+
+		inline uint32_t get_u32(const uint8_t* p)
+		{
+			return static_cast<uint32_t>(p[0]) | (static_cast<uint32_t>(p[1]) << 8) |
+				(static_cast<uint32_t>(p[2]) << 16) | (static_cast<uint32_t>(p[3]) << 24);
+		}
+
+		inline void put_u32(uint8_t* p, uint32_t value)
+		{
+			p[0] = static_cast<uint8_t>(value);
+			p[1] = static_cast<uint8_t>(value >> 8);
+			p[2] = static_cast<uint8_t>(value >> 16);
+			p[3] = static_cast<uint8_t>(value >> 24);
+		}
+
+		// True if [addr, addr + len) lies inside [base, base + size), without overflow
+		inline bool inside(uint32_t addr, uint32_t len, uint32_t base, uint32_t size)
+		{
+			return addr - base <= size && len <= size - (addr - base);
+		}
+
+		inline bool overlaps(uint32_t addr, uint32_t len, uint32_t base, uint32_t size)
+		{
+			return addr < base + size && base < addr + len;
+		}
+
+		bool loadable(uint32_t addr, uint32_t len)
+		{
+			if (inside(addr, len, LOADER_LMB_BASE, LOADER_LMB_SIZE)) {
+				return true;
+			}
+			return inside(addr, len, LOADER_DDR_BASE, LOADER_DDR_SIZE) &&
+				!overlaps(addr, len, LOADER_STAGING_BASE, LOADER_STAGING_SIZE);
+		}
+
+		uint8_t* staging()
+		{
+			return reinterpret_cast<uint8_t*>(LOADER_STAGING_BASE);
+		}
+
+		struct Frame {
+			uint8_t type;
+			uint16_t seq;
+			uint16_t len;
+		};
+
+		enum class Receive { Frame, BadCrc, TooLong, Timeout };
+
+		class Loader {
+			public:
+				explicit Loader(AppContext* ctx) : ctx_(ctx) {}
+
+				// Runs the session; returns the reason it ended (only returns if no jump happened)
+				const char* run();
+
+			private:
+				bool read_byte(uint8_t& byte, uint32_t timeout_ms);
+				Receive receive(Frame& frame);
+				void send(uint8_t type, uint16_t seq, const uint8_t* payload, uint16_t len);
+				void send_status(uint8_t type, uint16_t seq, uint8_t status);
+				void nak(uint8_t status);
+
+				void handle_hello(const Frame& frame);
+				void handle_crc(const Frame& frame);
+				void handle_data(const Frame& frame);
+				const char* handle_commit(const Frame& frame);
+
+				[[noreturn]] void jump(uint32_t table_offset, uint32_t run_count, uint32_t used, uint32_t entry);
+
+				AppContext* ctx_;
+				uint32_t block_ = DEFAULT_BLOCK;
+				uint32_t window_ = DEFAULT_WINDOW;
+				uint16_t expected_seq_ = 0;
+				bool synced_ = false;       // HELLO seen
+				bool nak_pending_ = false;  // NAK sent, waiting for the resend
+		};
+
+		bool Loader::read_byte(uint8_t& byte, uint32_t timeout_ms)
+		{
+			uint32_t start = cli_core::riscv::read_cycle32();
+			uint32_t limit = timeout_ms * CYCLES_PER_MS;
+			while (!ctx_->uart.try_get_byte(byte)) {
+				if (cli_core::riscv::read_cycle32() - start > limit) {
+					return false;
+				}
+			}
+			return true;
+		}
+
+		Receive Loader::receive(Frame& frame)
+		{
+			uint8_t byte;
+			do {
+				if (!read_byte(byte, LOADER_IDLE_TIMEOUT_MS)) {
+					return Receive::Timeout;
+				}
+			} while (byte != SOF_HOST);
+
+			uint8_t header[HEADER_BYTES];
+			uint32_t crc = 0xFFFFFFFFu;
+			for (uint32_t i = 0; i < HEADER_BYTES; i++) {
+				if (!read_byte(header[i], BYTE_TIMEOUT_MS)) {
+					return Receive::BadCrc;
+				}
+				crc = crc32_update(crc, header[i]);
+			}
+			frame.type = header[0];
+			frame.seq = static_cast<uint16_t>(header[1] | (header[2] << 8));
+			frame.len = static_cast<uint16_t>(header[3] | (header[4] << 8));
+			if (frame.len > sizeof(frame_payload)) {
+				return Receive::TooLong;
+			}
+
+			for (uint32_t i = 0; i < frame.len; i++) {
+				if (!read_byte(frame_payload[i], BYTE_TIMEOUT_MS)) {
+					return Receive::BadCrc;
+				}
+				crc = crc32_update(crc, frame_payload[i]);
+			}
+			uint8_t trailer[4];
+			for (uint32_t i = 0; i < sizeof(trailer); i++) {
+				if (!read_byte(trailer[i], BYTE_TIMEOUT_MS)) {
+					return Receive::BadCrc;
+				}
+			}
+			return get_u32(trailer) == ~crc ? Receive::Frame : Receive::BadCrc;
+		}
+
+		void Loader::send(uint8_t type, uint16_t seq, const uint8_t* payload, uint16_t len)
+		{
+			uint8_t header[HEADER_BYTES] = {
+				type,
+				static_cast<uint8_t>(seq), static_cast<uint8_t>(seq >> 8),
+				static_cast<uint8_t>(len), static_cast<uint8_t>(len >> 8)
+			};
+			uint32_t crc = 0xFFFFFFFFu;
+			ctx_->uart.send_byte(SOF_TARGET);
+			for (uint32_t i = 0; i < HEADER_BYTES; i++) {
+				ctx_->uart.send_byte(header[i]);
+				crc = crc32_update(crc, header[i]);
+			}
+			for (uint32_t i = 0; i < len; i++) {
+				ctx_->uart.send_byte(payload[i]);
+				crc = crc32_update(crc, payload[i]);
+			}
+			uint8_t trailer[4];
+			put_u32(trailer, ~crc);
+			for (uint32_t i = 0; i < sizeof(trailer); i++) {
+				ctx_->uart.send_byte(trailer[i]);
+			}
+		}
+
+		void Loader::send_status(uint8_t type, uint16_t seq, uint8_t status)
+		{
+			send(type | RESPONSE_FLAG, seq, &status, 1);
+		}
+
+		// One NAK per gap: the host resends everything from expected_seq_ anyway
+		void Loader::nak(uint8_t status)
+		{
+			if (!nak_pending_) {
+				send(FRAME_NAK, expected_seq_, &status, 1);
+				nak_pending_ = true;
+			}
+		}
+
+		void Loader::handle_hello(const Frame& frame)
+		{
+			if (frame.len >= 4) {
+				uint32_t block = static_cast<uint32_t>(frame_payload[1] | (frame_payload[2] << 8));
+				uint32_t window = frame_payload[3];
+				block_ = block < 64 ? 64 : (block > LOADER_MAX_BLOCK ? LOADER_MAX_BLOCK : block);
+				window_ = window < 1 ? 1 : (window > LOADER_MAX_WINDOW ? LOADER_MAX_WINDOW : window);
+			}
+			uint8_t reply[16];
+			reply[0] = PROTOCOL_VERSION;
+			reply[1] = static_cast<uint8_t>(block_);
+			reply[2] = static_cast<uint8_t>(block_ >> 8);
+			reply[3] = static_cast<uint8_t>(window_);
+			put_u32(&reply[4], LOADER_UART_BAUD);
+			put_u32(&reply[8], LOADER_STAGING_BASE);
+			put_u32(&reply[12], LOADER_STAGING_SIZE);
+			send(FRAME_HELLO | RESPONSE_FLAG, frame.seq, reply, sizeof(reply));
+		}
+
+		void Loader::handle_crc(const Frame& frame)
+		{
+			if (frame.len < 12) {
+				send_status(frame.type, frame.seq, STATUS_BAD_LENGTH);
+				return;
+			}
+			uint32_t addr = get_u32(&frame_payload[0]);
+			uint32_t len = get_u32(&frame_payload[4]);
+			uint32_t chunk = get_u32(&frame_payload[8]);
+			uint32_t chunks = chunk ? (len + chunk - 1) / chunk : 0;
+			bool readable = inside(addr, len, LOADER_LMB_BASE, LOADER_LMB_SIZE) ||
+				inside(addr, len, LOADER_DDR_BASE, LOADER_DDR_SIZE);
+			if (!readable || chunks == 0 || 4 + chunks * 4 > block_) {
+				send_status(frame.type, frame.seq, STATUS_BAD_RANGE);
+				return;
+			}
+
+			// Reply built in place of the request
+			uint8_t* reply = frame_payload;
+			put_u32(&reply[0], addr);
+			for (uint32_t i = 0; i < chunks; i++) {
+				uint32_t offset = i * chunk;
+				uint32_t bytes = len - offset < chunk ? len - offset : chunk;
+				put_u32(&reply[4 + i * 4], crc32(reinterpret_cast<const uint8_t*>(addr + offset), bytes));
+			}
+			send(frame.type | RESPONSE_FLAG, frame.seq, reply, static_cast<uint16_t>(4 + chunks * 4));
+		}
+
+		void Loader::handle_data(const Frame& frame)
+		{
+			if (frame.len < DATA_HEADER_BYTES) {
+				send_status(frame.type, frame.seq, STATUS_BAD_LENGTH);
+				return;
+			}
+			uint32_t offset = get_u32(frame_payload);
+			uint32_t bytes = frame.len - DATA_HEADER_BYTES;
+			if (!inside(offset, bytes, 0, LOADER_STAGING_SIZE - TRAMPOLINE_RESERVE)) {
+				send_status(frame.type, frame.seq, STATUS_BAD_RANGE);
+				return;
+			}
+			memcpy(staging() + offset, frame_payload + DATA_HEADER_BYTES, bytes);
+			send_status(frame.type, frame.seq, STATUS_OK);
+		}
+
+		const char* Loader::handle_commit(const Frame& frame)
+		{
+			if (frame.len < 21) {
+				send_status(frame.type, frame.seq, STATUS_BAD_LENGTH);
+				return nullptr;
+			}
+			uint32_t entry = get_u32(&frame_payload[0]);
+			uint32_t table_offset = get_u32(&frame_payload[4]);
+			uint32_t run_count = get_u32(&frame_payload[8]);
+			uint32_t used = get_u32(&frame_payload[12]);
+			uint32_t expected_crc = get_u32(&frame_payload[16]);
+			uint8_t flags = frame_payload[20];
+
+			// Everything referenced must sit in the staged bytes, leaving room for the trampoline
+			bool valid = used <= LOADER_STAGING_SIZE - TRAMPOLINE_RESERVE &&
+				(table_offset & 3) == 0 && run_count <= used / RUN_BYTES &&
+				inside(table_offset, run_count * RUN_BYTES, 0, used) &&
+				loadable(entry, 4);
+			const uint8_t* table = staging() + table_offset;
+			for (uint32_t i = 0; valid && i < run_count; i++) {
+				uint32_t dest = get_u32(&table[i * RUN_BYTES]);
+				uint32_t src = get_u32(&table[i * RUN_BYTES + 4]);
+				uint32_t bytes = get_u32(&table[i * RUN_BYTES + 8]);
+				valid = ((dest | src | bytes) & 3) == 0 && inside(src, bytes, 0, used) && loadable(dest, bytes);
+			}
+			if (!valid) {
+				send_status(frame.type, frame.seq, STATUS_BAD_RANGE);
+				return "rejected";
+			}
+			if (crc32(staging(), used) != expected_crc) {
+				send_status(frame.type, frame.seq, STATUS_VERIFY_FAILED);
+				return "verify failed";
+			}
+			send_status(frame.type, frame.seq, STATUS_OK);
+			if (!(flags & COMMIT_FLAG_JUMP)) {
+				return "verified";
+			}
+			jump(table_offset, run_count, used, entry);
+		}
+
+		void Loader::jump(uint32_t table_offset, uint32_t run_count, uint32_t used, uint32_t entry)
+		{
+			// Let the COMMIT ack leave the UART: FIFO empty plus one character in the shift register
+			ctx_->uart.flush();
+			uint32_t start = cli_core::riscv::read_cycle32();
+			while (cli_core::riscv::read_cycle32() - start < 2 * char_cycles()) {
+				// Busy Wait
+			}
+
+			// Staging offsets in the run table become absolute addresses
+			uint32_t* runs = reinterpret_cast<uint32_t*>(staging() + table_offset);
+			for (uint32_t i = 0; i < run_count; i++) {
+				runs[i * 3 + 1] += LOADER_STAGING_BASE;
+			}
+
+			// Nothing of the old image may run once the copy starts: no interrupts, and
+			// memory written straight through so the trampoline sees staged bytes and the
+			// new code is fetched from DDR rather than a stale cache line
+			Xil_ExceptionDisable();
+			Xil_DCacheFlush();
+			Xil_DCacheDisable();
+			Xil_ICacheDisable();
+
+			uintptr_t trampoline_addr = (LOADER_STAGING_BASE + used + TRAMPOLINE_ALIGN - 1) & ~static_cast<uintptr_t>(TRAMPOLINE_ALIGN - 1);
+			const uint8_t* code = reinterpret_cast<const uint8_t*>(&loader_trampoline);
+			memcpy(reinterpret_cast<void*>(trampoline_addr), code, static_cast<size_t>(loader_trampoline_end - code));
+			asm volatile("fence.i" ::: "memory");
+
+			auto trampoline = reinterpret_cast<void (*)(const uint32_t*, uint32_t, uint32_t)>(trampoline_addr);
+			trampoline(runs, run_count, entry);
+			while (true) {
+				// Not reached
+			}
+		}
+
+		const char* Loader::run()
+		{
+			while (true) {
+				Frame frame;
+				Receive result = receive(frame);
+				if (result == Receive::Timeout) {
+					return "timeout";
+				}
+				if (result == Receive::BadCrc) {
+					nak(STATUS_BAD_CRC);
+					continue;
+				}
+				if (result == Receive::TooLong) {
+					nak(STATUS_BAD_LENGTH);
+					continue;
+				}
+
+				// HELLO (re)starts the sequence numbering
+				if (frame.type == FRAME_HELLO) {
+					handle_hello(frame);
+					expected_seq_ = static_cast<uint16_t>(frame.seq + 1);
+					synced_ = true;
+					nak_pending_ = false;
+					continue;
+				}
+				if (!synced_) {
+					continue;
+				}
+				if (frame.seq != expected_seq_) {
+					// Duplicate of something already handled: answer again (CRC queries are read-only,
+					// so they are simply repeated). Anything else means a lost frame.
+					uint16_t behind = static_cast<uint16_t>(expected_seq_ - frame.seq);
+					if (behind <= window_ * 2) {
+						if (frame.type == FRAME_CRC) {
+							handle_crc(frame);
+						} else {
+							send_status(frame.type, frame.seq, STATUS_OK);
+						}
+					} else {
+						nak(STATUS_BAD_SEQUENCE);
+					}
+					continue;
+				}
+				expected_seq_++;
+				nak_pending_ = false;
+
+				switch (frame.type) {
+					case FRAME_CRC:
+						handle_crc(frame);
+						break;
+					case FRAME_DATA:
+						handle_data(frame);
+						break;
+					case FRAME_COMMIT: {
+						const char* reason = handle_commit(frame);
+						if (reason) {
+							return reason;
+						}
+						break;
+					}
+					case FRAME_ABORT:
+						send_status(frame.type, frame.seq, STATUS_OK);
+						return "aborted";
+					default:
+						send_status(frame.type, frame.seq, STATUS_BAD_TYPE);
+						break;
+				}
+			}
+		}
+
+	}
+
+	void load_image([[maybe_unused]] int argc, [[maybe_unused]] char* const argv[], AppContext* ctx)
+	{
+		ctx->uart.send_fmt("\r\nLOADER READY version=%u baud=%u block=%u window=%u staging=0x%08x size=%u\r\n",
+			PROTOCOL_VERSION, LOADER_UART_BAUD, LOADER_MAX_BLOCK, LOADER_MAX_WINDOW,
+			LOADER_STAGING_BASE, LOADER_STAGING_SIZE);
+		ctx->uart.flush();
+
+		Loader loader(ctx);
+		const char* reason = loader.run();
+		ctx->uart.send_fmt("\r\nLOADER EXIT %s\r\n", reason);
+	}
+
+	// Sorted by name at compile time so the engine can binary search it
+	constexpr auto command_table = cli_core::make_command_table<AppContext>({
+		CLI_REGISTER_COMMAND(
+			load,
+			load_image,
+			"Receive a new image over the UART and run it (host: scripts/uart_loader.py)"
+		)
+	});
+	static_assert(command_table.has_unique_names(), "Duplicate command name in command_table");
+
+	const cli_core::CommandDefinition<AppContext>* const command_list = command_table.entries;
+	const size_t command_count = command_table.size();
+	const size_t command_rom_bytes = command_table.rom_bytes();
+}
@@ -0,0 +1,16 @@
+#pragma once
+
+#include "cli_types.h"
+#include "app_context.h"
+
+namespace loader_commands {
+
+    // Command function declarations
+    void load_image(int argc, char* const argv[], AppContext* ctx);
+
+    // Command registration table (sorted by name)
+    extern const cli_core::CommandDefinition<AppContext>* const command_list;
+    extern const size_t command_count;
+    extern const size_t command_rom_bytes;
+
+}
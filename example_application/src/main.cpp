@@ -4,12 +4,20 @@
 
 #include <stdio.h>
 #include <xgpio.h>
+#include <xintc.h>
+#include <xil_exception.h>
+#include <xil_cache.h>
 #include "app_context.h"
 #include "app_commands.h"
+#include "bench_commands.h"
+#include "loader_commands.h"
 #include "xparameters.h"
 #include "uart_handler.h"
 #include "cli_engine.h"
+#include "cli_scheduler.h"
 #include "uart_cli_adapter.h"
+#include "riscv_counters.h"
+#include "cli_trace.h"
 
 #ifndef VERSION_STRING
 #define VERSION_STRING "dev"
@@ -17,6 +25,48 @@
 #ifndef TIMESTAMP_STRING
 #define TIMESTAMP_STRING "%Y-%m-%d %H:%M:%S UTC"
 #endif
+#ifndef HW_FINGERPRINT_STRING
+#define HW_FINGERPRINT_STRING "unknown"
+#endif
+
+// Interrupt-driven UART needs axi_uartlite_0/interrupt wired to the AXI INTC
+// (xlconcat In0). Older XSAs without that connection fall back to polling.
+#ifndef UART_USE_INTERRUPTS
+#if defined(XPAR_XUARTLITE_0_INTERRUPTS) && defined(XPAR_XINTC_0_BASEADDR)
+#define UART_USE_INTERRUPTS 1
+#else
+#define UART_USE_INTERRUPTS 0
+#endif
+#endif
+
+// Interrupt ID of the UART on the AXI INTC, from xparameters.h. SDT builds
+// encode it in the low 12 bits of XPAR_XUARTLITE_0_INTERRUPTS (XGet_IntrId()
+// in xinterrupt_wrap.h); classic BSPs name it XPAR_INTC_0_UARTLITE_0_VEC_ID.
+#if UART_USE_INTERRUPTS && !defined(UART_INTC_IRQ_ID)
+#if defined(XPAR_XUARTLITE_0_INTERRUPTS)
+#define UART_INTC_IRQ_ID (XPAR_XUARTLITE_0_INTERRUPTS & 0xFFF)
+#elif defined(XPAR_INTC_0_UARTLITE_0_VEC_ID)
+#define UART_INTC_IRQ_ID XPAR_INTC_0_UARTLITE_0_VEC_ID
+#else
+#error "UART_USE_INTERRUPTS is set but xparameters.h has no UART interrupt ID; define UART_INTC_IRQ_ID or build with UART_USE_INTERRUPTS=0"
+#endif
+#endif
+
+// Event trace buffer, read from the host with scripts/trace_reader.py
+CLI_TRACE_DEFINE_BUFFER();
+
+#if CLI_ENABLE_TRACE
+// The buffer is in cached DDR and the D-cache is write-back, while the JTAG
+// read sees memory only: write the buffer back periodically so 'make trace'
+// gets events at most this old
+#ifndef TRACE_FLUSH_PERIOD_MS
+#define TRACE_FLUSH_PERIOD_MS 100
+#endif
+
+static void flush_trace_task(void*) {
+    Xil_DCacheFlushRange(reinterpret_cast<UINTPTR>(&cli_trace_buffer), sizeof(cli_trace_buffer));
+}
+#endif
 
 // Application banner
 void show_banner(cli_core::CliIoInterface& io) {
@@ -30,7 +80,13 @@ void show_banner(cli_core::CliIoInterface& io) {
     io.send_line("    MicroBlaze V CLI");
     io.send_line("");
     io.send_fmt("Version:     %s\n\r", VERSION_STRING);
-    io.send_fmt("Build Time:  %s\n\n\r", TIMESTAMP_STRING);
+    io.send_fmt("Build Time:  %s\n\r", TIMESTAMP_STRING);
+    io.send_fmt("Hardware:    %s\n\r", HW_FINGERPRINT_STRING);
+    io.send_fmt("UART:        %u baud\n\r", (unsigned int)APP_UART_BAUD);
+    io.send_fmt("Commands:    %u (%u bytes ROM)\n\n\r",
+                (unsigned int)(app_commands::command_count + bench_commands::command_count + loader_commands::command_count),
+                (unsigned int)(app_commands::command_rom_bytes + bench_commands::command_rom_bytes +
+                               loader_commands::command_rom_bytes));
 }
 
 int main() {
@@ -40,11 +96,31 @@ int main() {
     static XGpio gpio;
     XGpio_Initialize(&gpio, XPAR_AXI_GPIO_0_BASEADDR);
 
+#if UART_USE_INTERRUPTS
+    // Route INTC interrupts to the core and switch the UART to ring-buffered I/O
+    static XIntc intc;
+    if (XIntc_Initialize(&intc, XPAR_XINTC_0_BASEADDR) == XST_SUCCESS &&
+        uart_h.enable_interrupts(intc, UART_INTC_IRQ_ID)) {
+        XIntc_Start(&intc, XIN_REAL_MODE);
+        Xil_ExceptionInit();
+        Xil_ExceptionRegisterHandler(XIL_EXCEPTION_ID_INT,
+                                     (Xil_ExceptionHandler)XIntc_InterruptHandler, &intc);
+        Xil_ExceptionEnable();
+    }
+#endif
+
     // Create CLI I/O adapter
     cli_core::UartCliAdapter uart(uart_h);
     
+#if CLI_ENABLE_TRACE
+    cli_core::trace::init(cli_core::riscv::read_cycle32, APP_CPU_CLOCK_HZ);
+#endif
+
+    // Create cooperative scheduler clocked by the core cycle counter
+    static AppScheduler scheduler(cli_core::riscv::read_cycle32);
+
     // Create application context
-    AppContext app_context{uart, gpio};
+    AppContext app_context{uart, gpio, scheduler};
     
     // Show application banner
     show_banner(uart);
@@ -52,9 +128,20 @@ int main() {
     // Create and configure CLI engine
     cli_core::CliEngine<AppContext> cli_engine(uart, app_context);
     cli_engine.register_commands(app_commands::command_list, app_commands::command_count);
+    cli_engine.register_commands(bench_commands::command_list, bench_commands::command_count);
+    cli_engine.register_commands(loader_commands::command_list, loader_commands::command_count);
+#if CLI_ENABLE_PROFILING
+    cli_engine.set_perf_counter(cli_core::riscv::read_perf_sample, APP_CPU_CLOCK_HZ);
+#endif
     
-    // Start CLI main loop
-    cli_engine.run();
+    // The shell is one background task; add periodic/background work alongside it
+    scheduler.add_task("cli", cli_core::CliEngine<AppContext>::poll_task, &cli_engine);
+#if CLI_ENABLE_TRACE
+    scheduler.add_task("trace_flush", flush_trace_task, nullptr, APP_CPU_CLOCK_HZ / 1000 * TRACE_FLUSH_PERIOD_MS);
+#endif
+
+    // Start scheduler main loop
+    scheduler.run();
     
     return 0;
 }
\ No newline at end of file
@@ -0,0 +1,56 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+
+/**
+ * Statically sized single-producer/single-consumer byte ring buffer.
+ * One side may run in interrupt context and the other in the main loop
+ * without locking: each index is only ever written by one side.
+ * Capacity must be a power of two; one slot is kept free to tell full from empty.
+ */
+template<size_t Capacity>
+class RingBuffer {
+    static_assert(Capacity >= 2 && (Capacity & (Capacity - 1)) == 0,
+                  "RingBuffer capacity must be a power of two");
+
+    public:
+        RingBuffer() : head_(0), tail_(0) {}
+
+        bool push(uint8_t byte) {
+            size_t head = head_;
+            size_t next = (head + 1) & MASK;
+            if (next == tail_) {
+                return false;   // Full
+            }
+            data_[head] = byte;
+            head_ = next;
+            return true;
+        }
+
+        bool pop(uint8_t& byte) {
+            size_t tail = tail_;
+            if (tail == head_) {
+                return false;   // Empty
+            }
+            byte = data_[tail];
+            tail_ = (tail + 1) & MASK;
+            return true;
+        }
+
+        bool empty() const { return head_ == tail_; }
+        bool full() const { return ((head_ + 1) & MASK) == tail_; }
+        size_t size() const { return (head_ - tail_) & MASK; }
+        size_t free_space() const { return (Capacity - 1) - size(); }
+        static constexpr size_t capacity() { return Capacity - 1; }
+
+        // Only safe when neither side is active (e.g. before interrupts are enabled)
+        void clear() { head_ = tail_ = 0; }
+
+    private:
+        static constexpr size_t MASK = Capacity - 1;
+
+        uint8_t data_[Capacity];
+        volatile size_t head_;  // Written by producer only
+        volatile size_t tail_;  // Written by consumer only
+};
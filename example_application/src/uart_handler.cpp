@@ -1,17 +1,43 @@
 #include "uart_handler.h"
 #include "xuartlite.h"
+#include "xuartlite_l.h"
+#include "xintc.h"
+#include "cli_trace.h"
 #include <cstdarg>
 
-UartHandler::UartHandler(uint32_t uart_base_addr) {
+UartHandler::UartHandler(uint32_t uart_base_addr)
+	: base_addr_(uart_base_addr), mode_(Mode::Polling), intc_(nullptr), irq_id_(0),
+	  tx_active_(false), stats_() {
 	XUartLite_Initialize(&uart_, uart_base_addr);
 }
 
+bool UartHandler::enable_interrupts(XIntc& intc, uint8_t irq_id) {
+    if (mode_ == Mode::Interrupt) {
+        return true;
+    }
+
+    // Start from empty FIFOs and buffers with the UART interrupt off
+    XUartLite_WriteReg(base_addr_, XUL_CONTROL_REG_OFFSET, XUL_CR_FIFO_RX_RESET | XUL_CR_FIFO_TX_RESET);
+    rx_buffer_.clear();
+    tx_buffer_.clear();
+    tx_active_ = false;
+
+    if (XIntc_Connect(&intc, irq_id, &UartHandler::interrupt_handler, this) != XST_SUCCESS) {
+        return false;
+    }
+
+    intc_ = &intc;
+    irq_id_ = irq_id;
+    mode_ = Mode::Interrupt;
+
+    XIntc_Enable(intc_, irq_id_);
+    XUartLite_EnableIntr(base_addr_);
+    return true;
+}
+
 void UartHandler::send_raw(const char* str) {
     for (const char* p = str; *p != '\0'; ++p) {
-        XUartLite_Send(&uart_, const_cast<uint8_t*>(reinterpret_cast<const uint8_t*>(p)), 1);
-        while (XUartLite_IsSending(&uart_)) {
-            // Busy Wait
-        }
+        send_byte_blocking(static_cast<uint8_t>(*p));
     }
 }
 
@@ -22,14 +48,179 @@ void UartHandler::send_line(const char* str) {
 
 uint8_t UartHandler::get_byte() {
     uint8_t byte = 0;
-    int received = 0;
+    if (try_get_byte(byte)) {
+        return byte;
+    }
+
     // Loop until we receive 1 byte
-    while (received != 1) {
-        received = XUartLite_Recv(&uart_, &byte, 1);
+    CLI_TRACE_BEGIN(TRACE_UART_RX_WAIT, 0);
+    while (!try_get_byte(byte)) {
+        // Busy Wait
     }
+    CLI_TRACE_END(TRACE_UART_RX_WAIT, 0);
     return byte;
 }
 
 void UartHandler::send_byte(uint8_t byte) {
-    XUartLite_Send(&uart_, &byte, 1);
-}
\ No newline at end of file
+    send_byte_blocking(byte);
+}
+
+bool UartHandler::try_get_byte(uint8_t& byte) {
+    if (mode_ == Mode::Interrupt) {
+        return rx_buffer_.pop(byte);
+    }
+
+    if (XUartLite_Recv(&uart_, &byte, 1) == 1) {
+        stats_.rx_bytes++;
+        return true;
+    }
+    return false;
+}
+
+size_t UartHandler::write(const uint8_t* data, size_t len) {
+    size_t queued = 0;
+
+    if (mode_ == Mode::Interrupt) {
+        while (queued < len && tx_buffer_.push(data[queued])) {
+            queued++;
+        }
+        stats_.tx_overruns += len - queued;
+        if (queued > 0) {
+            start_tx();
+        }
+        return queued;
+    }
+
+    // Polling mode: only fill what fits in the hardware FIFO right now
+    while (queued < len && !XUartLite_IsTransmitFull(base_addr_)) {
+        XUartLite_WriteReg(base_addr_, XUL_TX_FIFO_OFFSET, data[queued]);
+        queued++;
+    }
+    stats_.tx_bytes += queued;
+    return queued;
+}
+
+size_t UartHandler::rx_available() const {
+    if (mode_ == Mode::Interrupt) {
+        return rx_buffer_.size();
+    }
+    return XUartLite_IsReceiveEmpty(base_addr_) ? 0 : 1;
+}
+
+size_t UartHandler::tx_free() const {
+    if (mode_ == Mode::Interrupt) {
+        return tx_buffer_.free_space();
+    }
+    return XUartLite_IsTransmitFull(base_addr_) ? 0 : 1;
+}
+
+void UartHandler::flush() {
+    if (mode_ == Mode::Interrupt) {
+        while (tx_active_ || !tx_buffer_.empty()) {
+            // Busy Wait
+        }
+    }
+    while (!(XUartLite_GetStatusReg(base_addr_) & XUL_SR_TX_FIFO_EMPTY)) {
+        // Busy Wait
+    }
+}
+
+void UartHandler::reset_stats() {
+    mask_irq();
+    stats_ = Stats();
+    unmask_irq();
+}
+
+void UartHandler::interrupt_handler(void* instance) {
+    static_cast<UartHandler*>(instance)->handle_interrupt();
+}
+
+void UartHandler::handle_interrupt() {
+    // UARTLite raises one interrupt for both "RX data present" and "TX FIFO
+    // emptied"; service both every time
+    drain_rx_fifo();
+    if (tx_active_) {
+        fill_tx_fifo();
+    }
+}
+
+void UartHandler::send_byte_blocking(uint8_t byte) {
+    if (mode_ == Mode::Interrupt) {
+        if (!tx_buffer_.push(byte)) {
+            CLI_TRACE_BEGIN(TRACE_UART_TX_WAIT, tx_buffer_.size());
+            while (!tx_buffer_.push(byte)) {
+                // Ring full: wait for the ISR to make room
+                start_tx();
+            }
+            CLI_TRACE_END(TRACE_UART_TX_WAIT, 0);
+        }
+        start_tx();
+        return;
+    }
+
+    if (XUartLite_IsTransmitFull(base_addr_)) {
+        CLI_TRACE_BEGIN(TRACE_UART_TX_WAIT, 0);
+        while (XUartLite_IsTransmitFull(base_addr_)) {
+            // Busy Wait
+        }
+        CLI_TRACE_END(TRACE_UART_TX_WAIT, 0);
+    }
+    XUartLite_WriteReg(base_addr_, XUL_TX_FIFO_OFFSET, byte);
+    stats_.tx_bytes++;
+}
+
+void UartHandler::start_tx() {
+    // Prime the FIFO if the ISR is not already feeding it. Masked so the
+    // ISR cannot clear tx_active_ between the check and the refill.
+    mask_irq();
+    if (!tx_active_) {
+        fill_tx_fifo();
+    }
+    unmask_irq();
+}
+
+void UartHandler::fill_tx_fifo() {
+    uint8_t byte;
+    bool sent = false;
+    while (!XUartLite_IsTransmitFull(base_addr_) && tx_buffer_.pop(byte)) {
+        XUartLite_WriteReg(base_addr_, XUL_TX_FIFO_OFFSET, byte);
+        stats_.tx_bytes++;
+        sent = true;
+    }
+    // Another TX-empty interrupt only arrives if we wrote something
+    tx_active_ = sent;
+}
+
+void UartHandler::drain_rx_fifo() {
+    while (true) {
+        // Error bits are cleared by reading the status register
+        uint32_t status = XUartLite_GetStatusReg(base_addr_);
+        if (status & XUL_SR_OVERRUN_ERROR) stats_.rx_fifo_overruns++;
+        if (status & XUL_SR_FRAMING_ERROR) stats_.framing_errors++;
+        if (status & XUL_SR_PARITY_ERROR) stats_.parity_errors++;
+
+        if (!(status & XUL_SR_RX_FIFO_VALID_DATA)) {
+            break;
+        }
+
+        uint8_t byte = static_cast<uint8_t>(XUartLite_ReadReg(base_addr_, XUL_RX_FIFO_OFFSET));
+        if (rx_buffer_.push(byte)) {
+            stats_.rx_bytes++;
+        } else {
+            stats_.rx_overruns++;
+        }
+    }
+}
+
+void UartHandler::mask_irq() {
+    // Masking at the INTC keeps the edge latched, so no TX-empty event is lost
+    if (intc_) {
+        XIntc_Disable(intc_, irq_id_);
+    }
+}
+
+void UartHandler::unmask_irq() {
+    if (intc_) {
+        XIntc_Enable(intc_, irq_id_);
+    }
+}
@@ -1,19 +1,91 @@
 #pragma once
 
 #include "xuartlite.h"
+#include "xintc.h"
+#include "ring_buffer.h"
 
+// Ring buffer sizes for interrupt mode (must be powers of two)
+#ifndef UART_RX_BUFFER_SIZE
+#define UART_RX_BUFFER_SIZE 512
+#endif
+#ifndef UART_TX_BUFFER_SIZE
+#define UART_TX_BUFFER_SIZE 1024
+#endif
+
+/**
+ * AXI UARTLite handler.
+ *
+ * Starts in polling mode (busy-waits on the FIFOs). Calling enable_interrupts()
+ * switches to interrupt-driven mode: the ISR drains the 16-byte RX FIFO into a
+ * software ring buffer and refills the TX FIFO from a second ring buffer, so the
+ * core only touches the UART when there is work to do.
+ *
+ * All hardware access goes through the XUartLite/XIntc driver API, so the class
+ * can be built on a host against the mock driver headers in test/host/mock and
+ * driven by calling handle_interrupt() directly ('make host-test').
+ */
 class UartHandler {
     public:
-    
+        enum class Mode { Polling, Interrupt };
+
+        // Error/overrun counters, readable at any time
+        struct Stats {
+            uint32_t rx_bytes;
+            uint32_t tx_bytes;
+            uint32_t rx_overruns;       // Bytes dropped because the RX ring was full
+            uint32_t rx_fifo_overruns;  // Hardware RX FIFO overrun (ISR too late)
+            uint32_t tx_overruns;       // Bytes rejected by write() because the TX ring was full
+            uint32_t framing_errors;
+            uint32_t parity_errors;
+        };
+
         UartHandler(uint32_t uart_base_addr);
 
+        /**
+         * Switch to interrupt-driven mode
+         * @param intc Initialized interrupt controller instance
+         * @param irq_id Interrupt ID of the UART on the controller
+         * @return true on success, false if the interrupt could not be connected
+         */
+        bool enable_interrupts(XIntc& intc, uint8_t irq_id);
+
         void send_raw(const char* str);      // Send a raw string without a newline
         void send_line(const char* str);     // Send a string followed by CRLF
         void send_byte(uint8_t byte);        // Send a single byte
 
-        uint8_t get_byte();
-        
+        uint8_t get_byte();                  // Blocking receive
+
+        // Non-blocking API
+        bool try_get_byte(uint8_t& byte);               // true if a byte was available
+        size_t write(const uint8_t* data, size_t len);  // Returns number of bytes queued
+        size_t rx_available() const;
+        size_t tx_free() const;
+        void flush();                                   // Wait until all queued TX data is sent
+
+        Mode mode() const { return mode_; }
+        Stats stats() const { return stats_; }
+        void reset_stats();
+
+        // Interrupt service routine (XInterruptHandler signature)
+        static void interrupt_handler(void* instance);
+        void handle_interrupt();
+
+    private:
+        void send_byte_blocking(uint8_t byte);
+        void start_tx();
+        void fill_tx_fifo();
+        void drain_rx_fifo();
+        void mask_irq();
+        void unmask_irq();
 
-    private: 
         XUartLite uart_;
-};
\ No newline at end of file
+        uint32_t base_addr_;
+        Mode mode_;
+        XIntc* intc_;
+        uint8_t irq_id_;
+        volatile bool tx_active_;   // TX FIFO is being refilled from the ISR
+        Stats stats_;
+
+        RingBuffer<UART_RX_BUFFER_SIZE> rx_buffer_;
+        RingBuffer<UART_TX_BUFFER_SIZE> tx_buffer_;
+};
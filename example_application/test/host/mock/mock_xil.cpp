@@ -0,0 +1,133 @@
+/**
+ * mock_xil.cpp: host implementation of the XUartLite/XIntc mocks.
+ */
+
+#include "mock_xil.h"
+#include "xintc.h"
+#include "xuartlite.h"
+
+MockUartLite mock_uart;
+
+void mock_uart_reset() {
+    mock_uart = MockUartLite();
+}
+
+void mock_uart_receive(const uint8_t* data, size_t len) {
+    for (size_t i = 0; i < len; ++i) {
+        if (mock_uart.rx_fifo.size() < MOCK_UARTLITE_FIFO_DEPTH) {
+            mock_uart.rx_fifo.push_back(data[i]);
+        } else {
+            mock_uart.status_errors |= XUL_SR_OVERRUN_ERROR;
+        }
+    }
+}
+
+void mock_uart_transmit() {
+    mock_uart.line.insert(mock_uart.line.end(), mock_uart.tx_fifo.begin(), mock_uart.tx_fifo.end());
+    mock_uart.tx_fifo.clear();
+}
+
+uint32_t mock_uartlite_read_reg(uint32_t, uint32_t offset) {
+    switch (offset) {
+        case XUL_RX_FIFO_OFFSET: {
+            if (mock_uart.rx_fifo.empty()) {
+                return 0;
+            }
+            uint8_t byte = mock_uart.rx_fifo.front();
+            mock_uart.rx_fifo.pop_front();
+            return byte;
+        }
+        case XUL_STATUS_REG_OFFSET: {
+            uint32_t status = mock_uart.status_errors;
+            mock_uart.status_errors = 0;
+            mock_uart.status_reads++;
+            if (!mock_uart.rx_fifo.empty()) status |= XUL_SR_RX_FIFO_VALID_DATA;
+            if (mock_uart.rx_fifo.size() >= MOCK_UARTLITE_FIFO_DEPTH) status |= XUL_SR_RX_FIFO_FULL;
+            if (mock_uart.tx_fifo.empty()) status |= XUL_SR_TX_FIFO_EMPTY;
+            if (mock_uart.tx_fifo.size() >= MOCK_UARTLITE_FIFO_DEPTH) status |= XUL_SR_TX_FIFO_FULL;
+            if (mock_uart.interrupt_enabled) status |= XUL_SR_INTR_ENABLED;
+            return status;
+        }
+        default:
+            return 0;
+    }
+}
+
+void mock_uartlite_write_reg(uint32_t, uint32_t offset, uint32_t value) {
+    switch (offset) {
+        case XUL_TX_FIFO_OFFSET:
+            // Writes to a full FIFO are lost, as on the hardware
+            if (mock_uart.tx_fifo.size() < MOCK_UARTLITE_FIFO_DEPTH) {
+                mock_uart.tx_fifo.push_back(static_cast<uint8_t>(value));
+            }
+            break;
+        case XUL_CONTROL_REG_OFFSET:
+            if (value & XUL_CR_FIFO_RX_RESET) mock_uart.rx_fifo.clear();
+            if (value & XUL_CR_FIFO_TX_RESET) mock_uart.tx_fifo.clear();
+            mock_uart.interrupt_enabled = (value & XUL_CR_ENABLE_INTR) != 0;
+            break;
+        default:
+            break;
+    }
+}
+
+int XUartLite_Initialize(XUartLite* instance, uint32_t base_address) {
+    instance->base_address = base_address;
+    return XST_SUCCESS;
+}
+
+unsigned int XUartLite_Send(XUartLite* instance, uint8_t* data, unsigned int bytes) {
+    unsigned int sent = 0;
+    while (sent < bytes && !XUartLite_IsTransmitFull(instance->base_address)) {
+        XUartLite_WriteReg(instance->base_address, XUL_TX_FIFO_OFFSET, data[sent++]);
+    }
+    return sent;
+}
+
+unsigned int XUartLite_Recv(XUartLite* instance, uint8_t* data, unsigned int bytes) {
+    unsigned int received = 0;
+    while (received < bytes && !XUartLite_IsReceiveEmpty(instance->base_address)) {
+        data[received++] = static_cast<uint8_t>(XUartLite_ReadReg(instance->base_address, XUL_RX_FIFO_OFFSET));
+    }
+    return received;
+}
+
+int XUartLite_IsSending(XUartLite*) {
+    return !mock_uart.tx_fifo.empty();
+}
+
+int XIntc_Initialize(XIntc* instance, uint32_t base_address) {
+    *instance = XIntc();
+    instance->base_address = base_address;
+    return XST_SUCCESS;
+}
+
+int XIntc_Connect(XIntc* instance, uint8_t id, XInterruptHandler handler, void* callback_ref) {
+    if (id >= MOCK_XINTC_MAX_IRQS) {
+        return XST_FAILURE;
+    }
+    instance->handlers[id] = handler;
+    instance->callback_refs[id] = callback_ref;
+    return XST_SUCCESS;
+}
+
+void XIntc_Enable(XIntc* instance, uint8_t id) {
+    instance->enabled[id] = true;
+}
+
+void XIntc_Disable(XIntc* instance, uint8_t id) {
+    instance->enabled[id] = false;
+}
+
+int XIntc_Start(XIntc* instance, uint8_t) {
+    instance->started = true;
+    return XST_SUCCESS;
+}
+
+void XIntc_InterruptHandler(XIntc* instance) {
+    for (uint8_t id = 0; id < MOCK_XINTC_MAX_IRQS; ++id) {
+        if (instance->enabled[id] && instance->handlers[id]) {
+            instance->handlers[id](instance->callback_refs[id]);
+        }
+    }
+}
@@ -0,0 +1,31 @@
+/**
+ * mock_xil.h: test-side control of the host mocks.
+ */
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <deque>
+#include <vector>
+
+// Depth of both UART Lite FIFOs
+constexpr size_t MOCK_UARTLITE_FIFO_DEPTH = 16;
+
+struct MockUartLite {
+    std::deque<uint8_t> rx_fifo;    // Received, not yet read by the driver
+    std::deque<uint8_t> tx_fifo;    // Written by the driver, not yet shifted out
+    std::vector<uint8_t> line;      // Bytes shifted out on the TX line
+    uint32_t status_errors;         // Sticky error bits, cleared by a status read
+    bool interrupt_enabled;
+    uint32_t status_reads;
+};
+
+extern MockUartLite mock_uart;
+
+void mock_uart_reset();
+
+// Bytes arriving on the RX line; past the FIFO depth they set the overrun bit
+void mock_uart_receive(const uint8_t* data, size_t len);
+
+// Shift the TX FIFO out onto the line (what the UART does between interrupts)
+void mock_uart_transmit();
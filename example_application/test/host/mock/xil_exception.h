@@ -0,0 +1,13 @@
+/**
+ * xil_exception.h (host mock): exception setup is a no-op on the host.
+ */
+#pragma once
+
+typedef void (*Xil_ExceptionHandler)(void* data);
+
+#define XIL_EXCEPTION_ID_INT 0
+
+inline void Xil_ExceptionInit() {}
+inline void Xil_ExceptionRegisterHandler(unsigned int, Xil_ExceptionHandler, void*) {}
+inline void Xil_ExceptionEnable() {}
+inline void Xil_ExceptionDisable() {}
@@ -0,0 +1,28 @@
+/**
+ * xintc.h (host mock): records connections and the enable state of each
+ * interrupt ID so tests can check masking and call the connected handler.
+ */
+#pragma once
+
+#include <cstdint>
+#include "xstatus.h"
+
+#define XIN_REAL_MODE 1
+#define MOCK_XINTC_MAX_IRQS 32
+
+typedef void (*XInterruptHandler)(void* callback_ref);
+
+typedef struct {
+    uint32_t base_address;
+    XInterruptHandler handlers[MOCK_XINTC_MAX_IRQS];
+    void* callback_refs[MOCK_XINTC_MAX_IRQS];
+    bool enabled[MOCK_XINTC_MAX_IRQS];
+    bool started;
+} XIntc;
+
+int XIntc_Initialize(XIntc* instance, uint32_t base_address);
+int XIntc_Connect(XIntc* instance, uint8_t id, XInterruptHandler handler, void* callback_ref);
+void XIntc_Enable(XIntc* instance, uint8_t id);
+void XIntc_Disable(XIntc* instance, uint8_t id);
+int XIntc_Start(XIntc* instance, uint8_t mode);
+void XIntc_InterruptHandler(XIntc* instance);
@@ -0,0 +1,7 @@
+/**
+ * xstatus.h (host mock)
+ */
+#pragma once
+
+#define XST_SUCCESS 0
+#define XST_FAILURE 1
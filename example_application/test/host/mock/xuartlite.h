@@ -0,0 +1,18 @@
+/**
+ * xuartlite.h (host mock): the XUartLite driver calls UartHandler uses,
+ * on top of the register model in xuartlite_l.h.
+ */
+#pragma once
+
+#include <cstdint>
+#include "xstatus.h"
+#include "xuartlite_l.h"
+
+typedef struct {
+    uint32_t base_address;
+} XUartLite;
+
+int XUartLite_Initialize(XUartLite* instance, uint32_t base_address);
+unsigned int XUartLite_Send(XUartLite* instance, uint8_t* data, unsigned int bytes);
+unsigned int XUartLite_Recv(XUartLite* instance, uint8_t* data, unsigned int bytes);
+int XUartLite_IsSending(XUartLite* instance);
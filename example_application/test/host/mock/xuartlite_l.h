@@ -0,0 +1,41 @@
+/**
+ * xuartlite_l.h (host mock): register-level UART Lite model for host tests.
+ *
+ * Register reads and writes go to the MockUartLite model in mock_xil.cpp
+ * instead of the AXI bus. Reading the status register clears the error
+ * bits, as on the hardware.
+ */
+#pragma once
+
+#include <cstdint>
+
+#define XUL_RX_FIFO_OFFSET          0
+#define XUL_TX_FIFO_OFFSET          4
+#define XUL_STATUS_REG_OFFSET       8
+#define XUL_CONTROL_REG_OFFSET      12
+
+#define XUL_SR_PARITY_ERROR         0x80
+#define XUL_SR_FRAMING_ERROR        0x40
+#define XUL_SR_OVERRUN_ERROR        0x20
+#define XUL_SR_INTR_ENABLED         0x10
+#define XUL_SR_TX_FIFO_FULL         0x08
+#define XUL_SR_TX_FIFO_EMPTY        0x04
+#define XUL_SR_RX_FIFO_FULL         0x02
+#define XUL_SR_RX_FIFO_VALID_DATA   0x01
+
+#define XUL_CR_ENABLE_INTR          0x10
+#define XUL_CR_FIFO_RX_RESET        0x02
+#define XUL_CR_FIFO_TX_RESET        0x01
+
+uint32_t mock_uartlite_read_reg(uint32_t base, uint32_t offset);
+void mock_uartlite_write_reg(uint32_t base, uint32_t offset, uint32_t value);
+
+#define XUartLite_ReadReg(base, offset) mock_uartlite_read_reg((base), (offset))
+#define XUartLite_WriteReg(base, offset, value) mock_uartlite_write_reg((base), (offset), (value))
+#define XUartLite_GetStatusReg(base) XUartLite_ReadReg((base), XUL_STATUS_REG_OFFSET)
+#define XUartLite_IsReceiveEmpty(base) \
+    ((XUartLite_GetStatusReg(base) & XUL_SR_RX_FIFO_VALID_DATA) != XUL_SR_RX_FIFO_VALID_DATA)
+#define XUartLite_IsTransmitFull(base) \
+    ((XUartLite_GetStatusReg(base) & XUL_SR_TX_FIFO_FULL) == XUL_SR_TX_FIFO_FULL)
+#define XUartLite_EnableIntr(base) XUartLite_WriteReg((base), XUL_CONTROL_REG_OFFSET, XUL_CR_ENABLE_INTR)
+#define XUartLite_DisableIntr(base) XUartLite_WriteReg((base), XUL_CONTROL_REG_OFFSET, 0)
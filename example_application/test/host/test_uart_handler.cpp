@@ -0,0 +1,221 @@
+/**
+ * test_uart_handler.cpp: host test for the interrupt path of UartHandler.
+ *
+ * Builds uart_handler.cpp against the register-level mocks in mock/ and
+ * drives handle_interrupt() directly (through the mock XIntc), the way the
+ * UART interrupt would on the board. Run with 'make host-test'.
+ */
+
+#include "mock_xil.h"
+#include "uart_handler.h"
+#include "xintc.h"
+
+#include <algorithm>
+#include <cstdio>
+#include <vector>
+
+static int failures = 0;
+
+#define CHECK(cond)                                                         \
+    do {                                                                    \
+        if (!(cond)) {                                                      \
+            std::printf("  FAIL %s:%d: %s\n", __FILE__, __LINE__, #cond);   \
+            failures++;                                                     \
+        }                                                                   \
+    } while (0)
+
+static constexpr uint32_t UART_BASE = 0x40600000;
+static constexpr uint8_t UART_IRQ = 3;
+
+// Fresh mock UART and an interrupt-mode handler connected to the mock INTC
+struct Fixture {
+    XIntc intc;
+    UartHandler uart;
+
+    Fixture() : intc(), uart((mock_uart_reset(), UART_BASE)) {
+        XIntc_Initialize(&intc, 0x41200000);
+        CHECK(uart.enable_interrupts(intc, UART_IRQ));
+    }
+
+    // What the UART interrupt line does on the board
+    void interrupt() {
+        XIntc_InterruptHandler(&intc);
+    }
+};
+
+static std::vector<uint8_t> pattern(size_t len) {
+    std::vector<uint8_t> data(len);
+    for (size_t i = 0; i < len; ++i) {
+        data[i] = static_cast<uint8_t>(i * 7 + 1);
+    }
+    return data;
+}
+
+static void test_enable_interrupts() {
+    Fixture f;
+    CHECK(f.uart.mode() == UartHandler::Mode::Interrupt);
+    CHECK(f.intc.handlers[UART_IRQ] == &UartHandler::interrupt_handler);
+    CHECK(f.intc.callback_refs[UART_IRQ] == &f.uart);
+    CHECK(f.intc.enabled[UART_IRQ]);
+    CHECK(mock_uart.interrupt_enabled);
+}
+
+static void test_try_get_byte_empty() {
+    Fixture f;
+    uint8_t byte = 0xA5;
+    CHECK(!f.uart.try_get_byte(byte));
+    CHECK(byte == 0xA5);
+    CHECK(f.uart.rx_available() == 0);
+
+    // An interrupt with nothing in the FIFO leaves the ring empty
+    f.interrupt();
+    CHECK(!f.uart.try_get_byte(byte));
+    CHECK(f.uart.stats().rx_bytes == 0);
+}
+
+static void test_rx_in_order() {
+    Fixture f;
+    std::vector<uint8_t> data = pattern(40);
+    for (size_t i = 0; i < data.size(); i += MOCK_UARTLITE_FIFO_DEPTH) {
+        size_t chunk = std::min(MOCK_UARTLITE_FIFO_DEPTH, data.size() - i);
+        mock_uart_receive(&data[i], chunk);
+        f.interrupt();
+    }
+    CHECK(f.uart.rx_available() == data.size());
+
+    for (uint8_t expected : data) {
+        uint8_t byte = 0;
+        CHECK(f.uart.try_get_byte(byte));
+        CHECK(byte == expected);
+    }
+    CHECK(f.uart.stats().rx_bytes == data.size());
+    CHECK(f.uart.stats().rx_overruns == 0);
+}
+
+static void test_rx_ring_overrun() {
+    Fixture f;
+    // One slot of the ring is always kept free
+    const size_t ring_usable = UART_RX_BUFFER_SIZE - 1;
+    const size_t extra = 37;
+    std::vector<uint8_t> data = pattern(ring_usable + extra);
+
+    // The application never reads, so the ring fills and then drops
+    for (size_t i = 0; i < data.size(); i += MOCK_UARTLITE_FIFO_DEPTH) {
+        size_t chunk = std::min(MOCK_UARTLITE_FIFO_DEPTH, data.size() - i);
+        mock_uart_receive(&data[i], chunk);
+        f.interrupt();
+    }
+
+    UartHandler::Stats stats = f.uart.stats();
+    CHECK(stats.rx_bytes == ring_usable);
+    CHECK(stats.rx_overruns == extra);
+    CHECK(stats.rx_fifo_overruns == 0);
+    CHECK(mock_uart.rx_fifo.empty());
+
+    // The oldest bytes are kept, the newest are the ones dropped
+    uint8_t byte = 0;
+    for (size_t i = 0; i < ring_usable; ++i) {
+        CHECK(f.uart.try_get_byte(byte));
+        CHECK(byte == data[i]);
+    }
+    CHECK(!f.uart.try_get_byte(byte));
+}
+
+static void test_rx_fifo_overrun_and_errors() {
+    Fixture f;
+    // Interrupt serviced too late: the hardware FIFO overflowed
+    std::vector<uint8_t> data = pattern(MOCK_UARTLITE_FIFO_DEPTH + 4);
+    mock_uart_receive(data.data(), data.size());
+    f.interrupt();
+
+    UartHandler::Stats stats = f.uart.stats();
+    CHECK(stats.rx_fifo_overruns == 1);
+    CHECK(stats.rx_bytes == MOCK_UARTLITE_FIFO_DEPTH);
+    CHECK(stats.rx_overruns == 0);
+
+    mock_uart.status_errors = XUL_SR_FRAMING_ERROR | XUL_SR_PARITY_ERROR;
+    f.interrupt();
+    stats = f.uart.stats();
+    CHECK(stats.framing_errors == 1);
+    CHECK(stats.parity_errors == 1);
+
+    f.uart.reset_stats();
+    stats = f.uart.stats();
+    CHECK(stats.rx_bytes == 0 && stats.rx_fifo_overruns == 0 && stats.framing_errors == 0);
+}
+
+static void test_tx_drain_through_write() {
+    Fixture f;
+    std::vector<uint8_t> data = pattern(300);
+    CHECK(f.uart.write(data.data(), data.size()) == data.size());
+
+    // write() starts the transfer itself; the FIFO is topped up by interrupts
+    CHECK(mock_uart.tx_fifo.size() == MOCK_UARTLITE_FIFO_DEPTH);
+
+    size_t interrupts = 0;
+    while (mock_uart.line.size() < data.size() && interrupts < 1000) {
+        mock_uart_transmit();   // FIFO shifts out, TX-empty interrupt fires
+        f.interrupt();
+        interrupts++;
+    }
+    mock_uart_transmit();
+
+    CHECK(mock_uart.line == data);
+    CHECK(f.uart.stats().tx_bytes == data.size());
+    CHECK(f.uart.stats().tx_overruns == 0);
+    CHECK(f.uart.tx_free() == UART_TX_BUFFER_SIZE - 1);
+
+    // Once the ring is empty, further interrupts send nothing
+    f.interrupt();
+    CHECK(mock_uart.tx_fifo.empty());
+    CHECK(mock_uart.line.size() == data.size());
+}
+
+static void test_tx_ring_overrun() {
+    Fixture f;
+    // The first FIFO load leaves the ring straight away, the rest must fit
+    const size_t accepted = UART_TX_BUFFER_SIZE - 1 + MOCK_UARTLITE_FIFO_DEPTH;
+    std::vector<uint8_t> data = pattern(UART_TX_BUFFER_SIZE + 100);
+
+    size_t queued = 0;
+    queued += f.uart.write(data.data(), UART_TX_BUFFER_SIZE / 2);
+    queued += f.uart.write(data.data() + queued, data.size() - queued);
+    CHECK(queued == accepted);
+    CHECK(f.uart.stats().tx_overruns == data.size() - accepted);
+    CHECK(f.uart.tx_free() == 0);
+
+    while (mock_uart.line.size() < accepted) {
+        mock_uart_transmit();
+        f.interrupt();
+    }
+    mock_uart_transmit();
+    CHECK(std::vector<uint8_t>(data.begin(), data.begin() + accepted) == mock_uart.line);
+}
+
+int main() {
+    struct {
+        const char* name;
+        void (*fn)();
+    } tests[] = {
+        {"enable_interrupts", test_enable_interrupts},
+        {"try_get_byte_empty", test_try_get_byte_empty},
+        {"rx_in_order", test_rx_in_order},
+        {"rx_ring_overrun", test_rx_ring_overrun},
+        {"rx_fifo_overrun_and_errors", test_rx_fifo_overrun_and_errors},
+        {"tx_drain_through_write", test_tx_drain_through_write},
+        {"tx_ring_overrun", test_tx_ring_overrun},
+    };
+
+    for (const auto& test : tests) {
+        int before = failures;
+        test.fn();
+        std::printf("%s %s\n", failures == before ? "PASS" : "FAIL", test.name);
+    }
+
+    if (failures) {
+        std::printf("%d check(s) failed\n", failures);
+        return 1;
+    }
+    std::printf("All UartHandler host tests passed\n");
+    return 0;
+}
@@ -57,6 +57,14 @@ if { $list_projs eq "" } {
 variable design_name
 set design_name arty_s7_riscv_bd
 
+# UART Lite baud rate (C_BAUDRATE). Set <::uart_baud_loc> before sourcing this
+# script to override it; build_arty_s7_riscv_xsa.tcl takes it as a -tclargs value.
+variable uart_baud
+set uart_baud 9600
+if { [info exists ::uart_baud_loc] } {
+   set uart_baud $::uart_baud_loc
+}
+
 # This script was generated for a remote BD. To create a non-remote design,
 # change the variable <run_remote_bd_flow> to <0>.
 
@@ -507,8 +515,10 @@ proc create_root_design { parentCell } {
 
 
   # Create instance: axi_uartlite_0, and set properties
+  variable uart_baud
   set axi_uartlite_0 [ create_bd_cell -type ip -vlnv xilinx.com:ip:axi_uartlite:2.0 axi_uartlite_0 ]
   set_property -dict [list \
+    CONFIG.C_BAUDRATE $uart_baud \
     CONFIG.UARTLITE_BOARD_INTERFACE {usb_uart} \
     CONFIG.USE_BOARD_FLOW {true} \
   ] $axi_uartlite_0
@@ -612,6 +622,8 @@ proc create_root_design { parentCell } {
   [get_bd_pins microblaze_riscv_0_axi_periph/S02_ACLK]
   connect_bd_net -net microblaze_riscv_0_intr  [get_bd_pins microblaze_riscv_0_xlconcat/dout] \
   [get_bd_pins microblaze_riscv_0_axi_intc/intr]
+  connect_bd_net -net axi_uartlite_0_interrupt  [get_bd_pins axi_uartlite_0/interrupt] \
+  [get_bd_pins microblaze_riscv_0_xlconcat/In0]
   connect_bd_net -net mig_7series_0_mmcm_locked  [get_bd_pins mig_7series_0/mmcm_locked] \
   [get_bd_pins rst_mig_7series_0_81M/dcm_locked]
   connect_bd_net -net mig_7series_0_ui_clk  [get_bd_pins mig_7series_0/ui_clk] \
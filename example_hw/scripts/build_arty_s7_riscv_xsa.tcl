@@ -11,6 +11,21 @@ set constraint_dir [file normalize "$script_dir/../constraints"]
 set out_dir [file normalize "$script_dir/../build/out"]
 set proj_dir [file normalize "$script_dir/../build/vivado_proj"]
 
+# UART Lite baud rate and run jobs: vivado -mode batch -source build_arty_s7_riscv_xsa.tcl -tclargs <baud> [jobs]
+# UART Lite divides its AXI clock by an integer 16 * ratio; the rate it really
+# runs at is checked by vivado_build.py and shown by uart_baud.py (uartlite.py).
+set uart_baud_loc 9600
+if { $argc > 0 } {
+   set uart_baud_loc [lindex $argv 0]
+}
+set impl_jobs 6
+if { $argc > 1 } {
+   set impl_jobs [lindex $argv 1]
+}
+if { ![string is integer -strict $uart_baud_loc] } {
+   error "UART baud rate must be an integer, got '$uart_baud_loc'"
+}
+
 # Create, set up, and cd into the new project
 create_project $proj_name $proj_dir -part $part
 set_property board_part $board_part [current_project]
@@ -29,7 +44,7 @@ set_property top arty_s7_riscv_bd_wrapper [current_fileset]
 add_files -fileset constrs_1 $constraint_dir/arty_s7_riscv_handgen.xdc
 
 # === Synthesis & Implementation ===
-launch_runs impl_1 -jobs 6 -to_step write_bitstream
+launch_runs impl_1 -jobs $impl_jobs -to_step write_bitstream
 wait_on_run impl_1
 
 # === Export Hardware Platform (.xsa with bitstream) ===
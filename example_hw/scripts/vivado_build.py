@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Incremental Vivado build of the Arty S7 MicroBlaze V hardware (.xsa).
+
+Does what build_arty_s7_riscv_xsa.tcl does, without starting from scratch
+every time:
+  - the project and block design are only recreated when the block design
+    script, the UART baud rate, the part or the Vivado version change
+  - the block design IPs are synthesized out of context as separate runs,
+    in parallel, and their results are kept in an IP cache outside the
+    project, so even a recreated project reuses them
+  - the pin constraints are used in implementation only, so a constraint
+    change skips synthesis; implementation starts from the previous routed
+    checkpoint (incremental place and route)
+  - the number of parallel runs is sized to the CPUs and memory available
+  - each step is timed; timings are printed and kept in build/out/hw_build_timings.json
+  - the UART rate is checked against the UART Lite clock in the XSA (the
+    previous build's or the bundled one before, the new one after the build)
+
+Everything runs in one Vivado batch session driven by a generated Tcl script,
+so any executable with Vivado's batch interface (-version, -mode batch
+-source <tcl> -log <file> -journal <file> -tclargs ...) can stand in for
+'vivado' through --vivado.
+
+Usage:
+  python vivado_build.py                       # from example_hw/, same outputs as 'make hw'
+  python vivado_build.py --uart_baud 1562500 --jobs 4
+  python vivado_build.py --force               # recreate the project, keep the IP cache
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+import zipfile
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HW_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, ".."))
+REPO_DIR = os.path.dirname(HW_DIR)
+
+# xsa_index and the UART Lite rate are shared with the platform and application scripts
+sys.path.insert(0, os.path.join(REPO_DIR, "example_platform", "scripts"))
+import uartlite
+import xsa_index
+
+PROJECT_NAME = "microblaze_v_hw_proj"
+PART = "xc7s50csga324-1"
+BOARD_PART = "digilentinc.com:arty-s7-50:part0:1.1"
+TOP = "arty_s7_riscv_bd_wrapper"
+XSA_NAME = "arty_s7_riscv.xsa"
+UART_INSTANCE = "axi_uartlite_0"
+
+# XSA to take the UART clock from before the first build
+BUNDLED_XSA = os.path.join(REPO_DIR, "example_platform", "xsa", XSA_NAME)
+
+BD_SCRIPT = os.path.join(SCRIPT_DIR, "build_arty_s7_riscv_bd.tcl")
+CONSTRAINTS = [os.path.join(HW_DIR, "constraints", "arty_s7_riscv_handgen.xdc")]
+
+# Bumped when the generated Tcl changes in a way that needs a fresh project
+DRIVER_VERSION = 1
+
+# Peak memory of one Spartan-7 synthesis/implementation run, with headroom
+JOB_MEMORY_GB = 2.5
+
+# Vivado's own thread limit per run (general.maxThreads tops out at 8 on Linux)
+MAX_THREADS = 8
+
+# Builds kept in the timings file
+TIMING_HISTORY = 20
+
+STEPS = ["project", "ip_synth", "synth", "impl", "export"]
+
+
+def available_cpus():
+    """CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def available_memory_gb():
+    """Memory available for new processes, in GB (None if unknown)."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / (1024 * 1024)
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 ** 3)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def machine_jobs(cpus=None, memory_gb=None):
+    """
+    Parallel Vivado runs for this machine: one per CPU, capped by memory.
+
+    Returns:
+        (jobs, reason)
+    """
+    cpus = cpus or available_cpus()
+    memory_gb = available_memory_gb() if memory_gb is None else memory_gb
+    jobs = cpus
+    reason = f"{cpus} CPUs"
+    if memory_gb is not None:
+        by_memory = max(1, int(memory_gb // JOB_MEMORY_GB))
+        if by_memory < jobs:
+            jobs = by_memory
+            reason = f"{memory_gb:.1f} GB free / {JOB_MEMORY_GB} GB per run ({cpus} CPUs)"
+    return max(1, jobs), reason
+
+
+def xsa_uart_clock(xsa_path):
+    """AXI clock of the UART Lite in an XSA, or None (with a warning) if it cannot be read."""
+    try:
+        with xsa_index.XsaFile(xsa_path) as xsa:
+            return uartlite.uart_clock(xsa, UART_INSTANCE)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"⚠️  No {UART_INSTANCE} clock in {xsa_path}: {e}")
+        return None
+
+
+def check_uart_baud(baud, clock_hz, source):
+    """
+    Check a C_BAUDRATE against what UART Lite can produce at its clock (uartlite.py).
+
+    Args:
+        baud: Requested C_BAUDRATE
+        clock_hz: AXI clock of the UART Lite
+        source: Where the clock came from, for the messages
+
+    Returns:
+        Line rate the hardware will actually run at
+    """
+    try:
+        _, actual, error = uartlite.uartlite_rate(baud, clock_hz)
+    except ValueError as e:
+        raise RuntimeError(f"UART baud rate: {e}")
+    print(f"UART Lite: {baud} baud requested, {actual:.0f} baud actual ({error:.2f}% off) "
+          f"at {clock_hz / 1e6:.3f} MHz ({source})")
+    if error > uartlite.RATE_TOLERANCE:
+        print(f"⚠️  {baud} baud is not reachable from {clock_hz / 1e6:.0f} MHz; the UART will run at {actual:.0f}")
+    return actual
+
+
+def file_digest(paths):
+    """SHA-256 over the names and contents of files."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode() + b"\0")
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def tcl_path(path):
+    """Path as a braced Tcl word."""
+    return "{" + os.path.abspath(path).replace("\\", "/") + "}"
+
+
+class HardwareBuilder:
+    """Plans, runs and times one Vivado hardware build."""
+
+    def __init__(self, build_dir, uart_baud=9600, jobs=None, vivado="vivado", force=False, verbose=False):
+        self.build_dir = os.path.abspath(build_dir)
+        self.out_dir = os.path.join(self.build_dir, "out")
+        self.proj_dir = os.path.join(self.build_dir, "vivado_proj")
+        self.ip_cache_dir = os.path.join(self.build_dir, "ip_cache")
+        self.checkpoint_dir = os.path.join(self.build_dir, "checkpoints")
+        self.log_dir = os.path.join(self.build_dir, "logs")
+        self.state_path = os.path.join(self.build_dir, "hw_build_state.json")
+        self.timings_path = os.path.join(self.out_dir, "hw_build_timings.json")
+        self.xsa_path = os.path.join(self.out_dir, XSA_NAME)
+        self.uart_baud = uart_baud
+        self.vivado = vivado
+        self.force = force
+        self.verbose = verbose
+        if jobs:
+            self.jobs, self.jobs_reason = jobs, "--jobs"
+        else:
+            self.jobs, self.jobs_reason = machine_jobs()
+        self.threads = min(MAX_THREADS, available_cpus())
+        self.vivado_version = None
+        self.state = {}
+        self.timings = []
+
+    def detect_vivado(self):
+        """First line of 'vivado -version'; part of the project key."""
+        try:
+            result = subprocess.run([self.vivado, "-version"], capture_output=True, text=True, timeout=120)
+        except FileNotFoundError:
+            raise RuntimeError(f"Vivado executable not found: {self.vivado}")
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"'{self.vivado} -version' did not finish")
+        if result.returncode != 0:
+            raise RuntimeError(f"'{self.vivado} -version' failed: {result.stderr.strip()}")
+        lines = [line for line in result.stdout.splitlines() if line.strip()]
+        self.vivado_version = lines[0].strip() if lines else "unknown"
+        return self.vivado_version
+
+    def keys(self):
+        """Fingerprints of what each stage depends on."""
+        project = hashlib.sha256(json.dumps({
+            "driver": DRIVER_VERSION,
+            "vivado": self.vivado_version,
+            "part": PART,
+            "board": BOARD_PART,
+            "uart_baud": self.uart_baud,
+            "bd": file_digest([BD_SCRIPT]),
+        }, sort_keys=True).encode()).hexdigest()
+        constraints = file_digest(CONSTRAINTS)
+        return {"project": project, "constraints": constraints}
+
+    def load_state(self):
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                self.state = json.load(f)
+        return self.state
+
+    def plan(self):
+        """
+        Decide what this build has to do.
+
+        Returns:
+            Dict with 'up_to_date', 'new_project' and a 'reason' per decision
+        """
+        keys = self.keys()
+        xpr = os.path.join(self.proj_dir, f"{PROJECT_NAME}.xpr")
+        new_project = self.force or not os.path.exists(xpr) or self.state.get("project") != keys["project"]
+        if self.force:
+            reason = "forced"
+        elif not os.path.exists(xpr):
+            reason = "no project yet"
+        elif self.state.get("project") != keys["project"]:
+            reason = "block design, UART baud rate, part or Vivado version changed"
+        elif self.state.get("constraints") != keys["constraints"]:
+            reason = "constraints changed: implementation only"
+        else:
+            reason = "inputs unchanged"
+        up_to_date = (not new_project and self.state.get("constraints") == keys["constraints"]
+                      and self.state.get("complete") and os.path.exists(self.xsa_path))
+        return {"keys": keys, "new_project": new_project, "up_to_date": up_to_date, "reason": reason}
+
+    def generate_tcl(self, new_project):
+        """Tcl for one batch session. Steps whose runs are current return immediately."""
+        routed_checkpoint = os.path.join(self.checkpoint_dir, f"{TOP}_routed.dcp")
+        lines = [
+            "# Generated by vivado_build.py; edit the driver, not this file",
+            "proc build_step {name phase} {",
+            "    puts \"BUILD_STEP $name $phase\"",
+            "    flush stdout",
+            "}",
+            "proc build_info {name text} {",
+            "    puts \"BUILD_INFO $name $text\"",
+            "    flush stdout",
+            "}",
+            "proc stale_runs {runs} {",
+            "    set stale {}",
+            "    foreach run $runs {",
+            "        if {[get_property PROGRESS $run] ne \"100%\" || [get_property NEEDS_REFRESH $run]} {",
+            "            lappend stale $run",
+            "        }",
+            "    }",
+            "    return $stale",
+            "}",
+            "proc run_and_wait {runs jobs args} {",
+            "    foreach run $runs {",
+            "        reset_run $run",
+            "    }",
+            "    launch_runs $runs -jobs $jobs {*}$args",
+            "    foreach run $runs {",
+            "        wait_on_run $run",
+            "        if {[get_property PROGRESS $run] ne \"100%\"} {",
+            "            error \"Run $run failed: [get_property STATUS $run]\"",
+            "        }",
+            "    }",
+            "}",
+            "",
+            f"set jobs {self.jobs}",
+            f"set_param general.maxThreads {self.threads}",
+            "",
+            "build_step project begin",
+        ]
+        xpr = os.path.join(self.proj_dir, f"{PROJECT_NAME}.xpr")
+        if new_project:
+            lines += [
+                f"file delete -force {tcl_path(self.proj_dir)}",
+                f"create_project {PROJECT_NAME} {tcl_path(self.proj_dir)} -part {PART}",
+                f"set_property board_part {BOARD_PART} [current_project]",
+                f"config_ip_cache -use_cache_location {tcl_path(self.ip_cache_dir)}",
+                f"cd {tcl_path(self.proj_dir)}",
+                f"set ::uart_baud_loc {self.uart_baud}",
+                f"source {tcl_path(BD_SCRIPT)}",
+                "set bd_file [get_files *.bd]",
+                # Out-of-context synthesis per IP: one run each, launched together below
+                "set_property synth_checkpoint_mode Hierarchical $bd_file",
+                "generate_target all $bd_file",
+                "create_ip_run $bd_file",
+                "add_files [make_wrapper -files $bd_file -top -force]",
+                f"set_property top {TOP} [current_fileset]",
+            ]
+            for xdc in CONSTRAINTS:
+                # Pin constraints only: keeping them out of synthesis lets a change skip it
+                lines += [
+                    f"add_files -fileset constrs_1 {tcl_path(xdc)}",
+                    f"set_property USED_IN_SYNTHESIS false [get_files {tcl_path(xdc)}]",
+                ]
+            lines += [
+                "set_property AUTO_INCREMENTAL_CHECKPOINT 1 [get_runs synth_1]",
+                "build_info project created",
+            ]
+        else:
+            lines += [
+                f"open_project {tcl_path(xpr)}",
+                f"config_ip_cache -use_cache_location {tcl_path(self.ip_cache_dir)}",
+                "build_info project reused",
+            ]
+        lines += [
+            "build_step project end",
+            "",
+            "build_step ip_synth begin",
+            "set ip_runs [get_runs -filter {IS_SYNTHESIS && NAME != \"synth_1\"}]",
+            "set stale [stale_runs $ip_runs]",
+            "if {[llength $stale]} {",
+            "    run_and_wait $stale $jobs",
+            "}",
+            "build_info ip_synth \"[llength $stale] of [llength $ip_runs] runs\"",
+            "build_step ip_synth end",
+            "",
+            "build_step synth begin",
+            "set stale [stale_runs [get_runs synth_1]]",
+            "if {[llength $stale]} {",
+            "    run_and_wait $stale $jobs",
+            "    build_info synth ran",
+            "} else {",
+            "    build_info synth reused",
+            "}",
+            "build_step synth end",
+            "",
+            "build_step impl begin",
+            "set impl [get_runs impl_1]",
+            "set stale [stale_runs $impl]",
+            "if {[llength $stale]} {",
+            f"    if {{[file exists {tcl_path(routed_checkpoint)}]}} {{",
+            f"        set_property INCREMENTAL_CHECKPOINT {tcl_path(routed_checkpoint)} $impl",
+            "        build_info impl \"incremental from previous routed checkpoint\"",
+            "    }",
+            "    run_and_wait $stale $jobs -to_step write_bitstream",
+            f"    file mkdir {tcl_path(self.checkpoint_dir)}",
+            f"    file copy -force [file join [get_property DIRECTORY $impl] {TOP}_routed.dcp] {tcl_path(routed_checkpoint)}",
+            "    build_info impl ran",
+            "} else {",
+            "    build_info impl reused",
+            "}",
+            "build_step impl end",
+            "",
+            "build_step export begin",
+            f"file mkdir {tcl_path(self.out_dir)}",
+            f"write_hw_platform -include_bit -fixed -force {tcl_path(self.xsa_path)}",
+            "build_step export end",
+            "",
+        ]
+        return "\n".join(lines)
+
+    def run_vivado(self, tcl_file):
+        """
+        Run the batch session, streaming its output.
+
+        Returns:
+            (returncode, step timings)
+        """
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_file = os.path.join(self.log_dir, f"vivado_{stamp}.log")
+        command = [self.vivado, "-mode", "batch", "-source", tcl_file, "-notrace",
+                   "-log", log_file, "-journal", os.path.join(self.log_dir, f"vivado_{stamp}.jou")]
+
+        steps = {}
+        info = {}
+        start = time.time()
+        first_step = None
+        self.output_tail = []
+        with subprocess.Popen(command, cwd=self.build_dir, stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT, text=True, bufsize=1) as process:
+            for line in process.stdout:
+                line = line.rstrip("\n")
+                now = time.time()
+                fields = line.split(None, 3)
+                if len(fields) >= 3 and fields[0] == "BUILD_STEP":
+                    name, phase = fields[1], fields[2]
+                    if phase == "begin":
+                        first_step = first_step or now
+                        steps[name] = {"name": name, "start": now}
+                        print(f"▶ {name}...")
+                    elif name in steps:
+                        steps[name]["seconds"] = now - steps[name]["start"]
+                        detail = "; ".join(info.get(name, []))
+                        print(f"✓ {name}: {steps[name]['seconds']:.1f} s" + (f" ({detail})" if detail else ""))
+                    continue
+                if len(fields) >= 3 and fields[0] == "BUILD_INFO":
+                    info.setdefault(fields[1], []).append(line.split(None, 2)[2])
+                    continue
+                self.output_tail = (self.output_tail + [line])[-20:]
+                if self.verbose or line.startswith(("ERROR", "CRITICAL WARNING")):
+                    print(f"  {line}")
+            returncode = process.wait()
+
+        timings = []
+        if first_step:
+            timings.append({"name": "vivado_startup", "seconds": first_step - start})
+        for name in STEPS:
+            if name in steps:
+                timings.append({"name": name, "seconds": steps[name].get("seconds"),
+                                "info": info.get(name, [])})
+        self.log_file = log_file
+        return returncode, timings
+
+    def record(self, plan, timings, total, success):
+        os.makedirs(self.out_dir, exist_ok=True)
+        history = []
+        if os.path.exists(self.timings_path):
+            with open(self.timings_path) as f:
+                history = json.load(f).get("builds", [])
+        history.append({
+            "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "success": success,
+            "reason": plan["reason"],
+            "new_project": plan["new_project"],
+            "jobs": self.jobs,
+            "threads": self.threads,
+            "uart_baud": self.uart_baud,
+            "vivado": self.vivado_version,
+            "total_seconds": total,
+            "steps": timings,
+        })
+        with open(self.timings_path, "w") as f:
+            json.dump({"builds": history[-TIMING_HISTORY:]}, f, indent=2)
+
+    def print_timings(self, timings, total):
+        print(f"\n{'='*60}")
+        print(f"{'Step':<16} {'Seconds':>9}  Notes")
+        for step in timings:
+            seconds = step["seconds"]
+            text = f"{seconds:>9.1f}" if seconds is not None else f"{'failed':>9}"
+            print(f"{step['name']:<16} {text}  {'; '.join(step.get('info', []))}")
+        print(f"{'total':<16} {total:>9.1f}")
+        print(f"{'='*60}")
+
+    def build(self):
+        """Run the build; returns True on success."""
+        start = time.time()
+        if self.uart_baud < uartlite.MIN_BAUD:
+            raise RuntimeError(f"UART baud rate must be at least {uartlite.MIN_BAUD}, got {self.uart_baud}")
+        # The clock can only change with the block design; the previous XSA is the best guess
+        reference = self.xsa_path if os.path.exists(self.xsa_path) else BUNDLED_XSA
+        clock_hz = xsa_uart_clock(reference) if os.path.exists(reference) else None
+        if clock_hz:
+            check_uart_baud(self.uart_baud, clock_hz, f"from {os.path.relpath(reference, REPO_DIR)}")
+        else:
+            print("⚠️  No XSA to take the UART clock from yet; the rate is checked after the build")
+        print(f"Vivado: {self.detect_vivado()}")
+        print(f"Parallel runs: {self.jobs} ({self.jobs_reason}), {self.threads} threads per run")
+        self.load_state()
+        plan = self.plan()
+        print(f"Plan: {plan['reason']}")
+        if plan["up_to_date"]:
+            print(f"✓ Hardware is up to date: {self.xsa_path}")
+            return True
+
+        for directory in (self.build_dir, self.log_dir, self.out_dir):
+            os.makedirs(directory, exist_ok=True)
+        tcl_file = os.path.join(self.build_dir, "hw_build.tcl")
+        with open(tcl_file, "w") as f:
+            f.write(self.generate_tcl(plan["new_project"]))
+
+        # A failed or interrupted build must not look complete next time
+        self.state.update(complete=False)
+        self.save_state()
+
+        returncode, timings = self.run_vivado(tcl_file)
+        success = returncode == 0 and os.path.exists(self.xsa_path)
+        total = time.time() - start
+        self.record(plan, timings, total, success)
+        self.print_timings(timings, total)
+        if not success:
+            if not self.verbose:
+                for line in self.output_tail:
+                    print(f"  {line}")
+            print(f"❌ Vivado failed (exit {returncode}); log: {self.log_file}")
+            return False
+
+        self.state.update(project=plan["keys"]["project"], constraints=plan["keys"]["constraints"],
+                          complete=True, uart_baud=self.uart_baud)
+        self.save_state()
+        print(f"✓ XSA: {self.xsa_path}")
+        clock_hz = xsa_uart_clock(self.xsa_path)
+        if clock_hz:
+            check_uart_baud(self.uart_baud, clock_hz, "built")
+        print(f"✓ Timings: {self.timings_path}")
+        return True
+
+    def save_state(self):
+        os.makedirs(self.build_dir, exist_ok=True)
+        with open(self.state_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental, parallel Vivado build of the hardware (.xsa).")
+    parser.add_argument("--build_dir", type=str, default=os.path.join(HW_DIR, "build"), help="Build directory")
+    parser.add_argument("--uart_baud", type=int, default=9600, help="C_BAUDRATE of axi_uartlite_0")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel runs (default: sized to CPUs and memory)")
+    parser.add_argument("--vivado", type=str, default="vivado", help="Vivado executable (or a stand-in)")
+    parser.add_argument("--force", action="store_true", help="Recreate the project (the IP cache is kept)")
+    parser.add_argument("--verbose", action="store_true", help="Stream the whole Vivado output")
+    args = parser.parse_args()
+
+    try:
+        builder = HardwareBuilder(args.build_dir, uart_baud=args.uart_baud, jobs=args.jobs,
+                                  vivado=args.vivado, force=args.force, verbose=args.verbose)
+        return 0 if builder.build() else 1
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for vivado_build.py against the stand-in Vivado in vivado_stand_in/.
+
+The stand-in runs the generated Tcl with tclsh and emulates the project and
+run commands, so these check the driver's decisions (new project, reuse,
+implementation-only rebuilds, failure handling) without Vivado installed.
+
+Usage:
+  python test_vivado_build.py        # or: make -C example_hw test
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+STAND_IN = os.path.join(TEST_DIR, "vivado_stand_in", "vivado")
+
+sys.path.insert(0, os.path.join(TEST_DIR, "..", "scripts"))
+import vivado_build
+
+
+@unittest.skipUnless(shutil.which("tclsh") and os.name == "posix", "the stand-in Vivado needs sh and tclsh")
+class VivadoBuildTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory(prefix="hw_build_test_")
+        self.build_dir = os.path.join(self.tmp.name, "build")
+        # A private copy of the constraints, so the test can edit them
+        self.xdc = os.path.join(self.tmp.name, os.path.basename(vivado_build.CONSTRAINTS[0]))
+        shutil.copy(vivado_build.CONSTRAINTS[0], self.xdc)
+        self.saved_constraints = vivado_build.CONSTRAINTS
+        vivado_build.CONSTRAINTS = [self.xdc]
+        self.saved_env = {name: os.environ.pop(name, None) for name in ("VIVADO_STAND_IN_FAIL", "VIVADO_STAND_IN_XSA")}
+        # The exported XSA is the bundled one, so the UART clock can be read back
+        os.environ["VIVADO_STAND_IN_XSA"] = vivado_build.BUNDLED_XSA
+
+    def tearDown(self):
+        vivado_build.CONSTRAINTS = self.saved_constraints
+        for name, value in self.saved_env.items():
+            os.environ.pop(name, None)
+            if value is not None:
+                os.environ[name] = value
+        self.tmp.cleanup()
+
+    def build(self, uart_baud=9600, fail=None):
+        """Run one build; returns (success, output, launched runs, last timings entry or None)."""
+        runs_log = os.path.join(self.build_dir, "stand_in_runs.log")
+        if os.path.exists(runs_log):
+            os.remove(runs_log)
+        if fail:
+            os.environ["VIVADO_STAND_IN_FAIL"] = fail
+        else:
+            os.environ.pop("VIVADO_STAND_IN_FAIL", None)
+
+        builder = vivado_build.HardwareBuilder(self.build_dir, uart_baud=uart_baud, jobs=2, vivado=STAND_IN)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            success = builder.build()
+
+        launched = []
+        if os.path.exists(runs_log):
+            with open(runs_log) as f:
+                launched = f.read().split()
+        return success, output.getvalue(), launched, self.last_build()
+
+    def last_build(self):
+        path = os.path.join(self.build_dir, "out", "hw_build_timings.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)["builds"][-1]
+
+    def state(self):
+        with open(os.path.join(self.build_dir, "hw_build_state.json")) as f:
+            return json.load(f)
+
+    def step_info(self, build, name):
+        return [info for step in build["steps"] if step["name"] == name for info in step["info"]]
+
+    def test_new_project(self):
+        success, output, launched, build = self.build()
+        self.assertTrue(success, output)
+        self.assertTrue(build["new_project"])
+        self.assertEqual(build["reason"], "no project yet")
+        self.assertEqual(self.step_info(build, "project"), ["created"])
+        self.assertEqual(self.step_info(build, "ip_synth"), ["6 of 6 runs"])
+        self.assertEqual(self.step_info(build, "synth"), ["ran"])
+        self.assertEqual(self.step_info(build, "impl"), ["ran"])
+        self.assertIn("synth_1", launched)
+        self.assertIn("impl_1", launched)
+        self.assertTrue(os.path.exists(os.path.join(self.build_dir, "out", vivado_build.XSA_NAME)))
+        self.assertTrue(self.state()["complete"])
+
+    def test_unchanged_inputs_up_to_date(self):
+        self.assertTrue(self.build()[0])
+        first = self.last_build()
+
+        success, output, launched, build = self.build()
+        self.assertTrue(success, output)
+        self.assertIn("Hardware is up to date", output)
+        self.assertEqual(launched, [])
+        # Vivado was not started, so no new timings entry either
+        self.assertEqual(build, first)
+
+    def test_constraint_change_implementation_only(self):
+        self.assertTrue(self.build()[0])
+        with open(self.xdc, "a") as f:
+            f.write("\n# moved a pin\n")
+
+        success, output, launched, build = self.build()
+        self.assertTrue(success, output)
+        self.assertFalse(build["new_project"])
+        self.assertEqual(build["reason"], "constraints changed: implementation only")
+        self.assertEqual(self.step_info(build, "project"), ["reused"])
+        self.assertEqual(self.step_info(build, "ip_synth"), ["0 of 6 runs"])
+        self.assertEqual(self.step_info(build, "synth"), ["reused"])
+        self.assertEqual(self.step_info(build, "impl"),
+                         ["incremental from previous routed checkpoint", "ran"])
+        self.assertEqual(launched, ["impl_1"])
+        self.assertTrue(self.state()["complete"])
+
+    def test_baud_change_recreates_project(self):
+        self.assertTrue(self.build()[0])
+        success, output, launched, build = self.build(uart_baud=115200)
+        self.assertTrue(success, output)
+        self.assertTrue(build["new_project"])
+        self.assertEqual(self.step_info(build, "project"), ["created"])
+        self.assertEqual(self.state()["uart_baud"], 115200)
+
+    def test_uart_rate_from_xsa_clock(self):
+        success, output, launched, build = self.build(uart_baud=921600)
+        self.assertTrue(success, output)
+        # Checked before the build (bundled XSA) and against the exported one
+        self.assertEqual(output.count("921600 baud requested, 1041667 baud actual"), 2, output)
+        self.assertIn("at 100.000 MHz (built)", output)
+        self.assertIn("the UART will run at 1041667", output)
+
+    def test_uart_rate_above_clock_rejected(self):
+        with self.assertRaises(RuntimeError):
+            self.build(uart_baud=10000000)
+        self.assertFalse(os.path.exists(os.path.join(self.build_dir, "hw_build_state.json")))
+
+    def test_failed_run_is_not_complete(self):
+        success, output, launched, build = self.build(fail="impl_1")
+        self.assertFalse(success)
+        self.assertIn("Vivado failed", output)
+        self.assertFalse(build["success"])
+        self.assertFalse(self.state()["complete"])
+
+        # The next build retries instead of reporting the failed one as current
+        success, output, launched, build = self.build()
+        self.assertTrue(success, output)
+        self.assertNotIn("Hardware is up to date", output)
+        self.assertIn("impl_1", launched)
+        self.assertTrue(self.state()["complete"])
+
+
+if __name__ == "__main__":
+    unittest.main()
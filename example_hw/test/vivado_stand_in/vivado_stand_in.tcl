@@ -0,0 +1,182 @@
+# Emulation of the Vivado project and run commands that vivado_build.py generates.
+#
+# Runs are tracked in the project directory (stand_in_state.tcl), so a project
+# that is opened again remembers which runs completed, like a real .xpr:
+#   - launching synth_1 makes impl_1 stale
+#   - impl_1 needs a refresh when a constraint file changed since it last ran
+# Every launched run is appended to stand_in_runs.log in the directory Vivado
+# was started in.
+#
+# Environment:
+#   VIVADO_STAND_IN_FAIL  Run name(s) that fail when launched (e.g. impl_1)
+#   VIVADO_STAND_IN_XSA   File copied to the write_hw_platform output (default: placeholder)
+
+set ::ip_names {clk_wiz_0 mig_7series_0 axi_uartlite_0 axi_gpio_0 microblaze_riscv_0 axi_intc_0}
+set ::start_dir [pwd]
+set ::proj ""
+set ::constraints {}
+array set ::runs {}
+
+proc state_file {} {
+    return [file join $::proj stand_in_state.tcl]
+}
+
+proc save_state {} {
+    set f [open [state_file] w]
+    puts $f [list array set ::runs [array get ::runs]]
+    puts $f [list set ::constraints $::constraints]
+    close $f
+}
+
+proc load_state {} {
+    array unset ::runs
+    set ::constraints {}
+    if {[file exists [state_file]]} {
+        _source [state_file]
+    }
+}
+
+# Constraint contents as implementation last saw them (the files are small)
+proc constraints_digest {} {
+    set digest {}
+    foreach xdc $::constraints {
+        set f [open $xdc rb]
+        lappend digest [read $f]
+        close $f
+    }
+    return $digest
+}
+
+# Run record: {progress status constraints}; constraints as used by impl_1
+proc run_field {run index} {
+    if {![info exists ::runs($run)]} {
+        set ::runs($run) [list 0% "Not started" {}]
+    }
+    return [lindex $::runs($run) $index]
+}
+
+proc create_project {name dir args} {
+    file mkdir $dir
+    close [open [file join $dir $name.xpr] w]
+    set ::proj $dir
+    load_state
+    foreach run {synth_1 impl_1} {
+        run_field $run 0
+    }
+    save_state
+    puts "INFO: created project $name"
+}
+
+proc open_project {xpr} {
+    if {![file exists $xpr]} {
+        error "ERROR: project $xpr does not exist"
+    }
+    set ::proj [file dirname $xpr]
+    load_state
+}
+
+proc current_project {} { return $::proj }
+proc current_fileset {} { return sources_1 }
+proc set_param {args} {}
+proc set_property {args} {}
+proc config_ip_cache {args} { file mkdir [lindex $args end] }
+proc generate_target {args} {}
+proc make_wrapper {args} { return arty_s7_riscv_bd_wrapper.v }
+
+# The block design script is not run; only the baud rate it would see is reported
+rename source _source
+proc source {path} {
+    puts "INFO: block design [file tail $path] with C_BAUDRATE $::uart_baud_loc"
+}
+
+proc get_files {pattern} {
+    if {[string match *.bd $pattern]} {
+        return arty_s7_riscv_bd.bd
+    }
+    return $pattern
+}
+
+proc create_ip_run {bd} {
+    foreach ip $::ip_names {
+        run_field arty_s7_riscv_bd_${ip}_synth_1 0
+    }
+    save_state
+}
+
+proc add_files {args} {
+    if {[lindex $args 0] eq "-fileset"} {
+        lappend ::constraints [lindex $args 2]
+        save_state
+    }
+}
+
+proc get_runs {args} {
+    if {[lindex $args 0] eq "-filter"} {
+        set ip_runs {}
+        foreach run [lsort [array names ::runs]] {
+            if {[string match *_synth_1 $run] && $run ne "synth_1"} {
+                lappend ip_runs $run
+            }
+        }
+        return $ip_runs
+    }
+    return $args
+}
+
+proc get_property {name run} {
+    switch -- $name {
+        PROGRESS { return [run_field $run 0] }
+        STATUS { return [run_field $run 1] }
+        NEEDS_REFRESH {
+            return [expr {$run eq "impl_1" && [run_field $run 0] eq "100%"
+                          && [run_field $run 2] ne [constraints_digest]}]
+        }
+        DIRECTORY { return [file join $::proj runs $run] }
+    }
+    error "stand-in: no property $name"
+}
+
+proc reset_run {run} {
+    set ::runs($run) [list 0% "Not started" {}]
+}
+
+proc launch_runs {runs args} {
+    set failing {}
+    if {[info exists ::env(VIVADO_STAND_IN_FAIL)]} {
+        set failing $::env(VIVADO_STAND_IN_FAIL)
+    }
+    set log [open [file join $::start_dir stand_in_runs.log] a]
+    foreach run $runs {
+        puts "INFO: launching $run $args"
+        puts $log $run
+        if {[lsearch -exact $failing $run] >= 0} {
+            set ::runs($run) [list 0% "ERROR: stand-in failure" {}]
+            continue
+        }
+        set dir [file join $::proj runs $run]
+        file mkdir $dir
+        if {$run eq "impl_1"} {
+            close [open [file join $dir arty_s7_riscv_bd_wrapper_routed.dcp] w]
+        }
+        set ::runs($run) [list 100% "Complete" [expr {$run eq "impl_1" ? [constraints_digest] : {}}]]
+        if {$run eq "synth_1"} {
+            reset_run impl_1
+        }
+    }
+    close $log
+    save_state
+}
+
+proc wait_on_run {run} {}
+
+proc write_hw_platform {args} {
+    set path [lindex $args end]
+    if {[info exists ::env(VIVADO_STAND_IN_XSA)]} {
+        file copy -force $::env(VIVADO_STAND_IN_XSA) $path
+    } else {
+        close [open $path w]
+    }
+    puts "INFO: wrote $path"
+}
+
+_source [lindex $argv 0]
@@ -2,10 +2,15 @@
 # Usage: vitis -p this_script.py -- <xsa_path> <workspace_dir> <platform_name>
 
 import argparse
+import json
 import os
 import shutil
+import sys
 import vitis
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import xsa_index
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Build a Vitis platform from an XSA file."
@@ -40,6 +45,16 @@ if __name__ == "__main__":
     print(f"  Workspace:  {workspace_dir}")
     print(f"  Platform:   {platform_name}")
 
+    # Check the XSA before spending a Vitis session on it
+    with xsa_index.XsaFile(xsa_path) as xsa:
+        problems = xsa.validate(processor="microblaze_riscv_0")
+        if problems:
+            for problem in problems:
+                print(f"ERROR: {problem}")
+            sys.exit(1)
+        fingerprint = xsa.fingerprint()
+    print(f"  Hardware:   {fingerprint['top']} ({fingerprint['part']}), XSA {fingerprint['sha256'][:12]}")
+
     client = vitis.create_client()
 
     # Create workspace and platform
@@ -58,4 +73,9 @@ if __name__ == "__main__":
     platform_xpfm_gen=client.find_platform_in_repos(platform_name)
 
 
+    # Record which hardware the platform was built from
+    fingerprint_path = os.path.join(workspace_dir, f"{platform_name}_xsa_fingerprint.json")
+    with open(fingerprint_path, "w") as f:
+        json.dump(fingerprint, f, indent=2)
+
     print(f"Done. Exported to: {platform_xpfm_gen}")
\ No newline at end of file
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Line rate of an AXI UART Lite, shared by the hardware build and the host tools.
+
+UART Lite has no fractional divider: it divides its AXI clock by 16 * an
+integer ratio, so a C_BAUDRATE really runs at
+clk / (16 * floor(clk / (16 * baud))). The clock is the IP's
+C_S_AXI_ACLK_FREQ_HZ, read from the XSA (see uart_clock()).
+"""
+
+import xsa_index
+
+# Slowest rate the IP accepts for C_BAUDRATE
+MIN_BAUD = 110
+
+# Rate error (percent) above which the actual rate is used instead of the nominal one
+RATE_TOLERANCE = 1.0
+
+
+def uartlite_rate(baud, clock_hz):
+    """
+    Line rate UART Lite produces for a C_BAUDRATE at its AXI clock.
+
+    Returns:
+        (ratio, actual_baud, error_percent)
+    """
+    if int(baud) < MIN_BAUD:
+        raise ValueError(f"UART Lite rates start at {MIN_BAUD} baud, got {baud}")
+    ratio = int(clock_hz) // (16 * int(baud))
+    if ratio < 1:
+        raise ValueError(f"{baud} baud is above what a {clock_hz / 1e6:.0f} MHz UART Lite can produce "
+                         f"(at most {int(clock_hz) // 16})")
+    actual = clock_hz / (16.0 * ratio)
+    return ratio, actual, abs(actual - baud) * 100.0 / baud
+
+
+def host_rate(baud, clock_hz):
+    """Rate to open the host port at: the nominal rate, or the actual one when they differ noticeably."""
+    _, actual, error = uartlite_rate(baud, clock_hz)
+    return int(baud) if error < RATE_TOLERANCE else int(round(actual))
+
+
+def uart_clock(xsa, instance):
+    """
+    AXI clock of a UART Lite in an open XsaFile.
+
+    Returns:
+        Clock in Hz
+
+    Raises:
+        KeyError: the instance or its clock parameter is not in the XSA
+    """
+    clock_hz = xsa_index.parse_int(xsa.parameter(instance, "C_S_AXI_ACLK_FREQ_HZ"))
+    if not clock_hz:
+        raise KeyError(f"{instance} has no C_S_AXI_ACLK_FREQ_HZ")
+    return clock_hz
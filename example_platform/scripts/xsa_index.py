@@ -0,0 +1,717 @@
+#!/usr/bin/env python3
+"""
+Pure-Python introspection of Vivado XSA files.
+
+An XSA is a zip archive holding the hardware handoff (.hwh), the bitstream,
+the BRAM map (.mmi) and some JSON/XML descriptors. This module answers the
+usual questions about one without a Vitis or xsdb session:
+
+  - which IPs are in the design and with which parameters
+  - where each peripheral sits in the processor's address map
+  - which clocks drive what
+  - which bitstream it carries (streamed out of the archive, never unzipped)
+
+The XSA is memory-mapped and opened lazily: listing members only reads the
+zip central directory, and the .hwh is parsed the first time the model is
+needed. The parsed model is cached as JSON keyed on the SHA-256 of the XSA,
+so repeated queries (and every build step) cost a hash, not a parse.
+
+The Vitis system device tree (SDT) is generated from the same .hwh, so the
+index is built from the .hwh alone.
+
+Usage:
+  python xsa_index.py arty_s7_riscv.xsa                 # summary
+  python xsa_index.py arty_s7_riscv.xsa map             # address map
+  python xsa_index.py arty_s7_riscv.xsa ip axi_uartlite_0
+  python xsa_index.py arty_s7_riscv.xsa clocks
+  python xsa_index.py arty_s7_riscv.xsa bit --out design.bit
+  python xsa_index.py arty_s7_riscv.xsa fingerprint --json
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+
+# Bump when the layout of the cached index changes
+INDEX_VERSION = 1
+
+# Cached indexes live here unless XSA_INDEX_CACHE says otherwise
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "microblaze_v_cli", "xsa_index")
+
+# Chunk size for hashing and streaming members
+STREAM_CHUNK = 1 << 20
+
+# xsa.json / xsa.xml file types of the bitstream and BRAM map
+BITSTREAM_TYPES = ("FULL_BIT", "BIT")
+MMI_TYPES = ("MMI",)
+
+
+def default_cache_dir():
+    """Directory for cached indexes (XSA_INDEX_CACHE overrides the default)."""
+    return os.environ.get("XSA_INDEX_CACHE", DEFAULT_CACHE_DIR)
+
+
+def find_platform_xsa(platform_dir):
+    """
+    Find the XSA a Vitis platform was built from.
+
+    Args:
+        platform_dir: Platform component directory (or any directory holding an .xsa)
+
+    Returns:
+        Path to the XSA, or None if there is none
+    """
+    patterns = [
+        os.path.join(platform_dir, "export", "*", "hw", "*.xsa"),
+        os.path.join(platform_dir, "hw", "*.xsa"),
+        os.path.join(platform_dir, "*.xsa"),
+    ]
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        if matches:
+            return matches[0]
+    return None
+
+
+def parse_int(value, default=None):
+    """Integer value of a hwh attribute (decimal or 0x hex), default if it is not a number."""
+    if value in (None, ""):
+        return default
+    try:
+        return int(value, 0)
+    except ValueError:
+        return default
+
+
+def parse_bitstream_header(data):
+    """
+    Parse the header of a Xilinx .bit file.
+
+    Args:
+        data: At least the first few hundred bytes of the file
+
+    Returns:
+        Dict with design, part, date, time, data_length and data_offset
+    """
+    if len(data) < 13:
+        raise ValueError("Bitstream too short for a .bit header")
+    (skip,) = struct.unpack_from(">H", data, 0)
+    pos = 2 + skip
+    (skip,) = struct.unpack_from(">H", data, pos)
+    pos += 2
+    header = {}
+    keys = {b"a": "design", b"b": "part", b"c": "date", b"d": "time"}
+    while pos < len(data):
+        key = data[pos:pos + 1]
+        pos += 1
+        if key == b"e":
+            (length,) = struct.unpack_from(">I", data, pos)
+            header["data_length"] = length
+            header["data_offset"] = pos + 4
+            return header
+        if key not in keys:
+            raise ValueError(f"Unexpected .bit header field {key!r}")
+        (length,) = struct.unpack_from(">H", data, pos)
+        pos += 2
+        header[keys[key]] = data[pos:pos + length].rstrip(b"\0").decode("ascii", "replace")
+        pos += length
+    raise ValueError("Truncated .bit header")
+
+
+class XsaFile:
+    """
+    Lazily opened, memory-mapped XSA with a cached hardware index.
+
+    Nothing is read on construction. The zip central directory is read on the
+    first member access, the SHA-256 on the first call to sha256(), and the
+    .hwh only when the index is not in the cache.
+    """
+
+    def __init__(self, xsa_path, cache_dir=None, use_cache=True):
+        self.path = os.path.abspath(xsa_path)
+        if not os.path.isfile(self.path):
+            raise FileNotFoundError(f"XSA not found: {self.path}")
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.use_cache = use_cache
+        self._file = None
+        self._map = None
+        self._zip = None
+        self._sha256 = None
+        self._index = None
+        self.index_source = None     # 'cache' or 'parsed' once the index is loaded
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Release the zip, the mapping and the file handle."""
+        if self._zip:
+            self._zip.close()
+            self._zip = None
+        if self._map:
+            self._map.close()
+            self._map = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    # ---- archive access ----
+
+    def _archive(self):
+        if self._zip is None:
+            self._file = open(self.path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            # zipfile needs a real file object; the mapping serves hashing and stored-member views
+            self._zip = zipfile.ZipFile(self._file)
+        return self._zip
+
+    def members(self):
+        """Member name -> {'size', 'compressed_size', 'crc', 'compressed'} from the central directory."""
+        return {
+            info.filename: {
+                "size": info.file_size,
+                "compressed_size": info.compress_size,
+                "crc": info.CRC,
+                "compressed": info.compress_type != zipfile.ZIP_STORED,
+            }
+            for info in self._archive().infolist()
+        }
+
+    def open_member(self, name):
+        """Streaming file object for one member (decompressed on the fly)."""
+        return self._archive().open(name)
+
+    def read_member(self, name):
+        """Whole member as bytes; meant for the small descriptors, not the bitstream."""
+        return self._archive().read(name)
+
+    def member_view(self, name):
+        """
+        Zero-copy memoryview of a stored (uncompressed) member, or None.
+
+        Deflated members cannot be viewed in place; stream them with
+        open_member() or copy_member() instead.
+        """
+        info = self._archive().getinfo(name)
+        if info.compress_type != zipfile.ZIP_STORED:
+            return None
+        header = self._map[info.header_offset:info.header_offset + 30]
+        name_len, extra_len = struct.unpack_from("<HH", header, 26)
+        start = info.header_offset + 30 + name_len + extra_len
+        return memoryview(self._map)[start:start + info.file_size]
+
+    def copy_member(self, name, dest, chunk_size=STREAM_CHUNK):
+        """
+        Stream a member into a writable file object without materialising it.
+
+        Returns:
+            Number of bytes written
+        """
+        view = self.member_view(name)
+        if view is not None:
+            with view:
+                dest.write(view)
+                return len(view)
+        written = 0
+        with self.open_member(name) as src:
+            while True:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                dest.write(chunk)
+                written += len(chunk)
+        return written
+
+    def sha256(self):
+        """SHA-256 of the whole XSA, computed over the memory mapping."""
+        if self._sha256 is None:
+            self._archive()
+            digest = hashlib.sha256()
+            view = memoryview(self._map)
+            for offset in range(0, len(view), STREAM_CHUNK):
+                digest.update(view[offset:offset + STREAM_CHUNK])
+            view.release()
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    # ---- index ----
+
+    @property
+    def index(self):
+        """Parsed hardware model, from the cache when the XSA hash matches."""
+        if self._index is None:
+            cached = self._load_cached_index() if self.use_cache else None
+            if cached:
+                self._index = cached
+                self.index_source = "cache"
+            else:
+                self._index = self._build_index()
+                self.index_source = "parsed"
+                if self.use_cache:
+                    self._save_cached_index(self._index)
+        return self._index
+
+    def _cache_path(self):
+        return os.path.join(self.cache_dir, f"{self.sha256()}.json")
+
+    def _load_cached_index(self):
+        try:
+            with open(self._cache_path()) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get("version") != INDEX_VERSION or index.get("sha256") != self.sha256():
+            return None
+        return index
+
+    def _save_cached_index(self, index):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._cache_path() + f".{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp_path, self._cache_path())
+        except OSError as e:
+            print(f"⚠️  Could not cache XSA index in {self.cache_dir}: {e}")
+
+    def _build_index(self):
+        members = self.members()
+        index = {
+            "version": INDEX_VERSION,
+            "sha256": self.sha256(),
+            "size": os.path.getsize(self.path),
+            "members": members,
+            "design": {},
+            "files": {"hwh": None, "bitstream": None, "mmi": None},
+            "ips": {},
+            "processors": [],
+            "address_map": {},
+            "clocks": {},
+            "external_clocks": {},
+        }
+
+        self._index_descriptors(index, members)
+
+        hwh_name = index["files"]["hwh"]
+        if hwh_name:
+            with self.open_member(hwh_name) as f:
+                root = ET.parse(f).getroot()
+            self._index_hwh(index, root)
+
+        bit_name = index["files"]["bitstream"]
+        if bit_name:
+            with self.open_member(bit_name) as f:
+                head = f.read(512)
+            try:
+                index["bitstream"] = parse_bitstream_header(head)
+            except (ValueError, struct.error) as e:
+                index["bitstream"] = {"error": str(e)}
+            index["bitstream"]["crc"] = members[bit_name]["crc"]
+            index["bitstream"]["size"] = members[bit_name]["size"]
+        return index
+
+    def _index_descriptors(self, index, members):
+        """Design identity and file roles from xsa.json/sysdef.xml, falling back to extensions."""
+        design = index["design"]
+        files = index["files"]
+        if "xsa.json" in members:
+            info = json.loads(self.read_member("xsa.json"))
+            board = info.get("board", {})
+            design.update({
+                "top": info.get("topModuleName"),
+                "part": board.get("part"),
+                "board": board.get("name"),
+                "tool_version": info.get("generatedVersion"),
+                "timestamp": info.get("generatedTimestamp"),
+                "idcode": info.get("idCode"),
+            })
+            for entry in info.get("files", []):
+                if entry.get("type") in BITSTREAM_TYPES and entry.get("name") in members:
+                    files["bitstream"] = entry["name"]
+                elif entry.get("type") in MMI_TYPES and entry.get("name") in members:
+                    files["mmi"] = entry["name"]
+        if "sysdef.xml" in members:
+            root = ET.fromstring(self.read_member("sysdef.xml"))
+            for entry in root.iter("File"):
+                if entry.get("Type") == "HW_HANDOFF" and entry.get("Name") in members:
+                    files["hwh"] = entry.get("Name")
+                elif entry.get("Type") == "BIT" and not files["bitstream"] and entry.get("Name") in members:
+                    files["bitstream"] = entry.get("Name")
+            info = root.find("SYSTEMINFO")
+            if info is not None:
+                design.setdefault("part", info.get("PART"))
+                design.setdefault("board", info.get("BOARD"))
+        for name in sorted(members):
+            for role, ext in (("hwh", ".hwh"), ("bitstream", ".bit"), ("mmi", ".mmi")):
+                if not files[role] and name.endswith(ext):
+                    files[role] = name
+
+    def _index_hwh(self, index, root):
+        """IPs, address maps and clocks from the hardware handoff."""
+        info = root.find("SYSTEMINFO")
+        if info is not None:
+            index["design"]["bd_name"] = info.get("NAME")
+            index["design"].setdefault("part", info.get("DEVICE"))
+
+        for port in root.iterfind("EXTERNALPORTS/PORT"):
+            if port.get("SIGIS") == "clk" and port.get("DIR") == "I":
+                index["external_clocks"][port.get("NAME")] = parse_int(port.get("CLKFREQUENCY"))
+
+        for module in root.iterfind("MODULES/MODULE"):
+            instance = module.get("INSTANCE")
+            ip = {
+                "type": module.get("MODTYPE"),
+                "vlnv": module.get("VLNV"),
+                "class": module.get("MODCLASS"),
+                "ip_type": module.get("IPTYPE"),
+                "path": module.get("FULLNAME"),
+                "parameters": {p.get("NAME"): p.get("VALUE") for p in module.iterfind("PARAMETERS/PARAMETER")},
+                "clocks": {},
+                "interrupts": [],
+            }
+            for port in module.iterfind("PORTS/PORT"):
+                sigis = port.get("SIGIS")
+                if sigis == "clk":
+                    frequency = parse_int(port.get("CLKFREQUENCY"))
+                    ip["clocks"][port.get("NAME")] = {"frequency": frequency, "net": port.get("SIGNAME"),
+                                                      "dir": port.get("DIR")}
+                    if port.get("SIGNAME") and frequency:
+                        index["clocks"][port.get("SIGNAME")] = frequency
+                elif sigis == "INTERRUPT" and port.get("DIR") == "O":
+                    ip["interrupts"].append(port.get("NAME"))
+            index["ips"][instance] = ip
+
+            memory_map = module.find("MEMORYMAP")
+            if module.get("MODCLASS") == "PROCESSOR" or (memory_map is not None and len(memory_map)):
+                if module.get("MODCLASS") == "PROCESSOR":
+                    index["processors"].append(instance)
+                index["address_map"][instance] = self._merge_ranges(memory_map)
+
+    @staticmethod
+    def _merge_ranges(memory_map):
+        """One entry per slave range; instruction and data views of the same range are merged."""
+        ranges = {}
+        if memory_map is None:
+            return []
+        for mem in memory_map.iterfind("MEMRANGE"):
+            base = parse_int(mem.get("BASEVALUE"))
+            high = parse_int(mem.get("HIGHVALUE"))
+            key = (mem.get("INSTANCE"), mem.get("ADDRESSBLOCK"), base)
+            entry = ranges.setdefault(key, {
+                "instance": mem.get("INSTANCE"),
+                "block": mem.get("ADDRESSBLOCK"),
+                "base": base,
+                "high": high,
+                "size": high - base + 1 if base is not None and high is not None else None,
+                "type": mem.get("MEMTYPE"),
+                "data": False,
+                "instruction": False,
+                "masters": [],
+            })
+            entry["data"] |= mem.get("IS_DATA") == "TRUE"
+            entry["instruction"] |= mem.get("IS_INSTRUCTION") == "TRUE"
+            entry["masters"].append(mem.get("MASTERBUSINTERFACE"))
+        return sorted(ranges.values(), key=lambda r: (r["base"] is None, r["base"] or 0))
+
+    # ---- queries ----
+
+    def ip(self, instance):
+        """IP dict for an instance; KeyError lists the known instances."""
+        ips = self.index["ips"]
+        if instance not in ips:
+            raise KeyError(f"No IP '{instance}' in {os.path.basename(self.path)} (have: {', '.join(sorted(ips))})")
+        return ips[instance]
+
+    def parameter(self, instance, name, default=None):
+        """Raw string value of an IP parameter."""
+        return self.ip(instance)["parameters"].get(name, default)
+
+    def processor(self, instance=None):
+        """Processor instance name; the only one if not given."""
+        processors = self.index["processors"]
+        if instance:
+            if instance not in processors:
+                raise KeyError(f"No processor '{instance}' in {os.path.basename(self.path)} (have: {', '.join(processors)})")
+            return instance
+        if not processors:
+            raise KeyError(f"No processor in {os.path.basename(self.path)}")
+        return processors[0]
+
+    def address_map(self, processor=None):
+        """Address ranges visible to a processor, sorted by base address."""
+        return self.index["address_map"].get(self.processor(processor), [])
+
+    def address_range(self, instance, processor=None):
+        """First address range of a slave instance as seen by the processor, or None."""
+        for entry in self.address_map(processor):
+            if entry["instance"] == instance:
+                return entry
+        return None
+
+    def base_address(self, instance, processor=None):
+        """Base address of a slave instance; KeyError if it is not mapped."""
+        entry = self.address_range(instance, processor)
+        if entry is None:
+            raise KeyError(f"{instance} is not in the address map of {self.processor(processor)}")
+        return entry["base"]
+
+    def local_memory(self, processor=None):
+        """
+        Local memory (LMB BRAM) of a processor, or None if it has none.
+
+        The instruction and data LMB controllers map the same BRAM, so their
+        ranges are merged.
+
+        Returns:
+            Dict with 'base', 'size' and 'instances' (the LMB controller names)
+        """
+        ranges = [entry for entry in self.address_map(processor)
+                  if entry["type"] == "MEMORY" and any(m.endswith("LMB") for m in entry["masters"])]
+        if not ranges:
+            return None
+        base = min(entry["base"] for entry in ranges)
+        high = max(entry["high"] for entry in ranges)
+        return {"base": base, "size": high - base + 1, "instances": [entry["instance"] for entry in ranges]}
+
+    def external_memory(self, processor=None):
+        """
+        Largest memory a processor reaches over AXI (e.g. the MIG DDR), or None.
+
+        Returns:
+            Dict with 'base', 'size' and 'instance'
+        """
+        ranges = [entry for entry in self.address_map(processor)
+                  if entry["type"] == "MEMORY" and not any(m.endswith("LMB") for m in entry["masters"])]
+        if not ranges:
+            return None
+        entry = max(ranges, key=lambda entry: entry["size"])
+        return {"base": entry["base"], "size": entry["size"], "instance": entry["instance"]}
+
+    def clock_frequency(self, instance, port=None):
+        """Frequency in Hz of an IP's clock input (the first one if no port is given), or None."""
+        clocks = {name: c for name, c in self.ip(instance)["clocks"].items() if c["dir"] == "I"}
+        if port:
+            return clocks.get(port, {}).get("frequency")
+        for clock in clocks.values():
+            if clock["frequency"]:
+                return clock["frequency"]
+        return None
+
+    def bitstream_name(self):
+        """Member name of the embedded bitstream, or None."""
+        return self.index["files"]["bitstream"]
+
+    def bitstream_header(self):
+        """Parsed .bit header (design, part, date, time, data_length) plus crc and size."""
+        return self.index.get("bitstream")
+
+    def extract_bitstream(self, dest_path):
+        """
+        Stream the embedded bitstream to dest_path.
+
+        An existing file with the same size and CRC-32 is left alone, so
+        repeated programming of the same XSA writes nothing.
+
+        Returns:
+            (dest_path, written) - written is False when the file was up to date
+        """
+        name = self.bitstream_name()
+        if not name:
+            raise ValueError(f"No bitstream in {os.path.basename(self.path)}")
+        member = self.index["members"][name]
+        if os.path.isfile(dest_path) and os.path.getsize(dest_path) == member["size"]:
+            crc = 0
+            with open(dest_path, "rb") as f:
+                for chunk in iter(lambda: f.read(STREAM_CHUNK), b""):
+                    crc = zlib.crc32(chunk, crc)
+            if crc == member["crc"]:
+                return dest_path, False
+        os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+        tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as dest:
+            self.copy_member(name, dest)
+        os.replace(tmp_path, dest_path)
+        return dest_path, True
+
+    def fingerprint(self):
+        """Short identity of the hardware: hash, design, part, tool version and bitstream CRC."""
+        index = self.index
+        bit = index.get("bitstream") or {}
+        return {
+            "xsa": os.path.basename(self.path),
+            "sha256": index["sha256"],
+            "top": index["design"].get("top"),
+            "part": index["design"].get("part"),
+            "board": index["design"].get("board"),
+            "tool_version": index["design"].get("tool_version"),
+            "timestamp": index["design"].get("timestamp"),
+            "processors": index["processors"],
+            "bitstream": index["files"]["bitstream"],
+            "bitstream_crc": f"{bit['crc']:08x}" if "crc" in bit else None,
+        }
+
+    def validate(self, processor=None, require_bitstream=True):
+        """
+        Check the XSA is usable for this flow.
+
+        Args:
+            processor: Processor instance that must be present (default: any)
+            require_bitstream: Also check the embedded bitstream; off for steps
+                               that only compile against the XSA
+
+        Returns:
+            List of problems; empty when the XSA is fine
+        """
+        problems = []
+        index = self.index
+        if not index["files"]["hwh"]:
+            problems.append("no hardware handoff (.hwh)")
+        try:
+            self.processor(processor)
+        except KeyError as e:
+            problems.append(str(e.args[0]))
+        if require_bitstream:
+            bit = index.get("bitstream")
+            if not bit:
+                problems.append("no bitstream")
+            elif "error" in bit:
+                problems.append(f"bitstream header: {bit['error']}")
+            else:
+                part = (index["design"].get("part") or "").lower()
+                bit_part = (bit.get("part") or "").lower()
+                if part and bit_part and bit_part not in part:
+                    problems.append(f"bitstream is for {bit['part']}, design targets {index['design']['part']}")
+                if bit.get("data_offset", 0) + bit.get("data_length", 0) > bit["size"]:
+                    problems.append("bitstream shorter than its header says")
+        return problems
+
+
+def format_size(size):
+    """Human-readable size of an address range."""
+    for unit, shift in (("G", 30), ("M", 20), ("K", 10)):
+        if size >= (1 << shift) and size % (1 << shift) == 0:
+            return f"{size >> shift}{unit}"
+    return str(size)
+
+
+def print_summary(xsa):
+    fp = xsa.fingerprint()
+    print(f"XSA:        {xsa.path}")
+    print(f"SHA-256:    {fp['sha256']}")
+    print(f"Design:     {fp['top']} ({fp['part']}, {fp['board']})")
+    print(f"Generated:  Vivado {fp['tool_version']}, {fp['timestamp']}")
+    print(f"Processors: {', '.join(fp['processors']) or 'none'}")
+    bit = xsa.bitstream_header() or {}
+    if fp["bitstream"]:
+        print(f"Bitstream:  {fp['bitstream']} ({bit.get('size', 0)} bytes, crc {fp['bitstream_crc']}, "
+              f"{bit.get('part', '?')} {bit.get('date', '')} {bit.get('time', '')})")
+    print(f"IPs:        {len(xsa.index['ips'])}")
+    print(f"Index:      {xsa.index_source}")
+
+
+def print_address_map(xsa, processor=None):
+    print(f"Address map of {xsa.processor(processor)}:")
+    for entry in xsa.address_map(processor):
+        access = ("I" if entry["instruction"] else "-") + ("D" if entry["data"] else "-")
+        print(f"  0x{entry['base']:08X}-0x{entry['high']:08X} {format_size(entry['size']):>5} {access} "
+              f"{entry['type'] or '':<8} {entry['instance']}")
+
+
+def print_clocks(xsa):
+    for name, freq in sorted(xsa.index["external_clocks"].items()):
+        print(f"  {name:<40} {freq / 1e6 if freq else 0:10.3f} MHz (external)")
+    for net, freq in sorted(xsa.index["clocks"].items()):
+        users = sorted(inst for inst, ip in xsa.index["ips"].items()
+                       if any(c["net"] == net and c["dir"] == "I" for c in ip["clocks"].values()))
+        print(f"  {net:<40} {freq / 1e6:10.3f} MHz  {', '.join(users)}")
+
+
+def print_ip(xsa, instance):
+    ip = xsa.ip(instance)
+    print(f"{instance}: {ip['vlnv']} ({ip['class']})")
+    entry = xsa.address_range(instance) if xsa.index["processors"] else None
+    if entry:
+        print(f"  address: 0x{entry['base']:08X}-0x{entry['high']:08X}")
+    for port, clock in sorted(ip["clocks"].items()):
+        if clock["dir"] == "I":
+            freq = clock["frequency"]
+            print(f"  clock:   {port} = {freq / 1e6 if freq else 0:.3f} MHz ({clock['net']})")
+    if ip["interrupts"]:
+        print(f"  irq:     {', '.join(ip['interrupts'])}")
+    for name, value in sorted(ip["parameters"].items()):
+        print(f"  {name} = {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a Vivado XSA without Vitis.")
+    parser.add_argument("xsa", type=str, help="Path to the XSA")
+    parser.add_argument("command", nargs="?", default="summary",
+                        choices=["summary", "map", "ip", "clocks", "bit", "fingerprint", "validate"])
+    parser.add_argument("instance", nargs="?", default=None, help="IP instance for 'ip', processor for 'map'")
+    parser.add_argument("--out", type=str, default=None, help="Output path for 'bit'")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of text")
+    parser.add_argument("--no_cache", action="store_true", help="Parse the XSA even if a cached index exists")
+    args = parser.parse_args()
+
+    try:
+        with XsaFile(args.xsa, use_cache=not args.no_cache) as xsa:
+            if args.command == "summary":
+                if args.json:
+                    print(json.dumps(xsa.index, indent=2))
+                else:
+                    print_summary(xsa)
+            elif args.command == "map":
+                if args.json:
+                    print(json.dumps(xsa.address_map(args.instance), indent=2))
+                else:
+                    print_address_map(xsa, args.instance)
+            elif args.command == "ip":
+                if not args.instance:
+                    print("\n".join(sorted(xsa.index["ips"])))
+                elif args.json:
+                    print(json.dumps(xsa.ip(args.instance), indent=2))
+                else:
+                    print_ip(xsa, args.instance)
+            elif args.command == "clocks":
+                if args.json:
+                    print(json.dumps({"external": xsa.index["external_clocks"], "nets": xsa.index["clocks"]}, indent=2))
+                else:
+                    print_clocks(xsa)
+            elif args.command == "bit":
+                out = args.out or os.path.basename(xsa.bitstream_name() or "design.bit")
+                path, written = xsa.extract_bitstream(out)
+                print(f"✓ Bitstream {'written to' if written else 'up to date at'} {path}")
+            elif args.command == "fingerprint":
+                fp = xsa.fingerprint()
+                if args.json:
+                    print(json.dumps(fp, indent=2))
+                else:
+                    for key, value in fp.items():
+                        print(f"{key:<14} {value}")
+            elif args.command == "validate":
+                problems = xsa.validate(args.instance)
+                for problem in problems:
+                    print(f"❌ {problem}")
+                if problems:
+                    return 1
+                print(f"✓ {os.path.basename(xsa.path)} is valid")
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile, ET.ParseError) as e:
+        message = e.args[0] if isinstance(e, KeyError) else e
+        print(f"❌ {message}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())